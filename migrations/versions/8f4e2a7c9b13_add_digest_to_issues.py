@@ -0,0 +1,28 @@
+"""Add digest to issues
+
+Revision ID: 8f4e2a7c9b13
+Revises: 3c9b1f6e2d4a
+Create Date: 2026-10-19 11:27:40.615032
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f4e2a7c9b13"
+down_revision: str | Sequence[str] | None = "3c9b1f6e2d4a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("issues", sa.Column("digest", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("issues", "digest")
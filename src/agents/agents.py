@@ -1,73 +1,76 @@
+import asyncio
 import re
+from contextlib import aclosing
 
+import numpy as np
 from langchain_core.messages import AIMessage
 
 from src.agents.graph_service import services
-from src.models.agent_models import ClassificationState, IssueState, Recommendation
+from src.agents.resilient_llm import LLM_UNAVAILABLE_ERRORS
+from src.models.agent_models import ClassificationState, IssueState, Recommendation, SimilarIssue
+from src.models.guardrails_models import GuardrailResult
+from src.utils.config import settings
+from src.utils.deadline import has_budget, skip_step, within_deadline
 from src.utils.error_handler import ErrorHandler
-from src.utils.guardrails import guardrail_validator
+from src.utils.guardrails import StreamingOutputGuard, first_failed_check, guardrail_validator
+from src.utils.node_cache import memoize_node, refreshed_every, settings_version
+from src.utils.prompt_builder import build_classification_prompt, describe_references
 from src.utils.prompts import PromptTemplates
 from src.utils.traced_agents import trace_agent
+from src.vectorstore.payload_builder import issue_query_texts
 
 # ========================================
 # Input Guardrail Agent
 # ========================================
 
 
+def jailbreak_summary(result: GuardrailResult) -> dict:
+    summary = result.validation_summaries[0]
+    score_match = re.search(r"Score: ([\d.]+)", summary.failure_reason) if summary.failure_reason else None
+    return {
+        "type": "DetectJailbreak",
+        "failure_reason": summary.validator_name,
+        "score": float(score_match.group(1)) if score_match else None,
+    }
+
+
+def toxicity_summary(result: GuardrailResult, kind: str) -> dict:
+    summary = result.validation_summaries[0]
+    return {
+        "type": f"ToxicLanguage_{kind}",
+        "failure_reason": summary.failure_reason,
+        "error_spans": [{"start": span.start, "end": span.end, "reason": span.reason} for span in summary.error_spans or []],
+    }
+
+
+def secrets_summary(result: GuardrailResult, kind: str) -> dict:
+    summary = result.validation_summaries[0]
+    return {"type": f"SecretsPresent_{kind}", "failure_reason": summary.failure_reason}
+
+
+def blocked_update(name: str, result: GuardrailResult, kind: str) -> dict:
+    if name == "jailbreak":
+        return {"blocked": True, "validation_summary": jailbreak_summary(result)}
+    if name == "toxicity":
+        return {"blocked": True, "validation_summary": toxicity_summary(result, kind)}
+    return {"blocked": True, "validation_summary": secrets_summary(result, kind)}
+
+
 @trace_agent("input_guardrail")
 async def input_guardrail_agent(state: IssueState) -> dict:
     try:
         input_text = f"{getattr(state, 'title', '')}\n{getattr(state, 'body', '')}"
-        # from loguru import logger
-        # logger.info(f"Input text to guardrails:\n{input_text}")
-
-        ## Jailbreak Guard
-        jailbreak_result = await guardrail_validator.check_jailbreak(input_text)
-
-        if not jailbreak_result.validation_passed:
-            summary = jailbreak_result.validation_summaries[0]
-            score_match = re.search(r"Score: ([\d.]+)", summary.failure_reason) if summary.failure_reason else None
-            score = float(score_match.group(1)) if score_match else None
-
-            return {
-                "blocked": True,
-                "validation_summary": {
-                    "type": "DetectJailbreak",
-                    "failure_reason": summary.validator_name,
-                    "score": score,
-                },
-            }
-
-        ## Toxic Guard
-        toxic_result = await guardrail_validator.check_toxicity(input_text)
-
-        if not toxic_result.validation_passed:
-            summary = toxic_result.validation_summaries[0]
-
-            return {
-                "blocked": True,
-                "validation_summary": {
-                    "type": "ToxicLanguage_Input",
-                    "failure_reason": summary.failure_reason,
-                    "error_spans": [
-                        {"start": span.start, "end": span.end, "reason": span.reason} for span in summary.error_spans or []
-                    ],
-                },
-            }
-
-        # Secret Guard
-        secret_result = await guardrail_validator.check_secrets(input_text)
 
-        if not secret_result.validation_passed:
-            summary = secret_result.validation_summaries[0]
-
-            return {
-                "blocked": True,
-                "validation_summary": {
-                    "type": "SecretsPresent_Input",
-                    "failure_reason": summary.failure_reason,
-                },
+        # Concurrent checks; when several block, jailbreak wins over toxicity, toxicity over secrets
+        failed = await first_failed_check(
+            {
+                "jailbreak": guardrail_validator.check_jailbreak(input_text),
+                "toxicity": guardrail_validator.check_toxicity(input_text),
+                "secrets": guardrail_validator.check_secrets(input_text),
             }
+        )
+        if failed is not None:
+            return blocked_update(*failed, kind="Input")
 
         return {"blocked": False}
     except Exception as e:
@@ -79,85 +82,214 @@ async def input_guardrail_agent(state: IssueState) -> dict:
 # ========================================
 
 
+async def search_index_version() -> str:
+    return await services.vector_store.index_version()
+
+
+current_index_version = refreshed_every(settings.NODE_CACHE_VERSION_CHECK_SECONDS, search_index_version)
+
+
+async def search_version() -> str:
+    # How the query is embedded and searched changes the hits as much as the index does
+    query_settings = settings_version("MULTI_VECTOR_QUERY", "MAX_QUERY_CHUNKS", "TWO_STAGE_SEARCH", "COARSE_TOP_ISSUES")
+    return f"{await current_index_version()} {query_settings}"
+
+
 @trace_agent("issue_search")
+@memoize_node("issue_search", fields=("title", "body"), version=search_version)
 async def issue_search_agent(state: IssueState) -> dict:
     try:
-        query_text = f"{getattr(state, 'title', '')} {getattr(state, 'body', '')}"
-        results = await services.qdrant_store.search_similar_issues(query_text)
+        query_texts = issue_query_texts(state.title or "", state.body or "")
 
-        similar_issues = [
-            {
-                "issue_number": hit.payload.get("issue_number"),
-                "repo": hit.payload.get("repo"),
-                "owner": hit.payload.get("owner"),
-                "title": hit.payload.get("title"),
-                "url": hit.payload.get("url"),
-                "comment_id": hit.payload.get("comment_id"),
-                "chunk_text": hit.payload.get("chunk_text"),
-                "score": hit.score,
-                "is_bug": hit.payload.get("is_bug"),
-                "is_feature": hit.payload.get("is_feature"),
-            }
-            for hit in results
-            if hit.payload is not None
-        ]
+        # Embed once: the same vectors key the semantic cache and feed the dense prefetches
+        dense_vectors = await services.vector_store.dense_vectors(query_texts)
+        query_embedding = np.mean(np.asarray(dense_vectors, dtype=np.float32), axis=0).tolist()
 
-        return {"similar_issues": similar_issues}
+        if services.semantic_cache is not None:
+            cached = services.semantic_cache.lookup(query_embedding)
+            if cached is not None:
+                classification, recommendation = cached
+                return {"classification": classification, "recommendation": recommendation, "cache_hit": True}
 
+        if not has_budget(state, settings.DEADLINE_SEARCH_RESERVE_SECONDS):
+            return skip_step(state, "issue_search", similar_issues=[], query_embedding=query_embedding)
+
+        results = await within_deadline(
+            state, services.vector_store.search_similar_issues_multi(query_texts, dense_vectors=dense_vectors)
+        )
+
+        similar_issues = [SimilarIssue.from_payload(hit.payload, hit.score) for hit in results if hit.payload is not None]
+
+        return {"similar_issues": similar_issues, "query_embedding": query_embedding}
+
+    except TimeoutError:
+        return skip_step(state, "issue_search", similar_issues=[])
     except Exception as e:
         return ErrorHandler.log_error(state, e, context="Issue search error")
 
 
+# ========================================
+# Guarded Search Agent (input guardrail and issue search in parallel)
+# ========================================
+
+
+def is_blocked(update: dict | IssueState) -> bool:
+    return bool(update.blocked if isinstance(update, IssueState) else update.get("blocked"))
+
+
+@trace_agent("guarded_search")
+async def guarded_search_agent(state: IssueState) -> dict | IssueState:
+    """
+    Run the issue search speculatively while the input guardrail checks the issue. The guardrail almost
+    always passes, so its latency hides the search; when it blocks, the search is cancelled and dropped.
+    The issue text still reaches the embedding provider before the verdict, which is why this is opt-in.
+    """
+    search = asyncio.ensure_future(issue_search_agent(state))
+    try:
+        guard_update = await input_guardrail_agent(state)
+        if is_blocked(guard_update):
+            return guard_update
+
+        search_update = await search
+        if isinstance(search_update, IssueState):
+            return search_update
+        return {**guard_update, **search_update}
+    finally:
+        search.cancel()
+
+
 # ========================================
 # Classification Agent
 # ========================================
 
 
+async def model_version() -> str:
+    # The prompt budget decides what the model sees; the fast classifier may answer instead of it
+    fast_classifier = services.fast_classifier.version if services.fast_classifier is not None else ""
+    return fast_classifier + settings_version(
+        "LLM_MODEL_NAME",
+        "CLASSIFICATION_PROMPT_MAX_TOKENS",
+        "PROMPT_MAX_TITLE_TOKENS",
+        "PROMPT_MIN_BODY_TOKENS",
+        "PROMPT_MAX_SIMILAR_ISSUES",
+        "PROMPT_SIMILAR_SNIPPET_TOKENS",
+        "FAST_CLASSIFIER_ENABLED",
+        "FAST_CLASSIFIER_THRESHOLD",
+    )
+
+
+def degraded_classification(state: IssueState, step: str, reason: str = "deadline") -> dict:
+    """No LLM answer in time: take the fast classifier's best guess at any confidence, if there is one."""
+    if services.fast_classifier is not None and state.query_embedding:
+        classification = services.fast_classifier.classify(state.query_embedding, threshold=0.0)
+        return skip_step(state, step, reason, classification=classification)
+    return skip_step(state, step, reason)
+
+
 @trace_agent("classification")
+@memoize_node(
+    "classification",
+    fields=("title", "body", "similar_issues"),
+    version=model_version,
+    enabled=lambda: settings.TEMPERATURE == 0,
+)
 async def classification_agent(state: IssueState) -> dict:
     try:
-        prompt = PromptTemplates.classification_prompt().format(
-            title=state.title, body=state.body, similar_issues=state.similar_issues
-        )
+        if services.fast_classifier is not None and state.query_embedding:
+            fast_classification = services.fast_classifier.classify(state.query_embedding)
+            if fast_classification is not None:
+                return {"classification": fast_classification}
+
+        if not has_budget(state, settings.DEADLINE_LLM_RESERVE_SECONDS):
+            return degraded_classification(state, "classification")
 
-        response: AIMessage = await services.llm_with_tools.ainvoke(prompt)  # type: ignore
+        prompt = build_classification_prompt(state.title, state.body, state.similar_issues)
+
+        response: AIMessage = await within_deadline(state, services.llm_with_tools.ainvoke(prompt.text))  # type: ignore
         parsed = response.tool_calls[0]["args"]  # Parsed dict output
 
         classification = ClassificationState(**dict(parsed))
 
         return {"classification": classification}
 
+    except TimeoutError:
+        return degraded_classification(state, "classification")
+    except LLM_UNAVAILABLE_ERRORS as e:
+        return degraded_classification(state, "classification", reason=type(e).__name__)
     except Exception as e:
         return ErrorHandler.log_error(state, e, context="Classification error")
 
 
+def top_reference_urls(state: IssueState, limit: int = 4) -> list[str]:
+    """Distinct URLs of the top similar issues, in search order."""
+    top_references: list[str] = []
+    seen_urls = set()
+
+    for issue in state.similar_issues or []:
+        url = issue.url
+        if url is not None and url not in seen_urls:
+            top_references.append(url)
+            seen_urls.add(url)
+        if len(top_references) == limit:
+            break
+    return top_references
+
+
+def message_text(content: str | list) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # Join list items as string, or handle as needed
+        return " ".join(str(item) for item in content)
+    return str(content)
+
+
+async def stream_into(output_guard: StreamingOutputGuard, prompt: str) -> None:
+    async with aclosing(services.llm.astream(prompt)) as stream:
+        async for chunk in stream:
+            output_guard.feed(message_text(chunk.content))
+            if output_guard.failed:
+                break  # Closing the stream stops generation
+
+
+async def streamed_recommendation(state: IssueState, prompt: str, top_references: list[str]) -> dict:
+    """Generate the summary while the output guardrail checks it; the Output Guardrail node then has nothing left to do."""
+    output_guard = StreamingOutputGuard(guardrail_validator)
+    try:
+        await within_deadline(state, stream_into(output_guard, prompt))
+        failed = await output_guard.finish()
+    finally:
+        output_guard.cancel()
+
+    update = {
+        "recommendation": Recommendation(summary=output_guard.text.strip(), references=top_references),
+        "output_checked": True,
+    }
+    if failed is not None:
+        return {**update, **blocked_update(*failed, kind="Output")}
+    return {**update, "blocked": False}
+
+
 @trace_agent("recommendation")
 async def recommendation_agent(state: IssueState) -> dict:
     try:
-        # Get top similar issue URLs
-        top_references = []
-        seen_urls = set()
-
-        similar_issues = getattr(state, "similar_issues", []) or []
-        for issue in similar_issues:
-            url = issue["url"]
-            if url not in seen_urls:
-                top_references.append(url)
-                seen_urls.add(url)
-            if len(top_references) == 4:
-                break
-
-        prompt = PromptTemplates.summary_prompt(state.dict(), top_references)
-
-        response = await services.llm.ainvoke(prompt)
-
-        if isinstance(response.content, str):
-            summary = response.content.strip()
-        elif isinstance(response.content, list):
-            # Join list items as string, or handle as needed
-            summary = " ".join(str(item) for item in response.content).strip()
-        else:
-            summary = str(response.content).strip()
+        if state.classification is None:
+            return skip_step(state, "recommendation", reason="no_classification")
+        # Return the classification alone rather than overrun the deadline
+        if not has_budget(state, settings.DEADLINE_LLM_RESERVE_SECONDS):
+            return skip_step(state, "recommendation")
+
+        top_references = top_reference_urls(state)
+
+        prompt = PromptTemplates.summary_prompt(
+            state.classification, describe_references(state.similar_issues, top_references)
+        )
+
+        if settings.OUTPUT_GUARDRAIL_STREAMING:
+            return await streamed_recommendation(state, prompt, top_references)
+
+        response = await within_deadline(state, services.llm.ainvoke(prompt))
+        summary = message_text(response.content).strip()
 
         recommendation = Recommendation(summary=summary, references=top_references)
 
@@ -165,10 +297,52 @@ async def recommendation_agent(state: IssueState) -> dict:
 
         return {"recommendation": recommendation}
 
+    except TimeoutError:
+        return skip_step(state, "recommendation")
+    except LLM_UNAVAILABLE_ERRORS as e:
+        return skip_step(state, "recommendation", reason=type(e).__name__)
     except Exception as e:
         return ErrorHandler.log_error(state, e, context="Recommendation error")
 
 
+# ========================================
+# Triage Agent (single-call classification + recommendation)
+# ========================================
+
+
+@trace_agent("triage")
+async def triage_agent(state: IssueState) -> dict:
+    try:
+        if not has_budget(state, settings.DEADLINE_LLM_RESERVE_SECONDS):
+            return degraded_classification(state, "triage")
+
+        top_references = top_reference_urls(state)
+
+        prompt = build_classification_prompt(
+            state.title,
+            state.body,
+            state.similar_issues,
+            template=PromptTemplates.triage_prompt(),
+            top_references="\n".join(f"- {line}" for line in describe_references(state.similar_issues, top_references)),
+        )
+
+        response: AIMessage = await within_deadline(state, services.llm_with_triage_tool.ainvoke(prompt.text))  # type: ignore
+        parsed = dict(response.tool_calls[0]["args"])
+
+        summary = str(parsed.pop("summary", "")).strip()
+        classification = ClassificationState(**parsed)
+        recommendation = Recommendation(summary=summary, references=top_references)
+
+        return {"classification": classification, "recommendation": recommendation}
+
+    except TimeoutError:
+        return degraded_classification(state, "triage")
+    except LLM_UNAVAILABLE_ERRORS as e:
+        return degraded_classification(state, "triage", reason=type(e).__name__)
+    except Exception as e:
+        return ErrorHandler.log_error(state, e, context="Triage error")
+
+
 # ========================================
 # Output Guardrail Agent
 # ========================================
@@ -177,42 +351,51 @@ async def recommendation_agent(state: IssueState) -> dict:
 @trace_agent("output_guardrail")
 async def output_guardrail_agent(state: IssueState) -> dict:
     try:
+        if state.output_checked:
+            # Already checked while the recommendation streamed
+            return {"blocked": bool(state.blocked)}
+
         output_text = getattr(getattr(state, "recommendation", None), "summary", "")
 
         if not output_text:
             # No text to validate, consider not blocked or handle accordingly
             return {"blocked": False}
 
-        # Toxic Guard
-        toxic_result = await guardrail_validator.check_toxicity(output_text)
-
-        if not toxic_result.validation_passed:
-            summary = toxic_result.validation_summaries[0]
-            return {
-                "blocked": True,
-                "validation_summary": {
-                    "type": "ToxicLanguage_Output",
-                    "failure_reason": summary.failure_reason,
-                    "error_spans": [
-                        {"start": span.start, "end": span.end, "reason": span.reason} for span in summary.error_spans or []
-                    ],
-                },
-            }
-
-        # Secret Guard
-        secret_result = await guardrail_validator.check_secrets(output_text)
-
-        if not secret_result.validation_passed:
-            summary = secret_result.validation_summaries[0]
-            return {
-                "blocked": True,
-                "validation_summary": {
-                    "type": "SecretsPresent_Output",
-                    "failure_reason": summary.failure_reason,
-                },
+        failed = await first_failed_check(
+            {
+                "toxicity": guardrail_validator.check_toxicity(output_text),
+                "secrets": guardrail_validator.check_secrets(output_text),
             }
+        )
+        if failed is not None:
+            return blocked_update(*failed, kind="Output")
 
         return {"blocked": False}
 
     except Exception as e:
         return ErrorHandler.log_error(state, e, context="Output Guardrail error")
+
+
+# ========================================
+# Semantic Cache Agent
+# ========================================
+
+
+@trace_agent("semantic_cache")
+async def semantic_cache_agent(state: IssueState) -> dict:
+    try:
+        if (
+            services.semantic_cache is not None
+            and not state.cache_hit
+            # A degraded run's answer (e.g. the fast classifier's guess at any confidence) must not be reused
+            and not state.skipped_steps
+            and not state.errors
+            and state.query_embedding
+            and state.classification
+            and state.recommendation
+        ):
+            services.semantic_cache.store(state.query_embedding, state.classification, state.recommendation)
+        return {}
+
+    except Exception as e:
+        return ErrorHandler.log_error(state, e, context="Semantic cache error")
@@ -0,0 +1,128 @@
+"""
+Optional LangGraph checkpointer, so a run carrying a thread id can be resumed instead of restarted.
+
+GRAPH_CHECKPOINTER picks the backend: "off", "memory" (per process, for tests), "sqlite" (needs
+langgraph-checkpoint-sqlite) or "postgres" (needs langgraph-checkpoint-postgres, uses our Postgres unless
+GRAPH_CHECKPOINT_POSTGRES_URL is set). Every node's output is saved as the graph runs; `run_graph` then
+reuses a finished run, or re-runs it from its last node that completed without error or skipped step.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import StateSnapshot
+from loguru import logger
+
+from src.models.agent_models import IssueState
+from src.models.db_models import DBConfig
+from src.utils.config import settings
+
+# State values are stored as msgpack; these are the state's own models, allowed back out of a checkpoint
+CHECKPOINT_SERDE = JsonPlusSerializer(
+    allowed_msgpack_modules=[
+        ("src.models.agent_models", "ClassificationState"),
+        ("src.models.agent_models", "Recommendation"),
+        ("src.models.agent_models", "SimilarIssue"),
+    ]
+)
+
+
+def postgres_url() -> str:
+    if settings.GRAPH_CHECKPOINT_POSTGRES_URL:
+        return settings.GRAPH_CHECKPOINT_POSTGRES_URL
+    return DBConfig(
+        username=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=int(settings.POSTGRES_PORT),
+        dbname=settings.POSTGRES_DB,
+        driver="postgresql",
+    ).build_url()
+
+
+@asynccontextmanager
+async def open_checkpointer(backend: str | None = None) -> AsyncIterator[BaseCheckpointSaver | None]:
+    """The configured checkpointer, open for the duration of the context; None when checkpointing is off."""
+    backend = backend or settings.GRAPH_CHECKPOINTER
+    if backend == "off":
+        yield None
+    elif backend == "memory":
+        yield InMemorySaver(serde=CHECKPOINT_SERDE)
+    elif backend == "sqlite":
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        async with AsyncSqliteSaver.from_conn_string(settings.GRAPH_CHECKPOINT_SQLITE_PATH) as saver:
+            saver.serde = CHECKPOINT_SERDE
+            yield saver
+    elif backend == "postgres":
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+
+        async with AsyncPostgresSaver.from_conn_string(postgres_url(), serde=CHECKPOINT_SERDE) as saver:
+            await saver.setup()  # Creates the checkpoint tables on first use
+            yield saver
+    else:
+        raise ValueError(f"Unknown GRAPH_CHECKPOINTER '{backend}', expected off, memory, sqlite or postgres.")
+
+
+def thread_config(thread_id: str) -> dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def fresh_run(inputs: dict[str, Any]) -> dict[str, Any]:
+    """`inputs` with every other state field cleared, so a new run on a used thread keeps nothing of the last."""
+    return {**dict.fromkeys(IssueState.model_fields), **inputs}
+
+
+def completed_cleanly(values: dict[str, Any]) -> bool:
+    return not values.get("errors") and not values.get("skipped_steps")
+
+
+async def resume_point(graph: Any, thread_id: str) -> StateSnapshot | None:
+    """
+    The checkpoint the thread's last run should continue from, or None to run it from scratch.
+
+    That is the newest checkpoint of the run with nodes left to execute and no error or skipped step yet:
+    the point an interrupted run stopped at, or the step before the node that degraded.
+    """
+    async for snapshot in graph.aget_state_history(thread_config(thread_id)):
+        if snapshot.next and completed_cleanly(snapshot.values):
+            return snapshot
+        if snapshot.metadata and snapshot.metadata.get("source") == "input":
+            break  # Start of the last run
+    return None
+
+
+async def run_graph(graph: Any, inputs: dict[str, Any], thread_id: str | None = None) -> dict[str, Any]:
+    """
+    `graph.ainvoke(inputs)`, checkpointed under `thread_id` when the graph has a checkpointer.
+
+    A thread whose last run was for the same issue is not started over: a clean finished run is returned
+    as is, and an interrupted or degraded one resumes after its last completed node with the new deadline.
+    """
+    if thread_id is None or graph.checkpointer is None:
+        return await graph.ainvoke(inputs)
+
+    config = thread_config(thread_id)
+    state = await graph.aget_state(config)
+    same_issue = state.values and all(state.values.get(key) == inputs.get(key) for key in ("title", "body"))
+    if not same_issue:
+        return await graph.ainvoke(fresh_run(inputs), config)
+
+    if not state.next and completed_cleanly(state.values):
+        logger.info(f"Thread '{thread_id}' already completed, reusing its result.")
+        return state.values
+
+    snapshot = await resume_point(graph, thread_id)
+    if snapshot is None:
+        return await graph.ainvoke(fresh_run(inputs), config)
+
+    logger.info(f"Resuming thread '{thread_id}' at {', '.join(snapshot.next)}.")
+    resume_from = snapshot.config
+    if "deadline" in inputs:
+        # The recorded deadline belongs to the failed attempt
+        resume_from = await graph.aupdate_state(resume_from, {"deadline": inputs["deadline"]})
+    return await graph.ainvoke(None, resume_from)
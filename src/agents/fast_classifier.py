@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import hashlib
+import time
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from src.models.agent_models import ClassificationState
+from src.utils.config import settings
+from src.vectorstore.payload_builder import issue_query_texts
+
+# Labels suggested alongside a fast-path category; the LLM path picks its own
+CATEGORY_LABELS = {
+    "bug": ["bug"],
+    "feature": ["enhancement"],
+    "no type": ["needs triage"],
+}
+
+
+def category_from_flags(is_bug: bool, is_feature: bool) -> str:
+    if is_bug:
+        return "bug"
+    if is_feature:
+        return "feature"
+    return "no type"
+
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.where(norms == 0, 1, norms)
+
+
+class FastClassifier:
+    """
+    Multinomial logistic regression over query embeddings, predicting the issue category.
+
+    Trained on the is_bug/is_feature history in Postgres, it lets classification_agent skip the LLM
+    when its top probability reaches FAST_CLASSIFIER_THRESHOLD.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, classes: list[str]) -> None:
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.classes = classes
+        # Identifies the trained model, e.g. for caches of classifications it may have produced
+        digest = hashlib.sha256(self.weights.tobytes() + self.bias.tobytes() + "\0".join(classes).encode())
+        self.version = digest.hexdigest()[:16]
+
+    @classmethod
+    def fit(
+        cls, x: np.ndarray, y: list[str], epochs: int = 300, learning_rate: float = 0.5, l2: float = 1e-4
+    ) -> "FastClassifier":
+        classes = sorted(set(y))
+        x = normalize_rows(np.asarray(x, dtype=np.float32))
+        targets = np.eye(len(classes), dtype=np.float32)[[classes.index(label) for label in y]]
+
+        weights = np.zeros((x.shape[1], len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        # Full-batch gradient descent: the corpus is a few thousand issues at most
+        for _ in range(epochs):
+            grad = cls.softmax(x @ weights + bias) - targets
+            weights -= learning_rate * (x.T @ grad / len(x) + l2 * weights)
+            bias -= learning_rate * grad.mean(axis=0)
+        return cls(weights, bias, classes)
+
+    @staticmethod
+    def softmax(logits: np.ndarray) -> np.ndarray:
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        return self.softmax(normalize_rows(np.asarray(x, dtype=np.float32)) @ self.weights + self.bias)
+
+    def predict(self, embedding: list[float] | np.ndarray) -> tuple[str, float]:
+        proba = self.predict_proba(np.asarray(embedding)[None, :])[0]
+        best = int(np.argmax(proba))
+        return self.classes[best], float(proba[best])
+
+    def classify(self, embedding: list[float] | np.ndarray, threshold: float | None = None) -> ClassificationState | None:
+        """ClassificationState when confident enough, None to fall back to the LLM."""
+        threshold = threshold if threshold is not None else settings.FAST_CLASSIFIER_THRESHOLD
+        category, confidence = self.predict(embedding)
+        if confidence < threshold:
+            return None
+        logger.info(f"Fast-path classification: {category} ({confidence:.3f}).")
+        return ClassificationState(
+            category=category,
+            labels=CATEGORY_LABELS.get(category, []),
+        )  # Priority and assignee are not predicted; left unset, they stay out of the recommendation prompt
+
+    def save(self, path: str | None = None) -> None:
+        target = Path(path or settings.FAST_CLASSIFIER_PATH)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(target, weights=self.weights, bias=self.bias, classes=np.asarray(self.classes))
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "FastClassifier":
+        with np.load(path or settings.FAST_CLASSIFIER_PATH) as data:
+            return cls(data["weights"], data["bias"], [str(c) for c in data["classes"]])
+
+
+def evaluate(model: FastClassifier, x: np.ndarray, y: list[str], threshold: float) -> dict[str, float]:
+    """Accuracy overall and on the fast-path subset, plus single-issue prediction latency."""
+    proba = model.predict_proba(x)
+    predicted = [model.classes[i] for i in proba.argmax(axis=1)]
+    correct = np.asarray(predicted) == np.asarray(y)
+    confident = proba.max(axis=1) >= threshold
+
+    latencies = []
+    for row in x[: min(len(x), 200)]:
+        start = time.perf_counter()
+        model.predict(row)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "samples": float(len(y)),
+        "accuracy": float(correct.mean()) if len(y) else 0.0,
+        "coverage": float(confident.mean()) if len(y) else 0.0,
+        "fast_path_accuracy": float(correct[confident].mean()) if confident.any() else 0.0,
+        "p50_latency_ms": float(np.percentile(latencies, 50) * 1000) if latencies else 0.0,
+        "p95_latency_ms": float(np.percentile(latencies, 95) * 1000) if latencies else 0.0,
+    }
+
+
+async def load_training_data() -> tuple[np.ndarray, list[str]]:
+    """Embed every issue in Postgres the way issue_search_agent embeds a query (see issue_query_texts)."""
+    from src.database.session import db
+    from src.models.db_models import Issue
+    from src.vectorstore.factory import build_vector_store
+
+    with db.session_scope() as session:
+        rows = session.query(Issue.title, Issue.body, Issue.is_bug, Issue.is_feature).all()
+
+    store = build_vector_store()
+    issue_texts = [issue_query_texts(row.title or "", row.body or "") for row in rows]
+    texts = [text for query_texts in issue_texts for text in query_texts]
+    vectors: list[list[float]] = []
+    for start in range(0, len(texts), settings.BATCH_SIZE):
+        vectors.extend(await store.dense_vectors(texts[start : start + settings.BATCH_SIZE]))
+
+    labels = [category_from_flags(bool(row.is_bug), bool(row.is_feature)) for row in rows]
+    return query_embeddings(np.asarray(vectors, dtype=np.float32), [len(t) for t in issue_texts]), labels
+
+
+def query_embeddings(vectors: np.ndarray, counts: list[int]) -> np.ndarray:
+    """Mean of each issue's consecutive `counts` rows, as issue_search_agent averages its query vectors."""
+    ends = np.cumsum(counts)
+    return np.stack([vectors[end - count : end].mean(axis=0) for count, end in zip(counts, ends, strict=True)])
+
+
+def split(x: np.ndarray, y: list[str], holdout: float, seed: int = 0) -> tuple[np.ndarray, list[str], np.ndarray, list[str]]:
+    order = np.random.default_rng(seed).permutation(len(y))
+    cut = int(len(y) * (1 - holdout))
+    train, test = order[:cut], order[cut:]
+    return x[train], [y[i] for i in train], x[test], [y[i] for i in test]
+
+
+async def main(command: str, holdout: float) -> None:
+    x, y = await load_training_data()
+    logger.info(f"Loaded {len(y)} labeled issues.")
+
+    if command == "report":
+        x_train, y_train, x_test, y_test = split(x, y, holdout)
+        model = FastClassifier.fit(x_train, y_train)
+        report = evaluate(model, x_test, y_test, settings.FAST_CLASSIFIER_THRESHOLD)
+        for key, value in report.items():
+            logger.info(f"{key:<20} {value:.4f}")
+        return
+
+    model = FastClassifier.fit(x, y)
+    model.save()
+    logger.info(f"Saved fast classifier over {model.classes} to {settings.FAST_CLASSIFIER_PATH}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or evaluate the fast-path category classifier")
+    parser.add_argument("command", choices=["train", "report"], nargs="?", default="train")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Held-out fraction for the report")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.command, args.holdout))
@@ -8,12 +8,18 @@ from opentelemetry import trace
 
 from src.agents.agents import (
     classification_agent,
+    guarded_search_agent,
     input_guardrail_agent,
     issue_search_agent,
     output_guardrail_agent,
     recommendation_agent,
+    semantic_cache_agent,
+    triage_agent,
 )
+from src.agents.checkpointer import open_checkpointer, run_graph
 from src.models.agent_models import IssueState
+from src.utils.config import settings
+from src.utils.deadline import deadline_after
 
 # Get tracer for manual instrumentation
 try:
@@ -23,32 +29,69 @@ except ImportError:
     tracer = None
 
 
-def build_issue_workflow() -> StateGraph:
-    builder = StateGraph(IssueState)
-    builder.set_entry_point("Input Guardrail")
+def build_issue_workflow(single_call: bool | None = None, speculative_search: bool | None = None) -> StateGraph:
+    """
+    Build the issue graph. With `single_call` (default: settings.SINGLE_CALL_TRIAGE) one Triage node
+    returns classification and recommendation from a single LLM call instead of two sequential ones.
+    With `speculative_search` (default: settings.SPECULATIVE_SEARCH) one Guarded Search node runs the
+    input guardrail and the issue search concurrently instead of one after the other.
+    """
+    if single_call is None:
+        single_call = settings.SINGLE_CALL_TRIAGE
+    if speculative_search is None:
+        speculative_search = settings.SPECULATIVE_SEARCH
 
-    builder.add_node("Input Guardrail", input_guardrail_agent)
-    builder.add_node("Issue Search", issue_search_agent)
-    builder.add_node("Classification", classification_agent)
-    builder.add_node("Recommendation", recommendation_agent)
+    builder = StateGraph(IssueState)
+    builder.set_entry_point("Guarded Search" if speculative_search else "Input Guardrail")
+
+    if speculative_search:
+        builder.add_node("Guarded Search", guarded_search_agent)
+    else:
+        builder.add_node("Input Guardrail", input_guardrail_agent)
+        builder.add_node("Issue Search", issue_search_agent)
+    if single_call:
+        builder.add_node("Triage", triage_agent)
+    else:
+        builder.add_node("Classification", classification_agent)
+        builder.add_node("Recommendation", recommendation_agent)
     builder.add_node("Output Guardrail", output_guardrail_agent)
+    if settings.SEMANTIC_CACHE_ENABLED:
+        builder.add_node("Semantic Cache", semantic_cache_agent)
 
     # Conditional branching
     def guardrail_condition(state: IssueState) -> str:
         return "pass" if not state.blocked else "block"
 
-    builder.add_conditional_edges("Input Guardrail", guardrail_condition, {"pass": "Issue Search", "block": END})
-
-    builder.add_edge("Issue Search", "Classification")
-    builder.add_edge("Classification", "Recommendation")
-    builder.add_edge("Recommendation", "Output Guardrail")
+    # Semantic cache hits were stored after passing the output guardrail, so they skip straight to the end
+    first_llm_node = "Triage" if single_call else "Classification"
+    if speculative_search:
+        builder.add_conditional_edges(
+            "Guarded Search",
+            lambda s: "block" if s.blocked else "cached" if s.cache_hit else "miss",
+            {"block": END, "cached": END, "miss": first_llm_node},
+        )
+    else:
+        builder.add_conditional_edges("Input Guardrail", guardrail_condition, {"pass": "Issue Search", "block": END})
+        builder.add_conditional_edges(
+            "Issue Search",
+            lambda s: "cached" if s.cache_hit else "miss",
+            {"cached": END, "miss": first_llm_node},
+        )
+
+    if single_call:
+        builder.add_edge("Triage", "Output Guardrail")
+    else:
+        builder.add_edge("Classification", "Recommendation")
+        builder.add_edge("Recommendation", "Output Guardrail")
 
     # Branch for output guardrail
     builder.add_conditional_edges(
         "Output Guardrail",
         lambda s: "pass" if not s.blocked else "block",
-        {"pass": END, "block": END},
+        {"pass": "Semantic Cache" if settings.SEMANTIC_CACHE_ENABLED else END, "block": END},
     )
+    if settings.SEMANTIC_CACHE_ENABLED:
+        builder.add_edge("Semantic Cache", END)
     return builder
 
 
@@ -70,15 +113,23 @@ if __name__ == "__main__":
     """,
         help="Issue Body",
     )
+    parser.add_argument("--timeout", type=float, default=None, help="Latency budget in seconds")
+    parser.add_argument("--thread-id", type=str, default=None, help="Resume or reuse this checkpointed run")
     args = parser.parse_args()
 
     async def main() -> dict:
-        graph = build_issue_workflow().compile()
-        result = await graph.ainvoke({"title": args.title, "body": args.body})
+        async with open_checkpointer() as checkpointer:
+            graph = build_issue_workflow().compile(checkpointer=checkpointer)
+            result = await run_graph(
+                graph, {"title": args.title, "body": args.body, "deadline": deadline_after(args.timeout)}, args.thread_id
+            )
 
         if "recommendation" in result:
             logger.info("\n\n" + result["recommendation"].summary)
 
+        if result.get("skipped_steps"):
+            logger.warning("Skipped to meet the deadline: " + ", ".join(result["skipped_steps"]))
+
         if "validation_summary" in result:
             logger.info("\n\n" + "Title: " + args.title)
             logger.info("\n\n" + "Body: " + args.body)
@@ -3,22 +3,61 @@
 from langchain_openai import ChatOpenAI
 from loguru import logger
 
-from src.models.agent_models import ResponseFormatter
+from src.agents.fast_classifier import FastClassifier
+from src.agents.http_client import get_llm_http_client
+from src.agents.llm_cassette import LLMCassette, with_cassette
+from src.agents.resilient_llm import CircuitBreaker, ResilientLLM
+from src.models.agent_models import ResponseFormatter, TriageFormatter
 from src.utils.config import settings
-from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+from src.vectorstore.base import AsyncVectorStore
+from src.vectorstore.factory import build_vector_store
+from src.vectorstore.semantic_cache import SemanticCache
 
 
 class AgentServices:
     def __init__(self) -> None:
         # Initialize vector store
-        self.qdrant_store = AsyncQdrantVectorStore()
+        self.vector_store: AsyncVectorStore = build_vector_store()
+
+        # Serves stored LLM results for near-duplicate issues
+        self.semantic_cache = SemanticCache() if settings.SEMANTIC_CACHE_ENABLED else None
+
+        # Optional local classifier that answers confident categories without the LLM
+        self.fast_classifier: FastClassifier | None = None
+        if settings.FAST_CLASSIFIER_ENABLED:
+            try:
+                self.fast_classifier = FastClassifier.load()
+            except FileNotFoundError:
+                logger.warning(f"No fast classifier at '{settings.FAST_CLASSIFIER_PATH}', using the LLM only.")
 
         # Try initializing the OpenAI Chat model
         try:
-            self.llm = ChatOpenAI(
-                temperature=settings.TEMPERATURE, model=settings.LLM_MODEL_NAME, api_key=settings.OPENAI_API_KEY
+            # Retries and timeouts are owned by ResilientLLM, not the OpenAI client
+            self.chat_model = ChatOpenAI(
+                temperature=settings.TEMPERATURE,
+                model=settings.LLM_MODEL_NAME,
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                max_retries=0,
+                http_async_client=get_llm_http_client(),
+            )
+
+            # One breaker for the provider, shared by every call type
+            self.llm_breaker = CircuitBreaker()
+            self.llm = ResilientLLM(self.chat_model, "recommendation", self.llm_breaker)
+            self.llm_with_tools = ResilientLLM(
+                self.chat_model.bind_tools([ResponseFormatter]), "classification", self.llm_breaker
+            )
+            self.llm_with_triage_tool = ResilientLLM(
+                self.chat_model.bind_tools([TriageFormatter], tool_choice="TriageFormatter"), "triage", self.llm_breaker
             )
-            self.llm_with_tools = self.llm.bind_tools([ResponseFormatter])
+
+            # Record responses to, or replay them from, a local cassette for offline runs and benchmarks
+            self.llm_cassette = LLMCassette() if settings.LLM_CASSETTE_MODE != "off" else None
+            self.llm = with_cassette(self.llm, "recommendation", self.llm_cassette)
+            self.llm_with_tools = with_cassette(self.llm_with_tools, "classification", self.llm_cassette)
+            self.llm_with_triage_tool = with_cassette(self.llm_with_triage_tool, "triage", self.llm_cassette)
             logger.info("ChatOpenAI initialized successfully.")
 
         except ValueError as e:
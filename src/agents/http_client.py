@@ -0,0 +1,77 @@
+import asyncio
+import importlib.util
+
+import httpx
+from loguru import logger
+
+from src.utils.config import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def llm_max_connections() -> int:
+    """One connection per admitted request, two when hedging may double them up."""
+    if settings.LLM_MAX_CONNECTIONS:
+        return settings.LLM_MAX_CONNECTIONS
+    return settings.MAX_CONCURRENT_ISSUES * (2 if settings.LLM_HEDGING_ENABLED else 1)
+
+
+def build_llm_http_client() -> httpx.AsyncClient:
+    http2 = settings.LLM_HTTP2 and importlib.util.find_spec("h2") is not None
+    if settings.LLM_HTTP2 and not http2:
+        logger.warning("LLM_HTTP2 is set but the 'h2' package is missing, falling back to HTTP/1.1.")
+
+    max_connections = llm_max_connections()
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """Process-wide client shared by every ChatOpenAI instance, so all LLM calls reuse one connection pool."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_llm_http_client()
+    return _client
+
+
+def llm_base_url() -> str:
+    return (settings.OPENAI_BASE_URL or "https://api.openai.com/v1").rstrip("/")
+
+
+async def prewarm_llm_connections(count: int | None = None) -> int:
+    """
+    Open `count` pooled connections ahead of traffic (TCP + TLS, kept alive) with cheap concurrent
+    GET /models calls; returns how many succeeded. HTTP/2 multiplexes, so a single connection is enough.
+    """
+    client = get_llm_http_client()
+    count = count if count is not None else settings.LLM_PREWARM_CONNECTIONS
+    if settings.LLM_HTTP2 and importlib.util.find_spec("h2") is not None:
+        count = min(count, 1)
+
+    api_key = settings.OPENAI_API_KEY.get_secret_value()
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    results = await asyncio.gather(
+        *(client.get(f"{llm_base_url()}/models", headers=headers) for _ in range(count)),
+        return_exceptions=True,
+    )
+    # Any HTTP response means the connection is up; only transport errors count as failures
+    warmed = sum(1 for result in results if isinstance(result, httpx.Response))
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"LLM connection prewarm failed: {result}")
+    logger.info(f"Prewarmed {warmed}/{count} LLM connections to {llm_base_url()}.")
+    return warmed
+
+
+async def close_llm_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,114 @@
+"""
+Record/replay of LLM responses, so the graph can run and be benchmarked without OpenAI access.
+
+In "record" mode every response is appended to a JSONL cassette keyed by a hash of the call name and
+prompt; in "replay" mode responses come from the cassette after a simulated latency and a prompt that
+was never recorded raises CassetteMissError instead of reaching the provider.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+from langchain_core.load import dumpd
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from loguru import logger
+
+from src.utils.config import settings
+
+
+class CassetteMissError(KeyError):
+    """Replay mode got a prompt that is not in the cassette."""
+
+
+def prompt_key(name: str, prompt: Any) -> str:
+    payload = prompt if isinstance(prompt, str) else dumpd(prompt)
+    encoded = json.dumps({"call": name, "model": settings.LLM_MODEL_NAME, "prompt": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class LLMCassette:
+    """Prompt-hash -> response store backed by an append-only JSONL file; the last recording of a key wins."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path or settings.LLM_CASSETTE_PATH)
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry
+        logger.info(f"Loaded {len(self.entries)} recorded LLM responses from '{self.path}'.")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> tuple[BaseMessage, float] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return messages_from_dict([entry["message"]])[0], entry["latency_seconds"]
+
+    def record(self, key: str, name: str, message: BaseMessage, latency_seconds: float) -> None:
+        entry = {"key": key, "call": name, "message": message_to_dict(message), "latency_seconds": latency_seconds}
+        self.entries[key] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+class CassetteLLM:
+    """
+    `ainvoke`/`astream` wrapper that records the wrapped LLM's responses or replays them from the cassette.
+    A replayed stream is the whole recorded message as one chunk.
+    """
+
+    def __init__(self, llm: Any, name: str, cassette: LLMCassette, mode: str, replay_latency: float | None = None) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}', expected 'record' or 'replay'.")
+        self.llm = llm
+        self.name = name
+        self.cassette = cassette
+        self.mode = mode
+        self.replay_latency = replay_latency
+
+    async def ainvoke(self, prompt: Any, **kwargs: Any) -> Any:
+        key = prompt_key(self.name, prompt)
+
+        if self.mode == "replay":
+            recorded = self.cassette.get(key)
+            if recorded is None:
+                raise CassetteMissError(f"No recorded '{self.name}' response for prompt {key[:12]}")
+            message, latency = recorded
+            await asyncio.sleep(self.replay_latency if self.replay_latency is not None else latency)
+            return message
+
+        start = time.perf_counter()
+        message = await self.llm.ainvoke(prompt, **kwargs)
+        self.cassette.record(key, self.name, message, time.perf_counter() - start)
+        return message
+
+    async def astream(self, prompt: Any, **kwargs: Any) -> AsyncGenerator[Any]:
+        if self.mode == "replay":
+            yield await self.ainvoke(prompt, **kwargs)
+            return
+
+        start = time.perf_counter()
+        message = None
+        async for chunk in self.llm.astream(prompt, **kwargs):
+            message = chunk if message is None else message + chunk
+            yield chunk
+        if message is not None:
+            self.cassette.record(prompt_key(self.name, prompt), self.name, message, time.perf_counter() - start)
+
+
+def with_cassette(llm: Any, name: str, cassette: LLMCassette | None) -> Any:
+    """Wrap `llm` according to LLM_CASSETTE_MODE; returns it unchanged when the cassette is off."""
+    if cassette is None or settings.LLM_CASSETTE_MODE == "off":
+        return llm
+    return CassetteLLM(llm, name, cassette, settings.LLM_CASSETTE_MODE, settings.LLM_REPLAY_LATENCY_SECONDS)
@@ -0,0 +1,231 @@
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import openai
+from langchain_core.runnables import Runnable
+from loguru import logger
+
+from src.utils.config import settings
+
+# Provider-side failures worth another attempt; anything else (bad request, auth) is raised immediately
+RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+    TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+
+# What callers can degrade on instead of failing the request: retries exhausted or the breaker open
+LLM_UNAVAILABLE_ERRORS: tuple[type[BaseException], ...] = (*RETRYABLE_ERRORS, CircuitOpenError)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker shared by every LLM call to the same provider.
+
+    After `failure_threshold` retryable failures in a row it opens and fails fast for `reset_seconds`,
+    then lets a single trial call through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int | None = None, reset_seconds: float | None = None) -> None:
+        self.failure_threshold = failure_threshold or settings.LLM_BREAKER_FAILURE_THRESHOLD
+        self.reset_seconds = reset_seconds if reset_seconds is not None else settings.LLM_BREAKER_RESET_SECONDS
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self.trial_in_flight):
+            raise CircuitOpenError(f"LLM circuit open after {self.failures} consecutive failures")
+        if state == "half_open":
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release(self) -> None:
+        """The call ended without telling us anything about provider health (cancelled, bad request)."""
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.error(f"LLM circuit breaker opened after {self.failures} consecutive failures.")
+                record_metric("llm_circuit_open_counter")
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies, for the hedge delay."""
+
+    def __init__(self, window: int = 200) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float, min_samples: int) -> float | None:
+        if len(self.samples) < min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def record_metric(name: str, attributes: dict[str, str] | None = None) -> None:
+    try:
+        from src.utils.telemetry import get_app_metrics
+
+        getattr(get_app_metrics(), name).add(1, attributes or {})
+    except RuntimeError:
+        pass  # Telemetry not initialized
+
+
+class ResilientLLM:
+    """
+    `ainvoke` wrapper around a chat model runnable with a per-attempt timeout, full-jitter retries,
+    optional hedging after the observed p95 latency, and a shared circuit breaker. `astream` gets the
+    same timeout (per chunk), retries (until the first chunk) and breaker, without hedging.
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable,
+        name: str,
+        breaker: CircuitBreaker,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        hedging: bool | None = None,
+    ) -> None:
+        self.runnable = runnable
+        self.name = name
+        self.breaker = breaker
+        self.timeout = timeout or settings.LLM_TIMEOUT_SECONDS
+        self.max_retries = max_retries if max_retries is not None else settings.LLM_MAX_RETRIES
+        self.hedging = hedging if hedging is not None else settings.LLM_HEDGING_ENABLED
+        self.latency = LatencyTracker()
+
+    def hedge_delay(self) -> float | None:
+        p95 = self.latency.percentile(0.95, settings.LLM_HEDGE_MIN_SAMPLES)
+        return max(p95, settings.LLM_HEDGE_MIN_DELAY_SECONDS) if p95 is not None else None
+
+    def backoff(self, attempt: int) -> float:
+        cap = min(settings.LLM_RETRY_BACKOFF_MAX_SECONDS, settings.LLM_RETRY_BACKOFF_SECONDS * 2**attempt)
+        return random.uniform(0, cap)
+
+    async def call_once(self, prompt: Any, **kwargs: Any) -> Any:
+        return await asyncio.wait_for(self.runnable.ainvoke(prompt, **kwargs), timeout=self.timeout)
+
+    async def attempt(self, prompt: Any, **kwargs: Any) -> Any:
+        """One logical attempt: the primary request, plus a hedge if it is slower than the p95."""
+        delay = self.hedge_delay() if self.hedging else None
+        if delay is None:
+            return await self.call_once(prompt, **kwargs)
+
+        primary = asyncio.ensure_future(self.call_once(prompt, **kwargs))
+        pending: set[asyncio.Future] = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                record_metric("llm_hedged_requests_counter", {"call": self.name})
+                pending.add(asyncio.ensure_future(self.call_once(prompt, **kwargs)))
+
+            # First success wins; a failure only counts once both requests have failed
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    assert error is not None
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def ainvoke(self, prompt: Any, **kwargs: Any) -> Any:
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            start = time.monotonic()
+            try:
+                result = await self.attempt(prompt, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                record_metric("openai_requests_counter", {"call": self.name, "status": "error"})
+                if attempt == self.max_retries:
+                    raise
+                wait = self.backoff(attempt)
+                logger.warning(f"LLM call '{self.name}' failed ({type(e).__name__}), retry {attempt + 1} in {wait:.2f}s.")
+                record_metric("llm_retries_counter", {"call": self.name})
+                await asyncio.sleep(wait)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            self.breaker.record_success()
+            self.latency.record(time.monotonic() - start)
+            record_metric("openai_requests_counter", {"call": self.name, "status": "success"})
+            return result
+        raise AssertionError("unreachable")
+
+    async def astream(self, prompt: Any, **kwargs: Any) -> AsyncGenerator[Any]:
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            start = time.monotonic()
+            stream = self.runnable.astream(prompt, **kwargs)
+            streamed = False
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    streamed = True
+                    yield chunk
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                record_metric("openai_requests_counter", {"call": self.name, "status": "error"})
+                # Chunks already handed to the caller cannot be taken back, so only a silent failure is retried
+                if streamed or attempt == self.max_retries:
+                    raise
+                wait = self.backoff(attempt)
+                logger.warning(f"LLM stream '{self.name}' failed ({type(e).__name__}), retry {attempt + 1} in {wait:.2f}s.")
+                record_metric("llm_retries_counter", {"call": self.name})
+                await asyncio.sleep(wait)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            finally:
+                if (aclose := getattr(stream, "aclose", None)) is not None:
+                    await aclose()  # Stops generation when the caller stopped reading
+
+            self.breaker.record_success()
+            self.latency.record(time.monotonic() - start)
+            record_metric("openai_requests_counter", {"call": self.name, "status": "success"})
+            return
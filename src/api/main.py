@@ -1,7 +1,8 @@
+import asyncio
 import os
 import time
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Annotated, Any
 
 from fastapi import Depends, FastAPI, HTTPException, Request, Response
@@ -9,9 +10,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from loguru import logger
 
+from src.agents.checkpointer import open_checkpointer, run_graph
 from src.agents.graph import build_issue_workflow
+from src.agents.http_client import close_llm_http_client, prewarm_llm_connections
 from src.models.agent_models import IssueState
 from src.models.api_model import ErrorResponse, HealthResponse, IssueRequest
+from src.utils.config import settings
+from src.utils.deadline import deadline_after
+from src.utils.guardrails import guardrail_validator
 from src.utils.telemetry import get_app_metrics, initialize_telemetry, instrument_fastapi
 
 # Global cache
@@ -43,16 +49,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.warning(f"Failed to initialize OpenTelemetry: {e}")
 
     # Pre-compile the graph for better performance
+    checkpoints = AsyncExitStack()
     try:
-        compiled_graph = build_issue_workflow().compile()
+        checkpointer = await checkpoints.enter_async_context(open_checkpointer())
+        compiled_graph = build_issue_workflow().compile(checkpointer=checkpointer)
         logger.info("Workflow graph compiled successfully")
     except Exception as e:
         logger.error(f"Failed to compile workflow graph: {e}")
         raise
 
+    # Open LLM connections now so the first requests skip the TCP/TLS handshakes
+    await prewarm_llm_connections()
+
+    # Run the guardrail models once so the first request does not pay for their lazy setup
+    try:
+        await guardrail_validator.warmup()
+    except Exception as e:
+        logger.warning(f"Guardrail warmup failed: {e}")
+
     yield
 
     logger.info("🛑 Shutting down Issue Processing API...")
+    await close_llm_http_client()
+    await checkpoints.aclose()
 
 
 app = FastAPI(
@@ -104,6 +123,21 @@ async def log_requests(request: Request, call_next: Any) -> Response:
     return response
 
 
+# Admission control: bounds in-flight graph runs, which also sizes the LLM connection pool
+admission = asyncio.Semaphore(settings.MAX_CONCURRENT_ISSUES)
+
+
+async def admit_request() -> AsyncGenerator[None, None]:
+    try:
+        await asyncio.wait_for(admission.acquire(), timeout=settings.ADMISSION_TIMEOUT_SECONDS)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail="Server busy, retry later.") from e
+    try:
+        yield
+    finally:
+        admission.release()
+
+
 # Dependency for graph access
 async def get_compiled_graph() -> Any:
     """Dependency to get the compiled workflow graph"""
@@ -139,6 +173,7 @@ def readiness() -> dict[str, Any]:
 async def process_issue(
     request: IssueRequest,
     graph: Annotated[Any, Depends(get_compiled_graph)],
+    _: Annotated[None, Depends(admit_request)],
 ) -> IssueState:
     """
     Process an issue for secret detection and analysis.
@@ -164,11 +199,14 @@ async def process_issue(
         logger.info(f"Processing issue: '{request.title}' (body length: {len(request.body)} chars)")
 
         # Process the issue
-        result = await graph.ainvoke(
+        result = await run_graph(
+            graph,
             {
                 "title": request.title,
                 "body": request.body,
-            }
+                "deadline": deadline_after(request.timeout_seconds or settings.REQUEST_DEADLINE_SECONDS),
+            },
+            request.thread_id,
         )
 
         # Log processing completion
@@ -180,11 +218,14 @@ async def process_issue(
             app_metrics.issue_processing_duration.record(processing_time)
 
         # Create response
-        response = IssueState(**result)
+        # The graph validated every update already
+        response = IssueState.model_construct(**result)
 
         # Log results summary
         blocked_status = "BLOCKED" if response.blocked else "PASSED"
         logger.info(f"Issue processed: '{request.title}' - {blocked_status} - Time: {processing_time:.3f}s")
+        if response.skipped_steps:
+            logger.warning(f"Skipped to meet the deadline: {', '.join(response.skipped_steps)}")
 
         # Log validation details if blocked
         if response.blocked and hasattr(response, "validation_summary"):
@@ -209,20 +250,20 @@ async def process_issue(
 
 # Validation endpoint
 @app.post("/validate", tags=["Processing"])
-async def validate_issue(request: IssueRequest, graph: Annotated[Any, Depends(get_compiled_graph)]) -> dict[str, Any]:
+async def validate_issue(
+    request: IssueRequest,
+    graph: Annotated[Any, Depends(get_compiled_graph)],
+    _: Annotated[None, Depends(admit_request)],
+) -> dict[str, Any]:
     """
     Quick validation check for an issue (lighter than full processing).
     Returns basic validation results without detailed recommendations.
     """
     try:
-        result = await graph.ainvoke(
-            {
-                "title": request.title,
-                "body": request.body,
-            }
-        )
+        result = await run_graph(graph, {"title": request.title, "body": request.body}, request.thread_id)
 
-        response = IssueState(**result)
+        # The graph validated every update already
+        response = IssueState.model_construct(**result)
 
         return {
             "valid": not response.blocked,
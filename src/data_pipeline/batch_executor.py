@@ -0,0 +1,159 @@
+"""
+Batch LLM execution over JSONL files in the OpenAI Batch API format.
+
+Input lines:  {"custom_id", "method": "POST", "url": "/v1/chat/completions", "body": {...}}
+Output lines: {"id", "custom_id", "response": {"status_code", "body": {...}} | None, "error": {...} | None}
+"""
+
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Final
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from loguru import logger
+from pydantic import BaseModel
+
+from src.utils.config import settings
+
+CHAT_COMPLETIONS_URL: Final = "/v1/chat/completions"
+
+
+def build_tool_request(custom_id: str, prompt: str, tool: type[BaseModel]) -> dict[str, Any]:
+    """One batch line forcing a single structured tool call, like `llm.bind_tools([tool])`."""
+    openai_tool = convert_to_openai_tool(tool)
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": CHAT_COMPLETIONS_URL,
+        "body": {
+            "model": settings.LLM_MODEL_NAME,
+            "temperature": settings.TEMPERATURE,
+            "messages": [{"role": "user", "content": prompt}],
+            "tools": [openai_tool],
+            "tool_choice": {"type": "function", "function": {"name": openai_tool["function"]["name"]}},
+        },
+    }
+
+
+def write_jsonl(path: Path, lines: list[dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+
+
+def read_jsonl(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def parse_tool_arguments(output_line: dict[str, Any]) -> dict[str, Any] | None:
+    """Arguments of the first tool call in a successful output line, None for failed requests."""
+    response = output_line.get("response") or {}
+    if output_line.get("error") or response.get("status_code") != 200:
+        return None
+    try:
+        tool_call = response["body"]["choices"][0]["message"]["tool_calls"][0]
+        return json.loads(tool_call["function"]["arguments"])
+    except (KeyError, IndexError, TypeError, json.JSONDecodeError):
+        return None
+
+
+class BatchExecutor(ABC):
+    @abstractmethod
+    async def run(self, input_path: Path, output_path: Path) -> None:
+        """Execute every request in `input_path` and leave one output line per request in `output_path`."""
+
+
+class LocalBatchExecutor(BatchExecutor):
+    """
+    Stand-in for a provider batch API: sends the requests to the regular chat completions endpoint with
+    bounded concurrency. Output lines are appended as they finish, so a rerun only sends what is missing.
+    """
+
+    def __init__(self, concurrency: int | None = None) -> None:
+        self.concurrency = concurrency or settings.BULK_TRIAGE_CONCURRENCY
+
+    async def run(self, input_path: Path, output_path: Path) -> None:
+        from src.agents.http_client import get_llm_http_client, llm_base_url
+
+        done = {line["custom_id"] for line in read_jsonl(output_path)}
+        pending = [line for line in read_jsonl(input_path) if line["custom_id"] not in done]
+        logger.info(f"Local batch '{input_path.name}': {len(pending)} requests to send, {len(done)} already done.")
+
+        client = get_llm_http_client()
+        api_key = settings.OPENAI_API_KEY.get_secret_value()
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        lock = asyncio.Lock()
+
+        async def execute(request: dict[str, Any]) -> None:
+            async with semaphore:
+                result: dict[str, Any] = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": request["custom_id"]}
+                try:
+                    response = await client.post(
+                        llm_base_url() + request["url"].removeprefix("/v1"), json=request["body"], headers=headers
+                    )
+                    result["response"] = {"status_code": response.status_code, "body": response.json()}
+                    result["error"] = None
+                except Exception as e:
+                    result["response"] = None
+                    result["error"] = {"code": type(e).__name__, "message": str(e)}
+
+            async with lock:
+                with open(output_path, "a") as f:
+                    f.write(json.dumps(result) + "\n")
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.gather(*(execute(request) for request in pending))
+
+
+class OpenAIBatchExecutor(BatchExecutor):
+    """Submits the file to the OpenAI Batch API (half price, 24h window) and polls until it completes."""
+
+    async def run(self, input_path: Path, output_path: Path) -> None:
+        from openai import AsyncOpenAI
+
+        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY.get_secret_value(), base_url=settings.OPENAI_BASE_URL or None)
+
+        # The batch id is checkpointed next to the input so a restarted run polls instead of resubmitting
+        batch_id_path = input_path.with_suffix(".batch_id")
+        if batch_id_path.exists():
+            batch_id = batch_id_path.read_text().strip()
+        else:
+            with open(input_path, "rb") as f:
+                uploaded = await client.files.create(file=f, purpose="batch")
+            batch = await client.batches.create(
+                input_file_id=uploaded.id, endpoint=CHAT_COMPLETIONS_URL, completion_window="24h"
+            )
+            batch_id = batch.id
+            batch_id_path.write_text(batch_id)
+            logger.info(f"Submitted batch {batch_id} for '{input_path.name}'.")
+
+        while True:
+            batch = await client.batches.retrieve(batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                break
+            logger.info(f"Batch {batch_id} is {batch.status}, polling again in {settings.BULK_TRIAGE_POLL_SECONDS}s.")
+            await asyncio.sleep(settings.BULK_TRIAGE_POLL_SECONDS)
+
+        lines: list[str] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await client.files.content(file_id)
+                lines.extend(line for line in content.text.splitlines() if line.strip())
+        output_path.write_text("\n".join(lines) + ("\n" if lines else ""))
+        logger.info(f"Batch {batch_id} finished as {batch.status} with {len(lines)} output lines.")
+
+
+def build_batch_executor() -> BatchExecutor:
+    if settings.BULK_TRIAGE_EXECUTOR == "local":
+        return LocalBatchExecutor()
+    if settings.BULK_TRIAGE_EXECUTOR == "openai":
+        return OpenAIBatchExecutor()
+    raise ValueError(f"Unknown BULK_TRIAGE_EXECUTOR '{settings.BULK_TRIAGE_EXECUTOR}', expected 'local' or 'openai'.")
@@ -0,0 +1,240 @@
+"""
+Offline bulk triage: backfill the classifications table for issues that were never classified.
+
+Guardrails, similar-issue search and prompt building run locally; the LLM calls go through a batch
+executor as one JSONL file per chunk of issues. Chunk files under BULK_TRIAGE_DIR are the checkpoint:
+a chunk without a `.done` marker is resumed (its batch is polled or its missing requests re-sent)
+before new issues are selected, and issues only count as done once their row is in the table.
+"""
+
+import argparse
+import asyncio
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.data_pipeline.batch_executor import (
+    BatchExecutor,
+    build_batch_executor,
+    build_tool_request,
+    parse_tool_arguments,
+    read_jsonl,
+    write_jsonl,
+)
+from src.database.session import db
+from src.models.agent_models import ClassificationState, IssueState, ResponseFormatter
+from src.models.db_models import Classification, Issue
+from src.utils.config import settings
+from src.utils.prompt_builder import build_classification_prompt
+
+CUSTOM_ID_PREFIX = "issue-"
+
+
+@dataclass
+class ChunkResult:
+    classified: dict[int, ClassificationState] = field(default_factory=dict)
+    failed: list[int] = field(default_factory=list)
+
+
+def custom_id_for(issue_id: int) -> str:
+    return f"{CUSTOM_ID_PREFIX}{issue_id}"
+
+
+def issue_id_from(custom_id: str) -> int:
+    return int(custom_id.removeprefix(CUSTOM_ID_PREFIX))
+
+
+def output_path_for(input_path: Path) -> Path:
+    return input_path.with_name(input_path.name.replace(".input.jsonl", ".output.jsonl"))
+
+
+def done_marker_for(input_path: Path) -> Path:
+    return input_path.with_suffix(".done")
+
+
+def pending_chunks(work_dir: Path) -> list[Path]:
+    """Chunk input files whose results have not been written to the table yet."""
+    return sorted(path for path in work_dir.glob("chunk-*.input.jsonl") if not done_marker_for(path).exists())
+
+
+def select_unclassified(session: Session, after_id: int, limit: int) -> list[tuple[int, str, str]]:
+    """Keyset page of issues without a classification row, ordered by id."""
+    stmt = (
+        select(Issue.id, Issue.title, Issue.body)
+        .outerjoin(Classification, Classification.issue_id == Issue.id)
+        .where(Classification.id.is_(None), Issue.id > after_id)
+        .order_by(Issue.id)
+        .limit(limit)
+    )
+    return [(issue_id, title, body or "") for issue_id, title, body in session.execute(stmt)]
+
+
+def save_classifications(
+    session: Session, classified: dict[int, ClassificationState], blocked: list[int], batch_file: str | None
+) -> int:
+    """Insert classification rows, skipping issues that already have one; returns the number of rows added."""
+    issue_ids = [*classified, *blocked]
+    if not issue_ids:
+        return 0
+    existing = set(session.scalars(select(Classification.issue_id).where(Classification.issue_id.in_(issue_ids))))
+
+    rows = [
+        Classification(
+            issue_id=issue_id,
+            status="classified",
+            category=classification.category,
+            priority=classification.priority,
+            labels=classification.labels,
+            assignee=classification.assignee,
+            model=settings.LLM_MODEL_NAME,
+            batch_file=batch_file,
+        )
+        for issue_id, classification in classified.items()
+        if issue_id not in existing
+    ]
+    rows += [Classification(issue_id=issue_id, status="blocked") for issue_id in blocked if issue_id not in existing]
+    session.add_all(rows)
+    return len(rows)
+
+
+def collect_results(input_path: Path) -> ChunkResult:
+    """Match output lines to the chunk's requests; requests without a usable tool call count as failed."""
+    outputs = {line["custom_id"]: line for line in read_jsonl(output_path_for(input_path))}
+    result = ChunkResult()
+
+    for request in read_jsonl(input_path):
+        issue_id = issue_id_from(request["custom_id"])
+        output = outputs.get(request["custom_id"])
+        arguments = parse_tool_arguments(output) if output is not None else None
+        try:
+            if arguments is None:
+                raise ValueError("missing or failed response")
+            result.classified[issue_id] = ClassificationState(**arguments)
+        except (ValueError, ValidationError) as e:
+            logger.warning(f"Bulk triage request {request['custom_id']} failed: {e}")
+            result.failed.append(issue_id)
+    return result
+
+
+async def prepare_issue(issue_id: int, title: str, body: str) -> dict[str, Any]:
+    """Run the graph's pre-LLM steps for one issue: a batch request, a cached classification, or blocked."""
+    # Imported here so the file helpers above stay usable without loading the embedding and guardrail models
+    from src.agents.agents import input_guardrail_agent, issue_search_agent
+
+    state = IssueState(title=title, body=body)
+    guardrail = await input_guardrail_agent(state)
+    if isinstance(guardrail, IssueState):
+        return {"error": guardrail.errors}
+    if guardrail.get("blocked"):
+        return {"blocked": True}
+
+    search = await issue_search_agent(state)
+    if isinstance(search, IssueState):
+        return {"error": search.errors}
+    if search.get("classification") is not None:
+        return {"classification": search["classification"]}
+
+    prompt = build_classification_prompt(title, body, search.get("similar_issues"))
+    return {"request": build_tool_request(custom_id_for(issue_id), prompt.text, ResponseFormatter)}
+
+
+async def prepare_chunk(issues: list[tuple[int, str, str]], work_dir: Path) -> Path | None:
+    """Prepare a chunk locally, save blocked and cache-hit issues right away and write the batch input file."""
+    semaphore = asyncio.Semaphore(settings.BULK_TRIAGE_CONCURRENCY)
+
+    async def prepare(issue: tuple[int, str, str]) -> dict[str, Any]:
+        async with semaphore:
+            return await prepare_issue(*issue)
+
+    prepared = await asyncio.gather(*(prepare(issue) for issue in issues))
+
+    requests, blocked, cached = [], [], {}
+    for (issue_id, _, _), item in zip(issues, prepared, strict=True):
+        if "request" in item:
+            requests.append(item["request"])
+        elif "classification" in item:
+            cached[issue_id] = item["classification"]
+        elif item.get("blocked"):
+            blocked.append(issue_id)
+        else:
+            logger.warning(f"Bulk triage could not prepare issue {issue_id}: {item.get('error')}")
+
+    with db.session_scope() as session:
+        save_classifications(session, cached, blocked, batch_file=None)
+    logger.info(f"Prepared {len(issues)} issues: {len(requests)} requests, {len(blocked)} blocked, {len(cached)} cached.")
+
+    if not requests:
+        return None
+
+    # Written under a temporary name and renamed, so a crash never leaves a partial chunk to resume
+    input_path = work_dir / f"chunk-{issues[0][0]:020d}.input.jsonl"
+    tmp_path = input_path.with_suffix(".tmp")
+    write_jsonl(tmp_path, requests)
+    os.replace(tmp_path, input_path)
+    return input_path
+
+
+async def execute_chunk(input_path: Path, executor: BatchExecutor) -> ChunkResult:
+    await executor.run(input_path, output_path_for(input_path))
+    result = collect_results(input_path)
+
+    with db.session_scope() as session:
+        saved = save_classifications(session, result.classified, [], batch_file=input_path.name)
+    done_marker_for(input_path).touch()
+
+    logger.info(f"Chunk '{input_path.name}': {saved} classifications saved, {len(result.failed)} failed.")
+    return result
+
+
+async def run_bulk_triage(
+    limit: int | None = None, executor: BatchExecutor | None = None, work_dir: Path | None = None
+) -> dict[str, int]:
+    executor = executor or build_batch_executor()
+    work_dir = work_dir or Path(settings.BULK_TRIAGE_DIR)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    totals = {"classified": 0, "failed": 0, "issues": 0}
+
+    for input_path in pending_chunks(work_dir):
+        logger.info(f"Resuming unfinished chunk '{input_path.name}'.")
+        result = await execute_chunk(input_path, executor)
+        totals["classified"] += len(result.classified)
+        totals["failed"] += len(result.failed)
+
+    # Failed issues stay unclassified and are picked up by the next run, not retried in this one
+    after_id = 0
+    while limit is None or totals["issues"] < limit:
+        page_size = (
+            settings.BULK_TRIAGE_CHUNK_SIZE
+            if limit is None
+            else min(settings.BULK_TRIAGE_CHUNK_SIZE, limit - totals["issues"])
+        )
+        with db.session_scope() as session:
+            issues = select_unclassified(session, after_id, page_size)
+        if not issues:
+            break
+        after_id = issues[-1][0]
+        totals["issues"] += len(issues)
+
+        chunk_path = await prepare_chunk(issues, work_dir)
+        if chunk_path is not None:
+            result = await execute_chunk(chunk_path, executor)
+            totals["classified"] += len(result.classified)
+            totals["failed"] += len(result.failed)
+
+    logger.success(f"Bulk triage finished: {totals}")
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill issue classifications through a batch LLM interface.")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of new issues to triage")
+    parser.add_argument("--work-dir", type=Path, default=None, help=f"Chunk directory (default: {settings.BULK_TRIAGE_DIR})")
+    args = parser.parse_args()
+
+    asyncio.run(run_bulk_triage(limit=args.limit, work_dir=args.work_dir))
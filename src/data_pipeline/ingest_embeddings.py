@@ -1,5 +1,4 @@
 import asyncio
-import textwrap
 import uuid
 from collections.abc import AsyncGenerator, Generator, Iterable
 from typing import Any
@@ -7,16 +6,19 @@ from typing import Any
 from loguru import logger
 from qdrant_client.models import Batch, FieldCondition, Filter, MatchValue
 
+from src.data_pipeline.issue_digest import build_issue_digest
 from src.database.session import db
 from src.models.db_models import Comment, Issue
-from src.vectorstore.payload_builder import BATCH_SIZE, CHUNK_SIZE, CONCURRENT_COMMENTS, build_comment_payload
+from src.vectorstore.payload_builder import (
+    BATCH_SIZE,
+    CONCURRENT_COMMENTS,
+    build_comment_payload,
+    build_issue_payload,
+    split_text_into_chunks,
+)
 from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
 
 
-def split_text_into_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> list[str]:
-    return textwrap.wrap(text, width=chunk_size, break_long_words=False)
-
-
 def batch_iterable(iterable: Iterable[Any], batch_size: int = BATCH_SIZE) -> Generator[list[Any], None, None]:
     batch = []
     for item in iterable:
@@ -60,17 +62,19 @@ async def chunk_data_for_comment(
         }
 
 
-async def upsert_comment_chunks(qdrant: AsyncQdrantVectorStore, comment: Comment, issue: Issue) -> bool:
+async def upsert_comment_chunks(qdrant: AsyncQdrantVectorStore, comment: Comment, issue: Issue) -> int:
+    """Upsert a comment's chunks and return the number of points written (0 when skipped)."""
     if not comment.body:
         logger.info(f"Skipping empty comment {comment.comment_id} in issue #{issue.number}")
-        return False
+        return 0
 
     if await comment_already_ingested(qdrant, int(issue.number), comment.comment_id):
         logger.info(f"Skipping comment {comment.comment_id} in issue #{issue.number} — already ingested.")
-        return False
+        return 0
 
     chunk_gen = chunk_data_for_comment(comment, issue, qdrant)
     batches_for_comment = 0
+    points_for_comment = 0
 
     async for batch in async_batch_iterable(chunk_gen, batch_size=BATCH_SIZE):
         ids = [item["id"] for item in batch]
@@ -88,13 +92,13 @@ async def upsert_comment_chunks(qdrant: AsyncQdrantVectorStore, comment: Comment
                 ),
             )
             batches_for_comment += 1
+            points_for_comment += len(ids)
         except Exception as upsert_error:
             logger.error(f"Failed to upsert comment {comment.comment_id}: {upsert_error}")
 
     if batches_for_comment > 0:
         logger.info(f"Upserted {batches_for_comment} batch(es) for comment {comment.comment_id} in issue #{issue.number}")
-        return True
-    return False
+    return points_for_comment
 
 
 async def async_batch_iterable(
@@ -110,13 +114,17 @@ async def async_batch_iterable(
         yield batch
 
 
-async def process_issue_comments(qdrant: AsyncQdrantVectorStore, issue: Issue) -> None:
+async def process_issue_comments(qdrant: AsyncQdrantVectorStore, issue: Issue) -> int:
     with db.session_scope() as session:
         comments = session.query(Comment).filter(Comment.issue_id == issue.id).order_by(Comment.created_at.asc()).all()
 
+        # Computed before the chunks are built so every point carries the digest in its payload
+        if issue.digest is None:
+            issue.digest = build_issue_digest(issue, comments)
+
         semaphore = asyncio.Semaphore(CONCURRENT_COMMENTS)
 
-        async def sem_task(comment: Comment) -> bool:
+        async def sem_task(comment: Comment) -> int:
             async with semaphore:
                 return await upsert_comment_chunks(qdrant, comment, issue)
 
@@ -124,8 +132,15 @@ async def process_issue_comments(qdrant: AsyncQdrantVectorStore, issue: Issue) -
         results = await asyncio.gather(*tasks)
 
         total_comments = len(comments)
-        total_skipped = total_comments - sum(results)
-        total_ingested = sum(results)
+        total_ingested = sum(1 for points in results if points)
+        total_skipped = total_comments - total_ingested
+
+        # Refresh the issue-level centroid used by the coarse search stage; it is rebuilt from the chunks on
+        # every run, so a failure here is repaired by the next ingestion instead of aborting this one
+        try:
+            await qdrant.upsert_issue_centroid(int(issue.number), build_issue_payload(issue))
+        except Exception as centroid_error:
+            logger.error(f"Failed to upsert the centroid of issue #{issue.number}: {centroid_error}")
 
         logger.info(
             f"Issue #{issue.number} from {issue.repo} processed: "
@@ -133,14 +148,18 @@ async def process_issue_comments(qdrant: AsyncQdrantVectorStore, issue: Issue) -
             f"{total_skipped} skipped, "
             f"{total_ingested} ingested."
         )
+        return sum(results)
 
 
-async def ingest_issues_to_qdrant_async() -> None:
-    qdrant = AsyncQdrantVectorStore()
+async def ingest_issues_to_qdrant_async(qdrant: AsyncQdrantVectorStore | None = None) -> int:
+    """Ingest every issue's comments and return the number of points written."""
+    qdrant = qdrant or AsyncQdrantVectorStore()
+    total_points = 0
     with db.session_scope() as session:
         issues = session.query(Issue).yield_per(10)
         for issue in issues:
-            await process_issue_comments(qdrant, issue)
+            total_points += await process_issue_comments(qdrant, issue)
+    return total_points
 
 
 if __name__ == "__main__":
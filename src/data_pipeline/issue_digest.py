@@ -0,0 +1,79 @@
+"""
+Compact per-issue digests (type, state, title, problem, resolution) computed once at ingestion time.
+
+Prompts quote the digest of each similar issue instead of raw comment chunks. Digests are extractive,
+built from the issue body and its last comment and capped in tokens, so backfilling thousands of issues
+needs no LLM calls.
+
+    make backfill-digests
+"""
+
+import argparse
+import asyncio
+import re
+
+from loguru import logger
+from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+from src.database.session import db
+from src.models.db_models import Comment, Issue
+from src.utils.config import settings
+from src.utils.prompt_builder import truncate_to_tokens
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+# Issue templates and pasted tracebacks spend tokens without saying what the issue is about
+_NOISE_PATTERN = re.compile(r"```.*?```|<!--.*?-->|^#+ [^\n]*$", re.DOTALL | re.MULTILINE)
+
+
+def clean_text(text: str | None) -> str:
+    return " ".join(_NOISE_PATTERN.sub(" ", text or "").split())
+
+
+def build_issue_digest(issue: Issue, comments: list[Comment]) -> str:
+    kind = "bug" if issue.is_bug else "feature" if issue.is_feature else "issue"
+    parts = [f"[{kind}, {issue.state or 'unknown'}] {truncate_to_tokens(issue.title, settings.PROMPT_MAX_TITLE_TOKENS)}."]
+
+    problem = clean_text(issue.body)
+    if problem:
+        parts.append(f"Problem: {truncate_to_tokens(problem, settings.DIGEST_PROBLEM_TOKENS)}")
+
+    # The last comment usually says how a closed issue ended; on open issues it is the latest status
+    last_comment = next((clean_text(c.body) for c in reversed(comments) if clean_text(c.body)), "")
+    if last_comment:
+        label = "Resolution" if issue.state == "closed" else "Latest"
+        parts.append(f"{label}: {truncate_to_tokens(last_comment, settings.DIGEST_RESOLUTION_TOKENS)}")
+
+    return " ".join(parts)
+
+
+async def set_digest_payload(qdrant: AsyncQdrantVectorStore, issue_number: int, digest: str) -> None:
+    """Attach the digest to every point of the issue (comment chunks and the issue centroid)."""
+    issue_filter = Filter(must=[FieldCondition(key="issue_number", match=MatchValue(value=issue_number))])
+    for collection_name in (qdrant.collection_name, qdrant.issue_collection_name):
+        await qdrant.client.set_payload(collection_name=collection_name, payload={"digest": digest}, points=issue_filter)
+
+
+async def backfill_digests(qdrant: AsyncQdrantVectorStore | None = None, refresh: bool = False) -> int:
+    """Compute missing digests (all of them with `refresh`) in Postgres and Qdrant; returns how many were written."""
+    qdrant = qdrant or AsyncQdrantVectorStore()
+    written = 0
+    with db.session_scope() as session:
+        query = session.query(Issue)
+        if not refresh:
+            query = query.filter(Issue.digest.is_(None))
+
+        for issue in query.yield_per(100):
+            comments = session.query(Comment).filter(Comment.issue_id == issue.id).order_by(Comment.created_at.asc()).all()
+            issue.digest = build_issue_digest(issue, comments)
+            await set_digest_payload(qdrant, int(issue.number), issue.digest)
+            written += 1
+
+    logger.success(f"Wrote {written} issue digests.")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute issue digests for prompts")
+    parser.add_argument("--refresh", action="store_true", help="Recompute digests that already exist")
+    args = parser.parse_args()
+    asyncio.run(backfill_digests(refresh=args.refresh))
@@ -12,7 +12,7 @@ def init_db() -> None:
     inspector = inspect(db.engine)
     existing_tables = inspector.get_table_names()
 
-    if "issues" in existing_tables and "comments" in existing_tables:
+    if all(table in existing_tables for table in Base.metadata.tables):
         logger.info("Tables already exist. Skipping creation.")
     else:
         logger.info("Creating tables in the database...")
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -15,15 +16,59 @@ class Recommendation(BaseModel):
     references: list[str] | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class SimilarIssue:
+    """
+    One search hit. Slotted and frozen: the state validator passes instances through as they are, so the
+    list built by the search node reaches every later node without being copied or re-validated.
+    """
+
+    issue_number: int | None = None
+    repo: str | None = None
+    owner: str | None = None
+    title: str | None = None
+    url: str | None = None
+    comment_id: int | None = None
+    chunk_text: str | None = None
+    score: float | None = None
+    is_bug: bool | None = None
+    is_feature: bool | None = None
+    digest: str | None = None
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], score: float) -> "SimilarIssue":
+        return cls(
+            issue_number=payload.get("issue_number"),
+            repo=payload.get("repo"),
+            owner=payload.get("owner"),
+            title=payload.get("title"),
+            url=payload.get("url"),
+            comment_id=payload.get("comment_id"),
+            chunk_text=payload.get("chunk_text"),
+            score=score,
+            is_bug=payload.get("is_bug"),
+            is_feature=payload.get("is_feature"),
+            digest=payload.get("digest"),
+        )
+
+
 class IssueState(BaseModel):
     title: str | None = None
     body: str | None = None
-    similar_issues: list[dict[str, Any]] | None = None
+    similar_issues: list[SimilarIssue] | None = None
     classification: ClassificationState | None = None
     recommendation: Recommendation | None = None
     errors: list[str] | None = None
     blocked: bool | None = None
     validation_summary: dict[str, Any] | None = None
+    cache_hit: bool | None = None
+    skipped_steps: list[str] | None = None
+    # Set when the output guardrail already ran over the streamed recommendation
+    output_checked: bool | None = Field(default=None, exclude=True)
+    # Absolute request deadline (epoch seconds), see src/utils/deadline.py
+    deadline: float | None = Field(default=None, exclude=True)
+    # Reused by the semantic cache; too large to return to API clients
+    query_embedding: list[float] | None = Field(default=None, exclude=True)
 
 
 class ResponseFormatter(BaseModel):
@@ -34,3 +79,13 @@ class ResponseFormatter(BaseModel):
     labels: list[str] = Field(description="The labels of the issue")
     assignee: str = Field(description="The assignee of the issue")
     errors: list[str] = Field(description="The errors of the issue")
+
+
+class TriageFormatter(BaseModel):
+    """Pydantic schema for the single-call mode: classification and recommendation in one tool call."""
+
+    category: str = Field(description="The category of the issue")
+    priority: str = Field(description="The priority of the issue")
+    labels: list[str] = Field(description="The labels of the issue")
+    assignee: str = Field(description="The assignee of the issue")
+    summary: str = Field(description="A helpful recommendation summary for the issue")
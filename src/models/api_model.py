@@ -1,10 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # Input schema for the API
 class IssueRequest(BaseModel):
     title: str
     body: str
+    # Latency budget for this request; defaults to settings.REQUEST_DEADLINE_SECONDS
+    timeout_seconds: float | None = Field(default=None, gt=0)
+    # With GRAPH_CHECKPOINTER on, a retry with the same id resumes the earlier run instead of restarting it
+    thread_id: str | None = Field(default=None, max_length=128)
 
 
 class HealthResponse(BaseModel):
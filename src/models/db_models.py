@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from pydantic import BaseModel, Field
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from src.utils.config import settings
@@ -38,6 +38,7 @@ class Issue(Base):  # type: ignore
     updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     is_bug: Mapped[bool] = mapped_column(Boolean, default=False)
     is_feature: Mapped[bool] = mapped_column(Boolean, default=False)
+    digest: Mapped[str | None] = mapped_column(Text, nullable=True)  # Compact summary fed to prompts
 
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="issue", cascade="all, delete-orphan")
 
@@ -53,3 +54,19 @@ class Comment(Base):  # type: ignore
     updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     issue: Mapped["Issue"] = relationship("Issue", back_populates="comments")
+
+
+class Classification(Base):  # type: ignore
+    __tablename__ = settings.CLASSIFICATIONS_TABLE_NAME
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    issue_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("issues.id"), unique=True, index=True, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # "classified" or "blocked" by the input guardrail
+    category: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    priority: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    labels: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    assignee: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    batch_file: Mapped[str | None] = mapped_column(String(300), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    issue: Mapped["Issue"] = relationship("Issue")
@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     GH_TOKEN: str = ""
     ISSUES_TABLE_NAME: str = "issues"
     COMMENTS_TABLE_NAME: str = "comments"
+    CLASSIFICATIONS_TABLE_NAME: str = "classifications"
     POSTGRES_USER: str = ""
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = "github_issues"
@@ -27,19 +28,94 @@ class Settings(BaseSettings):
     LEN_EMBEDDINGS: int = 1024
     QDRANT_API_KEY: str = ""
     QDRANT_URL: str = ""
+    QDRANT_LOCAL_PATH: str = ""  # ":memory:" or a directory to use qdrant-client's embedded mode
     DENSE_MODEL_NAME: str = "BAAI/bge-large-en-v1.5"
     SPARSE_MODEL_NAME: str = "Qdrant/minicoil-v1"
     COLLECTION_NAME: str = "github_issues_embeddings"
+    QDRANT_INDEXING_THRESHOLD: int = 20000
+    VECTOR_STORE_BACKEND: str = "qdrant"
+    NUMPY_INDEX_PATH: str = "data/numpy_index"
+    REINDEX_KEEP_VERSIONS: int = 2
+    REINDEX_MIN_POINT_RATIO: float = 0.9
+    REINDEX_GREEN_TIMEOUT_SECONDS: int = 600
     CHUNK_SIZE: int = 1000
     BATCH_SIZE: int = 20
     CONCURRENT_COMMENTS: int = 5
+    MULTI_VECTOR_QUERY: bool = False
+    MAX_QUERY_CHUNKS: int = 8
+    TWO_STAGE_SEARCH: bool = False
+    COARSE_TOP_ISSUES: int = 20
     LANGSMITH_API_KEY: str = ""
     OPENAI_API_KEY: SecretStr = SecretStr("")
+    OPENAI_BASE_URL: str = ""  # empty uses the OpenAI default
     LLM_MODEL_NAME: str = "gpt-4o-mini"
     TEMPERATURE: float = 0
+    LLM_TIMEOUT_SECONDS: float = 30
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 0.5
+    LLM_RETRY_BACKOFF_MAX_SECONDS: float = 8
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 0.5
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30
+    LLM_HTTP2: bool = True
+    LLM_MAX_CONNECTIONS: int = 0  # 0 sizes the pool from MAX_CONCURRENT_ISSUES
+    LLM_KEEPALIVE_SECONDS: float = 60
+    LLM_CONNECT_TIMEOUT_SECONDS: float = 5
+    LLM_PREWARM_CONNECTIONS: int = 4
+    MAX_CONCURRENT_ISSUES: int = 32
+    ADMISSION_TIMEOUT_SECONDS: float = 5
+    SINGLE_CALL_TRIAGE: bool = False
+    # Search while the input guardrail runs; the issue text is embedded before the guardrail verdict
+    SPECULATIVE_SEARCH: bool = False
+    GRAPH_CHECKPOINTER: str = "off"  # off, memory, sqlite or postgres
+    GRAPH_CHECKPOINT_SQLITE_PATH: str = "data/graph_checkpoints.sqlite"
+    GRAPH_CHECKPOINT_POSTGRES_URL: str = ""  # Defaults to the POSTGRES_* database
+    CLASSIFICATION_PROMPT_MAX_TOKENS: int = 3000
+    PROMPT_MAX_TITLE_TOKENS: int = 64
+    PROMPT_MIN_BODY_TOKENS: int = 512
+    PROMPT_MAX_SIMILAR_ISSUES: int = 5
+    PROMPT_SIMILAR_SNIPPET_TOKENS: int = 80
+    NODE_CACHE_BACKEND: str = "off"  # off, memory or disk
+    NODE_CACHE_PATH: str = "data/node_cache.sqlite"
+    NODE_CACHE_MAX_ENTRIES: int = 10000
+    NODE_CACHE_TTL_SECONDS: int = 3600
+    NODE_CACHE_VERSION_CHECK_SECONDS: float = 30
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.97
+    SEMANTIC_CACHE_TTL_SECONDS: int = 900
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    FAST_CLASSIFIER_ENABLED: bool = False
+    FAST_CLASSIFIER_PATH: str = "data/fast_classifier.npz"
+    FAST_CLASSIFIER_THRESHOLD: float = 0.9
+    REQUEST_DEADLINE_SECONDS: float = 0  # 0 disables the per-request deadline
+    DEADLINE_SEARCH_RESERVE_SECONDS: float = 1.0
+    DEADLINE_LLM_RESERVE_SECONDS: float = 3.0
+    DIGEST_PROBLEM_TOKENS: int = 48
+    DIGEST_RESOLUTION_TOKENS: int = 48
+    LLM_CASSETTE_MODE: str = "off"  # "off", "record" or "replay"
+    LLM_CASSETTE_PATH: str = "data/llm_cassette.jsonl"
+    LLM_REPLAY_LATENCY_SECONDS: float | None = None  # None replays each response's recorded latency
+    BULK_TRIAGE_DIR: str = "data/bulk_triage"
+    BULK_TRIAGE_CHUNK_SIZE: int = 500
+    BULK_TRIAGE_EXECUTOR: str = "local"  # "local" or "openai"
+    BULK_TRIAGE_CONCURRENCY: int = 8
+    BULK_TRIAGE_POLL_SECONDS: int = 60
     REPOS_CONFIG: str = "src/config/repos.yaml"
     GUARDRAILS_CONFIG: str = "src/config/guardrails.yaml"
     GUARDRAILS_API_KEY: str = ""
+    GUARDRAIL_POOL_SIZE: int = 4
+    GUARDRAIL_CACHE_ENABLED: bool = True
+    GUARDRAIL_CACHE_MAX_ENTRIES: int = 10000
+    GUARDRAIL_CACHE_TTL_SECONDS: int = 3600
+    GUARDRAIL_CONFIG_CHECK_SECONDS: float = 5.0
+    GUARDRAIL_WINDOW_CHARS: int = 4000
+    GUARDRAIL_WINDOW_OVERLAP_CHARS: int = 512
+    GUARDRAIL_WINDOW_CONCURRENCY: int = 4
+    # Check the recommendation while it streams instead of after it is complete
+    OUTPUT_GUARDRAIL_STREAMING: bool = False
+    OUTPUT_GUARDRAIL_WINDOW_MIN_CHARS: int = 200
 
 
 # Determine environment first
@@ -0,0 +1,45 @@
+"""Per-request latency budget carried in IssueState, so nodes can degrade instead of overrunning it."""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable
+
+from loguru import logger
+
+from src.models.agent_models import IssueState
+
+
+def deadline_after(seconds: float | None) -> float | None:
+    """Absolute deadline (epoch seconds) for a budget; None or <= 0 means no deadline."""
+    return time.time() + seconds if seconds and seconds > 0 else None
+
+
+def remaining_seconds(state: IssueState) -> float:
+    if state.deadline is None:
+        return math.inf
+    return state.deadline - time.time()
+
+
+def has_budget(state: IssueState, needed_seconds: float) -> bool:
+    return remaining_seconds(state) >= needed_seconds
+
+
+def skip_step(state: IssueState, step: str, reason: str = "deadline", **update: object) -> dict:
+    """State update recording that `step` was skipped to stay within the deadline (or for another `reason`)."""
+    logger.warning(f"Skipping {step} ({reason}): {max(remaining_seconds(state), 0):.2f}s left before the deadline.")
+
+    try:
+        from src.utils.telemetry import get_app_metrics
+
+        get_app_metrics().skipped_steps_counter.add(1, {"step": step, "reason": reason})
+    except RuntimeError:
+        pass  # Telemetry not initialized
+
+    return {**update, "skipped_steps": [*(state.skipped_steps or []), step]}
+
+
+async def within_deadline[T](state: IssueState, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable`, raising TimeoutError if it outlives the request deadline."""
+    remaining = remaining_seconds(state)
+    return await asyncio.wait_for(awaitable, timeout=None if math.isinf(remaining) else max(remaining, 0))
@@ -1,50 +1,410 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Any
+
 from guardrails import AsyncGuard
+from loguru import logger
 
-from src.models.guardrails_models import GuardRailConfig, GuardrailResult, load_guardrails_from_yaml
+from src.models.guardrails_models import (
+    ErrorSpan,
+    GuardRailConfig,
+    GuardrailResult,
+    ValidationSummary,
+    load_guardrails_from_yaml,
+)
 from src.utils.config import settings
+from src.utils.secret_scanner import SecretScanner
+
+
+def build_hub_validator(name: str, **kwargs: Any) -> Any | None:
+    """Hub validators are installed with `guardrails hub install` (see the Dockerfiles); None when missing."""
+    try:
+        import guardrails.hub as hub
+
+        return getattr(hub, name)(**kwargs)
+    except (ImportError, AttributeError) as e:
+        logger.warning(f"Guardrails hub validator '{name}' is not installed, its check always passes: {e}")
+        return None
+
+
+class GuardPool:
+    """
+    Guards sharing one validator instance, and so one loaded model.
+
+    Guards record a per-call history and are not safe to share between concurrent validations, so each
+    call checks a guard out of the pool and returns it afterwards. `size` guards are built up front; a
+    burst beyond that builds extra ones (cheap, the validator is shared) that then stay pooled.
+    """
+
+    def __init__(self, name: str, validator: Any | None, size: int) -> None:
+        self.name = name
+        self.validator = validator
+        self.free: list[AsyncGuard] = [self.build_guard() for _ in range(size)]
+
+    def build_guard(self) -> AsyncGuard:
+        guard = AsyncGuard()
+        return guard.use(self.validator) if self.validator is not None else guard
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AsyncGuard]:
+        guard = self.free.pop() if self.free else self.build_guard()
+        try:
+            yield guard
+        finally:
+            self.free.append(guard)
+
+    async def validate(self, text: str) -> GuardrailResult:
+        async with self.acquire() as guard:
+            outcome = await guard.validate(text)
+        return to_guardrail_result(self.name, outcome)
+
+
+def to_guardrail_result(name: str, outcome: Any) -> GuardrailResult:
+    return GuardrailResult(
+        validation_passed=bool(outcome.validation_passed),
+        validated_output=outcome.validated_output if isinstance(outcome.validated_output, str) else None,
+        validation_summaries=[
+            ValidationSummary(
+                type=name,
+                failure_reason=summary.failure_reason,
+                validator_name=summary.validator_name,
+                error_spans=[
+                    ErrorSpan(start=span.start, end=span.end, reason=span.reason) for span in summary.error_spans or []
+                ],
+            )
+            for summary in outcome.validation_summaries or []
+        ],
+    )
+
+
+class VerdictCache:
+    """
+    LRU of guardrail results keyed by (check, check config hash, text hash).
+
+    Entries expire after `ttl_seconds` and the least recently used one is evicted past `max_entries`.
+    A config change alters the key, so stale verdicts simply stop matching and age out.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None) -> None:
+        self.max_entries = max_entries or settings.GUARDRAIL_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.GUARDRAIL_CACHE_TTL_SECONDS
+        self.entries: OrderedDict[tuple[str, str, str], tuple[float, GuardrailResult]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def key(check: str, config_hash: str, text: str) -> tuple[str, str, str]:
+        return check, config_hash, hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key: tuple[str, str, str]) -> GuardrailResult | None:
+        entry = self.entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            del self.entries[key]
+            entry = None
+
+        self.record_lookup(key[0], entry is not None)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[1].model_copy(deep=True)
+
+    def put(self, key: tuple[str, str, str], result: GuardrailResult) -> None:
+        self.entries[key] = (time.monotonic(), result.model_copy(deep=True))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def record_lookup(self, check: str, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        try:
+            from src.utils.telemetry import get_app_metrics
+
+            get_app_metrics().guardrail_cache_lookups_counter.add(1, {"check": check, "result": "hit" if hit else "miss"})
+        except RuntimeError:
+            pass  # Telemetry not initialized
+
+
+def text_windows(text: str, size: int, overlap: int) -> Iterator[tuple[int, str]]:
+    """
+    (offset, window) slices of at most `size` chars, each starting `overlap` chars before the previous one
+    ended so that a match straddling a boundary is whole in one window. Windows end at whitespace when
+    there is some in their last `overlap` chars.
+    """
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = max(text.rfind(" ", end - overlap, end), text.rfind("\n", end - overlap, end))
+            end = cut + 1 if cut > start else end
+        yield start, text[start:end]
+        if end == len(text):
+            return
+        start = max(end - overlap, start + 1)
+
+
+def shift_error_spans(result: GuardrailResult, offset: int) -> GuardrailResult:
+    """A window's result with its error spans moved to offsets in the full text."""
+    result = result.model_copy(deep=True)
+    result.validated_output = None
+    for summary in result.validation_summaries:
+        for span in summary.error_spans or []:
+            span.start += offset
+            span.end += offset
+    return result
+
+
+def config_hash(section: dict) -> str:
+    return hashlib.sha256(json.dumps(section, sort_keys=True, default=str).encode()).hexdigest()[:16]
 
 
 class GuardrailValidator:
-    def __init__(self, config: GuardRailConfig):
+    """
+    Guards are built once from the config and pooled; a check only pays for the validation itself, or
+    for a cache lookup when the same text was validated under the same settings before.
+
+    With `config_path`, the file is re-read when its mtime changes (checked at most every
+    GUARDRAIL_CONFIG_CHECK_SECONDS) and the sections that changed are rebuilt.
+    """
+
+    def __init__(
+        self,
+        config: GuardRailConfig,
+        pool_size: int | None = None,
+        config_path: str | None = None,
+        cache: VerdictCache | None = None,
+    ):
+        self.pool_size = pool_size or settings.GUARDRAIL_POOL_SIZE
+        self.config_path = config_path
+        self.config_mtime = os.stat(config_path).st_mtime if config_path else None
+        self.config_checked_at = time.monotonic()
+        self.cache = cache if cache is not None else VerdictCache() if settings.GUARDRAIL_CACHE_ENABLED else None
+        self.config_hashes: dict[str, str] = {}
+        self.configure(config)
+
+    def configure(self, config: GuardRailConfig) -> None:
+        """(Re)build the guards of every section whose settings changed."""
         self.config = config
+        sections = {"jailbreak": config.jailbreak, "toxicity": config.toxicity, "secrets": config.secrets}
+        changed = [name for name, section in sections.items() if self.config_hashes.get(name) != config_hash(section)]
+        self.config_hashes = {name: config_hash(section) for name, section in sections.items()}
 
-    async def check_jailbreak(self, text: str) -> GuardrailResult:
-        """Check for jailbreak attempts in text using custom validation logic."""
-        cfg = self.config.jailbreak
-        guard = AsyncGuard()
-        # Using basic Guard validation without hub validators
-        # In production, consider implementing custom validator or using alternative detection methods
-        result = await guard.validate(text)
-        return GuardrailResult(
-            passed=True,  # Placeholder - implement actual validation logic
-            validated_output=text,
-            error_message=None
+        if "jailbreak" in changed:
+            self.jailbreak = GuardPool(
+                "DetectJailbreak",
+                build_hub_validator(
+                    "DetectJailbreak", threshold=config.jailbreak.get("threshold"), on_fail=config.jailbreak.get("on_fail")
+                ),
+                self.pool_size,
+            )
+        if "toxicity" in changed:
+            self.toxicity = GuardPool(
+                "ToxicLanguage",
+                build_hub_validator(
+                    "ToxicLanguage",
+                    threshold=config.toxicity.get("threshold"),
+                    validation_method=config.toxicity.get("validation_method"),
+                    on_fail=config.toxicity.get("on_fail"),
+                ),
+                self.pool_size,
+            )
+        if "secrets" in changed:
+            # The native scanner replaces the SecretsPresent hub validator unless the config asks for the hub one
+            self.secret_scanner: SecretScanner | None = None
+            self.secrets: GuardPool | None = None
+            if config.secrets.get("engine", "scanner") == "scanner":
+                self.secret_scanner = SecretScanner(entropy_threshold=config.secrets.get("entropy_threshold", 4.5))
+            else:
+                self.secrets = GuardPool(
+                    "SecretsPresent",
+                    build_hub_validator("SecretsPresent", on_fail=config.secrets.get("on_fail")),
+                    self.pool_size,
+                )
+
+    def reload_if_changed(self) -> None:
+        if self.config_path is None or time.monotonic() - self.config_checked_at < settings.GUARDRAIL_CONFIG_CHECK_SECONDS:
+            return
+        self.config_checked_at = time.monotonic()
+        try:
+            mtime = os.stat(self.config_path).st_mtime
+            if mtime == self.config_mtime:
+                return
+            config = load_guardrails_from_yaml(self.config_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not reload '{self.config_path}', keeping the current guardrails: {e}")
+            return
+        self.config_mtime = mtime
+        logger.info(f"'{self.config_path}' changed, reloading guardrails.")
+        self.configure(config)
+
+    async def cached(self, check: str, text: str, validate: Callable[[str], Awaitable[GuardrailResult]]) -> GuardrailResult:
+        if self.cache is None:
+            return await validate(text)
+
+        key = VerdictCache.key(check, self.config_hashes[check], text)
+        result = self.cache.get(key)
+        if result is None:
+            result = await validate(text)
+            self.cache.put(key, result)
+        return result
+
+    async def warmup(self) -> None:
+        """Run each guard once so lazy model loading and first-inference setup happen before traffic."""
+        await asyncio.gather(
+            self.jailbreak.validate("warmup"), self.toxicity.validate("warmup"), self.scan_secrets("warmup")
         )
+        logger.info("Guardrail validators warmed up.")
+
+    async def check_jailbreak(self, text: str) -> GuardrailResult:
+        """Check for jailbreak attempts in text."""
+        return await self.check_windows(text, lambda window: self.cached("jailbreak", window, self.jailbreak.validate))
 
     async def check_toxicity(self, text: str) -> GuardrailResult:
-        """Check for toxic language in text using custom validation logic."""
-        cfg = self.config.toxicity
-        guard = AsyncGuard()
-        # Using basic Guard validation without hub validators
-        result = await guard.validate(text)
-        return GuardrailResult(
-            passed=True,  # Placeholder - implement actual validation logic
-            validated_output=text,
-            error_message=None
-        )
+        """Check for toxic language in text."""
+        return await self.check_windows(text, lambda window: self.cached("toxicity", window, self.toxicity.validate))
 
     async def check_secrets(self, text: str) -> GuardrailResult:
-        """Check for secrets/sensitive information in text using custom validation logic."""
-        cfg = self.config.secrets
-        guard = AsyncGuard()
-        # Using basic Guard validation without hub validators
-        result = await guard.validate(text)
-        return GuardrailResult(
-            passed=True,  # Placeholder - implement actual validation logic
-            validated_output=text,
-            error_message=None
+        """Check for secrets/sensitive information in text."""
+        return await self.check_windows(text, lambda window: self.cached("secrets", window, self.scan_secrets))
+
+    async def check_windows(self, text: str, check: Callable[[str], Awaitable[GuardrailResult]]) -> GuardrailResult:
+        """
+        Run `check` over overlapping windows of a long text, GUARDRAIL_WINDOW_CONCURRENCY windows at a time.
+
+        The first failing window (in text order) is the verdict, with its error spans moved to offsets in
+        `text`; windows after it are cancelled or never started.
+        """
+        self.reload_if_changed()
+        if len(text) <= settings.GUARDRAIL_WINDOW_CHARS:
+            return await check(text)
+
+        windows = text_windows(text, settings.GUARDRAIL_WINDOW_CHARS, settings.GUARDRAIL_WINDOW_OVERLAP_CHARS)
+        while batch := list(islice(windows, settings.GUARDRAIL_WINDOW_CONCURRENCY)):
+            failed = await first_failed_check({offset: check(window) for offset, window in batch})
+            if failed is not None:
+                offset, result = failed
+                return shift_error_spans(result, offset)
+        return GuardrailResult(validation_passed=True, validation_summaries=[], validated_output=text)
+
+    async def scan_secrets(self, text: str) -> GuardrailResult:
+        if self.secret_scanner is not None:
+            return self.secret_scanner.scan(text)
+        assert self.secrets is not None
+        return await self.secrets.validate(text)
+
+
+async def first_failed_check[K](checks: dict[K, Awaitable[GuardrailResult]]) -> tuple[K, GuardrailResult] | None:
+    """
+    Run the checks concurrently and return the first failing one in dict order (the priority), or None.
+
+    A failure cancels every lower-priority check at once; higher-priority checks still running are awaited,
+    so the verdict is the same one the checks would give in sequence, at the latency of the slowest check.
+    """
+    names = list(checks)
+    tasks = {name: asyncio.ensure_future(check) for name, check in checks.items()}
+    try:
+        while True:
+            for name in names:
+                task = tasks[name]
+                if not task.done():
+                    break  # A higher-priority check could still block
+                if not task.result().validation_passed:
+                    return name, task.result()
+            else:
+                return None
+
+            for rank, name in enumerate(names):
+                task = tasks[name]
+                if task.done() and not task.cancelled() and not task.result().validation_passed:
+                    for lower in names[rank + 1 :]:
+                        tasks[lower].cancel()
+                    break
+
+            await asyncio.wait([t for t in tasks.values() if not t.done()], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+# A window closes after a sentence end or line break once it holds at least OUTPUT_GUARDRAIL_WINDOW_MIN_CHARS
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\n")
+
+
+class StreamingOutputGuard:
+    """
+    Output guardrail fed with LLM text as it streams in.
+
+    Each completed window (whole sentences) is checked for toxicity and secrets in the background while
+    generation continues; windows also include the sentence before them so that a secret or phrase cut by
+    a window boundary is still seen whole. `failed` turns true as soon as any window fails, so the caller
+    can stop generating, and `finish()` checks the tail and returns the earliest failure with its error
+    spans at offsets in the full text.
+    """
+
+    def __init__(self, validator: "GuardrailValidator", min_chars: int | None = None) -> None:
+        self.validator = validator
+        self.min_chars = min_chars or settings.OUTPUT_GUARDRAIL_WINDOW_MIN_CHARS
+        self.text = ""
+        self.checked_until = 0  # End of the last window sent for checking
+        self.previous_start = 0  # Start of the last window, included again as context in the next one
+        self.tasks: list[asyncio.Task[tuple[str, GuardrailResult] | None]] = []
+
+    @property
+    def failed(self) -> bool:
+        return any(task.done() and not task.cancelled() and task.result() is not None for task in self.tasks)
+
+    def feed(self, chunk: str) -> None:
+        self.text += chunk
+        while len(self.text) - self.checked_until >= self.min_chars:
+            boundary = _SENTENCE_END.search(self.text, self.checked_until + self.min_chars - 1)
+            if boundary is None:
+                return
+            self.check_window(boundary.end())
+
+    def check_window(self, end: int) -> None:
+        start, self.previous_start, self.checked_until = self.previous_start, self.checked_until, end
+        self.tasks.append(asyncio.ensure_future(self.check(start, self.text[start:end])))
+
+    async def check(self, offset: int, window: str) -> tuple[str, GuardrailResult] | None:
+        failed = await first_failed_check(
+            {"toxicity": self.validator.check_toxicity(window), "secrets": self.validator.check_secrets(window)}
         )
+        return None if failed is None else (failed[0], shift_error_spans(failed[1], offset))
+
+    async def finish(self) -> tuple[str, GuardrailResult] | None:
+        """Check whatever text is left and return the earliest failing window, or None when all passed."""
+        if self.checked_until < len(self.text) and not self.failed:
+            self.check_window(len(self.text))
+        try:
+            for task in self.tasks:
+                if (failed := await task) is not None:
+                    return failed
+            return None
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        for task in self.tasks:
+            task.cancel()
 
 
 guard_config = load_guardrails_from_yaml(settings.GUARDRAILS_CONFIG)
-guardrail_validator = GuardrailValidator(config=guard_config)
+guardrail_validator = GuardrailValidator(config=guard_config, config_path=settings.GUARDRAILS_CONFIG)
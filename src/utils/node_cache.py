@@ -0,0 +1,204 @@
+"""
+Memoization of deterministic graph nodes, keyed by a hash of the state fields a node reads.
+
+    @trace_agent("issue_search")
+    @memoize_node("issue_search", fields=("title", "body"), version=refreshed_every(30, search_index_version))
+    async def issue_search_agent(state: IssueState) -> dict: ...
+
+A node's version must cover everything else its output depends on, including the settings it reads
+(see `settings_version`), since the disk store is shared by processes that may run different configs.
+
+NODE_CACHE_BACKEND picks the store: "off", "memory" (per-process LRU) or "disk" (SQLite file shared by
+the processes of one host, queried off the event loop). Entries expire after NODE_CACHE_TTL_SECONDS.
+Only clean updates are stored: errors, skipped steps and semantic cache hits are recomputed on the next run.
+"""
+
+import asyncio
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from src.models.agent_models import IssueState
+from src.utils.config import settings
+
+
+class NodeCache(ABC):
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None) -> None:
+        self.max_entries = max_entries or settings.NODE_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.NODE_CACHE_TTL_SECONDS
+
+    @abstractmethod
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    @abstractmethod
+    async def put(self, key: str, update: dict[str, Any]) -> None: ...
+
+
+class MemoryNodeCache(NodeCache):
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None) -> None:
+        super().__init__(max_entries, ttl_seconds)
+        self.entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl_seconds:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        # Stored pickled so callers can never mutate a cached update
+        return pickle.loads(entry[1])
+
+    async def put(self, key: str, update: dict[str, Any]) -> None:
+        self.entries[key] = (time.time(), pickle.dumps(update))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class DiskNodeCache(NodeCache):
+    def __init__(self, path: str | Path | None = None, max_entries: int | None = None, ttl_seconds: float | None = None):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = Path(path or settings.NODE_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Queries run in worker threads, one at a time
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS node_cache (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS node_cache_stored_at ON node_cache (stored_at)")
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.get_blocking, key)
+
+    async def put(self, key: str, update: dict[str, Any]) -> None:
+        await asyncio.to_thread(self.put_blocking, key, pickle.dumps(update))
+
+    def get_blocking(self, key: str) -> dict[str, Any] | None:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM node_cache WHERE key = ? AND stored_at >= ?", (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def put_blocking(self, key: str, value: bytes) -> None:
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO node_cache (key, stored_at, value) VALUES (?, ?, ?)", (key, time.time(), value)
+            )
+            # Oldest entries go first; expired ones are dropped on the way
+            self.connection.execute(
+                "DELETE FROM node_cache WHERE stored_at < ? OR key IN "
+                "(SELECT key FROM node_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (time.time() - self.ttl_seconds, self.max_entries),
+            )
+
+
+def build_node_cache(backend: str | None = None) -> NodeCache | None:
+    backend = backend or settings.NODE_CACHE_BACKEND
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return MemoryNodeCache()
+    if backend == "disk":
+        return DiskNodeCache()
+    raise ValueError(f"Unknown NODE_CACHE_BACKEND '{backend}', expected off, memory or disk.")
+
+
+node_cache = build_node_cache()
+
+
+def node_key(name: str, version: str, state: IssueState, fields: tuple[str, ...]) -> str:
+    inputs = {field: getattr(state, field) for field in fields}
+    encoded = json.dumps({"node": name, "version": version, "inputs": inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def is_cacheable(update: Any) -> bool:
+    # Error handlers return the whole state; skipped steps depend on the deadline, not the inputs
+    return isinstance(update, dict) and not (
+        update.get("errors") or update.get("skipped_steps") or update.get("cache_hit") or update.get("blocked")
+    )
+
+
+def record_lookup(name: str, hit: bool) -> None:
+    try:
+        from src.utils.telemetry import get_app_metrics
+
+        get_app_metrics().node_cache_lookups_counter.add(1, {"node": name, "result": "hit" if hit else "miss"})
+    except RuntimeError:
+        pass  # Telemetry not initialized
+
+
+def settings_version(*names: str) -> str:
+    """The current values of the named settings, to fold into the version of a node that reads them."""
+    return json.dumps({name: getattr(settings, name) for name in names}, sort_keys=True, default=str)
+
+
+def refreshed_every(seconds: float, version: Callable[[], Awaitable[str]]) -> Callable[[], Awaitable[str]]:
+    """`version` re-read at most every `seconds`, for versions that cost a round trip to look up."""
+    cached: list[Any] = [0.0, ""]
+
+    async def current() -> str:
+        if time.monotonic() - cached[0] >= seconds:
+            cached[1] = await version()
+            cached[0] = time.monotonic()
+        return cached[1]
+
+    return current
+
+
+def memoize_node(
+    name: str,
+    fields: tuple[str, ...],
+    version: Callable[[], Awaitable[str]] | None = None,
+    enabled: Callable[[], bool] | None = None,
+) -> Callable:
+    """
+    Cache a node's update under the hash of `fields` and of `version()` (whatever else its output depends
+    on, e.g. the search index in use). `enabled()` turns memoization off for a node that is not
+    deterministic under the current settings.
+    """
+
+    def decorator(func: Callable[[IssueState], Awaitable[Any]]) -> Callable[[IssueState], Awaitable[Any]]:
+        @wraps(func)
+        async def wrapper(state: IssueState) -> Any:
+            if node_cache is None or (enabled is not None and not enabled()):
+                return await func(state)
+
+            try:
+                key = node_key(name, await version() if version is not None else "", state, fields)
+                update = await node_cache.get(key)
+            except Exception as e:
+                # Never fail a node over its cache; the node reports its own errors
+                logger.warning(f"Node cache lookup failed for '{name}', running it uncached: {e}")
+                return await func(state)
+            record_lookup(name, update is not None)
+            if update is not None:
+                return update
+
+            update = await func(state)
+            if is_cacheable(update):
+                try:
+                    await node_cache.put(key, update)
+                except (sqlite3.Error, pickle.PicklingError) as e:
+                    logger.warning(f"Node cache write failed for '{name}': {e}")
+            return update
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,169 @@
+"""Token-budgeted prompt construction: static instructions first, then trimmed issue text and compact similar issues."""
+
+from functools import lru_cache
+from typing import Any
+
+import tiktoken
+from loguru import logger
+from opentelemetry import trace
+from pydantic import BaseModel
+
+from src.models.agent_models import SimilarIssue
+from src.utils.config import settings
+from src.utils.prompts import PromptTemplates
+
+CHARS_PER_TOKEN = 4  # rough fallback when the tokenizer files are unavailable
+TRUNCATION_MARKER = " [...]"
+
+
+class _ApproximateEncoding:
+    """Stand-in for tiktoken.Encoding that slices text at CHARS_PER_TOKEN characters per token."""
+
+    def encode(self, text: str) -> list[str]:
+        return [text[i : i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+    def decode(self, tokens: list[str]) -> str:
+        return "".join(tokens)
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Any:
+    try:
+        return tiktoken.encoding_for_model(settings.LLM_MODEL_NAME)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use, which fails on air-gapped hosts
+        logger.warning(f"Tokenizer unavailable, approximating token counts: {e}")
+        return _ApproximateEncoding()
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    encoding = get_encoding()
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    keep = max(max_tokens - len(encoding.encode(TRUNCATION_MARKER)), 0)
+    return encoding.decode(tokens[:keep]) + TRUNCATION_MARKER
+
+
+def summarize_similar_issues(
+    similar_issues: list[SimilarIssue] | None,
+    max_issues: int | None = None,
+    snippet_tokens: int | None = None,
+) -> list[str]:
+    """One compact line per distinct similar issue, keeping only the fields useful for classification."""
+    max_issues = max_issues or settings.PROMPT_MAX_SIMILAR_ISSUES
+    snippet_tokens = snippet_tokens or settings.PROMPT_SIMILAR_SNIPPET_TOKENS
+
+    lines: list[str] = []
+    seen: set[Any] = set()
+    for issue in similar_issues or []:
+        key = issue.issue_number or issue.url
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if issue.digest:
+            # Precomputed at ingestion; already carries the type, state and title
+            lines.append(f"- #{issue.issue_number}: {issue.digest}")
+        else:
+            kind = "bug" if issue.is_bug else "feature" if issue.is_feature else None
+            header = f"#{issue.issue_number}" + (f" [{kind}]" if kind else "")
+            if issue.title:
+                header += f" {issue.title}"
+
+            snippet = " ".join((issue.chunk_text or "").split())
+            lines.append(f"- {header}: {truncate_to_tokens(snippet, snippet_tokens)}" if snippet else f"- {header}")
+        if len(lines) == max_issues:
+            break
+    return lines
+
+
+def describe_references(similar_issues: list[SimilarIssue] | None, urls: list[str]) -> list[str]:
+    """Reference URLs followed by the issue digest when one was ingested."""
+    digests = {issue.url: issue.digest for issue in similar_issues or [] if issue.digest}
+    return [f"{url}: {digests[url]}" if url in digests else url for url in urls]
+
+
+class BudgetedPrompt(BaseModel):
+    text: str
+    tokens: int
+    body_truncated: bool = False
+    similar_issues_used: int = 0
+
+
+def build_classification_prompt(
+    title: str | None,
+    body: str | None,
+    similar_issues: list[SimilarIssue] | None,
+    template: str | None = None,
+    max_tokens: int | None = None,
+    **extra: str,
+) -> BudgetedPrompt:
+    """
+    Fill a classification template within `max_tokens`.
+
+    Similar issues are dropped from the tail before the body is cut below PROMPT_MIN_BODY_TOKENS;
+    the body then gets whatever budget is left. Extra fields (e.g. top_references) are kept as-is.
+    """
+    template = template or PromptTemplates.classification_prompt()
+    max_tokens = max_tokens or settings.CLASSIFICATION_PROMPT_MAX_TOKENS
+
+    title = truncate_to_tokens(title or "", settings.PROMPT_MAX_TITLE_TOKENS)
+    body = body or ""
+    similar_lines = summarize_similar_issues(similar_issues)
+
+    def render(body_text: str, lines: list[str]) -> str:
+        return template.format(
+            title=title,
+            body=body_text,
+            similar_issues="\n".join(lines) if lines else "(none found)",
+            **extra,
+        )
+
+    fixed_tokens = count_tokens(render("", []))
+    line_tokens = [count_tokens(line + "\n") for line in similar_lines]
+    body_tokens = count_tokens(body)
+
+    # Keep room for the body first, then give the rest to similar issues
+    body_floor = min(body_tokens, settings.PROMPT_MIN_BODY_TOKENS)
+    while similar_lines and fixed_tokens + sum(line_tokens) + body_floor > max_tokens:
+        similar_lines.pop()
+        line_tokens.pop()
+
+    body_budget = max_tokens - fixed_tokens - sum(line_tokens)
+    trimmed_body = truncate_to_tokens(body, body_budget)
+
+    text = render(trimmed_body, similar_lines)
+    prompt = BudgetedPrompt(
+        text=text,
+        tokens=count_tokens(text),
+        body_truncated=trimmed_body != body,
+        similar_issues_used=len(similar_lines),
+    )
+    report_prompt_tokens(prompt)
+    return prompt
+
+
+def report_prompt_tokens(prompt: BudgetedPrompt) -> None:
+    span = trace.get_current_span()
+    span.set_attribute("prompt.tokens", prompt.tokens)
+    span.set_attribute("prompt.body_truncated", prompt.body_truncated)
+    span.set_attribute("prompt.similar_issues", prompt.similar_issues_used)
+
+    try:
+        from src.utils.telemetry import get_app_metrics
+
+        get_app_metrics().prompt_tokens.record(prompt.tokens, {"prompt": "classification"})
+    except RuntimeError:
+        pass  # Telemetry not initialized
+
+    logger.info(
+        f"Classification prompt: {prompt.tokens} tokens, {prompt.similar_issues_used} similar issues, "
+        f"body truncated={prompt.body_truncated}"
+    )
@@ -1,19 +1,16 @@
+from src.models.agent_models import ClassificationState
+
+
 class PromptTemplates:
     """Centralized class for all prompt templates used in the workflow."""
 
     @staticmethod
-    def classification_prompt() -> str:
+    def classification_instructions() -> str:
+        # Kept free of per-issue text so it forms a stable prefix for provider-side prompt caching
         return """
             You are a helpful assistant that classifies GitHub issues into categories, priorities,
             suggested labels, and recommends assignees.
 
-            Issue Title: {title}
-            Issue Body: {body}
-
-            To give you more context, we have the following similar issues:
-
-            {similar_issues}
-
             Classify the issue with the following structure:
 
             - category ((string)): one of: bug, feature, task, no type
@@ -33,18 +30,54 @@ class PromptTemplates:
             - Documentation issues should include appropriate doc-related labels.
             - When unsure of the assignee, suggest a relevant team (e.g., @ml-team for model-related issues).
             - Limit labels to 2–5 per issue, selecting only the most relevant.
+            """
+
+    @staticmethod
+    def issue_context() -> str:
+        return """
+            To give you more context, we have the following similar issues:
 
+            {similar_issues}
+
+            Issue Title: {title}
+            Issue Body: {body}
             """
 
     @staticmethod
-    def summary_prompt(state: dict, top_references: list[str]) -> str:
+    def classification_prompt() -> str:
+        return PromptTemplates.classification_instructions() + PromptTemplates.issue_context()
+
+    @staticmethod
+    def summary_prompt(classification: ClassificationState, top_references: list[str]) -> str:
+        # Fields left unset (e.g. by the fast classifier, which does not predict them) are left out
+        fields = {
+            "Category": classification.category,
+            "Priority": classification.priority,
+            "Labels": ", ".join(classification.labels or []),
+            "Assignee": classification.assignee,
+        }
         return (
-            f"The following GitHub issue has been classified as:\n"
-            f"- Category: {state['classification']['category']}\n"
-            f"- Priority: {state['classification']['priority']}\n"
-            f"- Labels: {', '.join(state['classification']['labels'])}\n"
-            f"- Assignee: {state['classification']['assignee']}\n\n"
-            f"Here are the most similar past issues:\n"
+            "The following GitHub issue has been classified as:\n"
+            + "".join(f"- {name}: {value}\n" for name, value in fields.items() if value is not None)
+            + "\nHere are the most similar past issues:\n"
             + "\n".join(f"- {url}" for url in top_references)
             + "\n\nWrite a helpful recommendation summary."
         )
+
+    @staticmethod
+    def triage_prompt() -> str:
+        return (
+            PromptTemplates.classification_instructions()
+            + """
+            Then write a helpful recommendation summary for the issue, drawing on the classification
+            and on the most similar past issues listed below.
+
+            Return the classification fields and the summary together in a single response.
+            """
+            + PromptTemplates.issue_context()
+            + """
+            Most similar past issues:
+
+            {top_references}
+            """
+        )
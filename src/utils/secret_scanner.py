@@ -0,0 +1,162 @@
+"""
+Secret scanner used by the secrets guardrail: provider token formats, credential assignments and
+high-entropy quoted strings, reported as error spans.
+
+Every pattern starts with a literal or a small character class, so CPython's regex engine skips ahead to
+candidate offsets instead of trying the pattern at every character; scans are linear in the text length
+(no nested quantifiers) and candidates are then filtered in Python (boundaries, placeholders, entropy).
+"""
+
+import math
+import re
+from collections import Counter
+from collections.abc import Callable
+from typing import NamedTuple
+
+from src.models.guardrails_models import ErrorSpan, GuardrailResult, ValidationSummary
+
+
+class SecretPattern(NamedTuple):
+    reason: str
+    regex: re.Pattern[str]
+    word_boundary: bool = True  # The match must not continue a longer alphanumeric token
+    not_after: str = ""  # Further characters the match must not follow (e.g. slug and path separators)
+    accept: Callable[[str], bool] | None = None  # Extra check on the matched text
+
+
+PROVIDER_PATTERNS: list[SecretPattern] = [
+    SecretPattern("Private key", re.compile(r"-----BEGIN (?:[A-Z]+ )*PRIVATE KEY-----"), word_boundary=False),
+    SecretPattern("AWS access key ID", re.compile(r"(?:AKIA|ASIA|AGPA|AIDA|AROA)[0-9A-Z]{16}")),
+    SecretPattern("GitHub token", re.compile(r"gh[pousr]_[A-Za-z0-9]{36,255}|github_pat_[A-Za-z0-9_]{22,255}")),
+    SecretPattern("GitLab token", re.compile(r"glpat-[A-Za-z0-9_-]{20,255}")),
+    # `sk-learn-...` slugs and URLs are everywhere in scikit-learn issues; real keys mix case and digits
+    SecretPattern(
+        "API secret key",
+        re.compile(r"sk-(?:proj-|svcacct-|admin-|ant-)?[A-Za-z0-9_-]{20,255}"),
+        not_after="/-",
+        accept=lambda key: has_mixed_classes(key[3:]),
+    ),
+    SecretPattern("Stripe key", re.compile(r"[sr]k_(?:live|test)_[A-Za-z0-9]{16,255}")),
+    SecretPattern("Slack token", re.compile(r"xox[abposr]-[A-Za-z0-9-]{10,255}")),
+    SecretPattern("Google API key", re.compile(r"AIza[0-9A-Za-z_-]{35}")),
+    SecretPattern("JSON Web Token", re.compile(r"eyJ[A-Za-z0-9_-]{8,}\.eyJ[A-Za-z0-9_-]{8,}\.[A-Za-z0-9_-]{8,}")),
+    SecretPattern("Credentials in URL", re.compile(r"://[^\s:/@]{1,64}:[^\s:/@]{3,128}@"), word_boundary=False),
+]
+
+# `<name> = "value"`, `"name": "value"`: anchored on the separator, the name is checked behind the match
+ASSIGNMENT_VALUE = re.compile(r"[:=]\s{0,8}[\"']([^\"'\s]{6,256})[\"']")
+ASSIGNED_NAME = re.compile(r"([A-Za-z0-9_.-]{1,64})[\"']?\s{0,8}$")
+# Whole words of the name, so `tokenizer`, `max_tokens`, `token_type` or `passwords` are not credentials
+CREDENTIAL_WORDS = {"password", "passwd", "pwd", "passphrase", "secret", "token", "apikey", "accesskey", "secretkey"}
+KEY_QUALIFIERS = {"api", "access", "private", "secret", "signing", "encryption"}
+# Numbers, single words and paths (absolute, home-relative or lowercase like `org/model-name`) are
+# configuration values, not credentials; base64 keys may contain a slash but mix cases
+NOT_A_CREDENTIAL = re.compile(r"^(?:\d+|[A-Za-z]+|(?:~|\.{1,2})?[/\\].*|[A-Za-z]:\\.*|[a-z0-9_.-]+(?:/[a-z0-9_.-]+)+)$")
+QUOTED_TOKEN = re.compile(r"[\"']([A-Za-z0-9+/_=-]{32,512})[\"']")
+
+PLACEHOLDER = re.compile(
+    r"(?i)^(?:x+|\*+|\.+|<[^>]*>|\$\{?[\w.]+\}?|\{\{.*\}\}|your[\w-]*|changeme|example[\w-]*|dummy[\w-]*|placeholder)$"
+)
+
+
+def shannon_entropy(text: str) -> float:
+    counts = Counter(text)
+    return -sum(n / len(text) * math.log2(n / len(text)) for n in counts.values())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def has_mixed_classes(token: str) -> bool:
+    return any(c.isupper() for c in token) and any(c.islower() for c in token) and any(c.isdigit() for c in token)
+
+
+def is_credential_name(name: str) -> bool:
+    """`password`, `user_pwd`, `client_secret`, `authToken`, `user_api_key`, ... by their last word(s)."""
+    words = [word for word in re.split(r"[_.-]|(?<=[a-z])(?=[A-Z])", name) if word]
+    if not words:
+        return False
+    last = words[-1].lower()
+    return last in CREDENTIAL_WORDS or (last == "key" and len(words) > 1 and words[-2].lower() in KEY_QUALIFIERS)
+
+
+class SecretScanner:
+    def __init__(self, entropy_threshold: float = 4.5) -> None:
+        self.entropy_threshold = entropy_threshold
+
+    def is_high_entropy(self, token: str) -> bool:
+        # Mixed case and digits only: rules out hex digests (commit SHAs), words and snake_case identifiers
+        return has_mixed_classes(token) and shannon_entropy(token) >= self.entropy_threshold
+
+    def is_credential_value(self, value: str) -> bool:
+        """
+        The high-entropy test, scaled for values named as credentials: two character classes or more, and
+        an entropy threshold capped by the value's length (a 12-character string has at most 3.6 bits).
+        """
+        if PLACEHOLDER.match(value) or NOT_A_CREDENTIAL.match(value):
+            return False
+        classes = (str.islower, str.isupper, str.isdigit, lambda c: not c.isalnum())
+        if sum(any(test(c) for c in value) for test in classes) < 2:
+            return False
+        return shannon_entropy(value) >= min(self.entropy_threshold, 0.7 * math.log2(len(value)))
+
+    def find(self, text: str) -> list[ErrorSpan]:
+        """Spans of every secret found, in text order; overlapping findings are reported once."""
+        found: list[ErrorSpan] = []
+
+        for pattern in PROVIDER_PATTERNS:
+            # Boundaries are checked here rather than with \b or a lookbehind, which would disable the prefix scan
+            pos = 0
+            while (match := pattern.regex.search(text, pos)) is not None:
+                start, end = match.span()
+                before = text[start - 1] if start > 0 else ""
+                if (
+                    (
+                        pattern.word_boundary
+                        and ((before and _is_word_char(before)) or (end < len(text) and _is_word_char(text[end])))
+                    )
+                    or (before and before in pattern.not_after)
+                    or (pattern.accept is not None and not pattern.accept(match.group()))
+                ):
+                    pos = start + 1
+                    continue
+                found.append(ErrorSpan(start=start, end=end, reason=pattern.reason))
+                pos = end
+
+        for match in ASSIGNMENT_VALUE.finditer(text):
+            if not self.is_credential_value(match.group(1)):
+                continue
+            name = ASSIGNED_NAME.search(text, max(0, match.start() - 66), match.start())
+            if name is not None and is_credential_name(name.group(1)):
+                found.append(ErrorSpan(start=match.start(1), end=match.end(1), reason="Hardcoded credential"))
+
+        for match in QUOTED_TOKEN.finditer(text):
+            if self.is_high_entropy(match.group(1)):
+                found.append(ErrorSpan(start=match.start(1), end=match.end(1), reason="High-entropy string"))
+
+        spans: list[ErrorSpan] = []
+        for span in sorted(found, key=lambda s: (s.start, -s.end)):
+            if spans and span.start < spans[-1].end:
+                continue
+            spans.append(span)
+        return spans
+
+    def scan(self, text: str) -> GuardrailResult:
+        spans = self.find(text)
+        if not spans:
+            return GuardrailResult(validation_passed=True, validation_summaries=[], validated_output=text)
+
+        reasons = sorted({span.reason for span in spans})
+        return GuardrailResult(
+            validation_passed=False,
+            validated_output=None,
+            validation_summaries=[
+                ValidationSummary(
+                    type="SecretsPresent",
+                    validator_name="SecretScanner",
+                    failure_reason=f"Found {len(spans)} secret(s): {', '.join(reasons)}",
+                    error_spans=spans,
+                )
+            ],
+        )
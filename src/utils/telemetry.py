@@ -144,12 +144,36 @@ class ApplicationMetrics:
             unit="1",
         )
         
+        self.prompt_tokens = meter.create_histogram(
+            name="prompt_tokens",
+            description="Tokens in each budgeted LLM prompt",
+            unit="1",
+        )
+        
         self.openai_requests_counter = meter.create_counter(
             name="openai_requests_total",
             description="Total OpenAI API requests",
             unit="1",
         )
         
+        self.llm_retries_counter = meter.create_counter(
+            name="llm_retries_total",
+            description="LLM calls retried after a provider failure",
+            unit="1",
+        )
+        
+        self.llm_hedged_requests_counter = meter.create_counter(
+            name="llm_hedged_requests_total",
+            description="Hedge requests fired after the p95 delay",
+            unit="1",
+        )
+        
+        self.llm_circuit_open_counter = meter.create_counter(
+            name="llm_circuit_open_total",
+            description="Times the LLM circuit breaker opened",
+            unit="1",
+        )
+        
         # Guardrail metrics
         self.guardrail_blocks_counter = meter.create_counter(
             name="guardrail_blocks_total",
@@ -157,6 +181,33 @@ class ApplicationMetrics:
             unit="1",
         )
         
+        self.skipped_steps_counter = meter.create_counter(
+            name="deadline_skipped_steps_total",
+            description="Graph steps skipped to stay within the request deadline",
+            unit="1",
+        )
+        
+        # Semantic cache metrics
+        self.semantic_cache_lookups_counter = meter.create_counter(
+            name="semantic_cache_lookups_total",
+            description="Semantic LLM cache lookups by result (hit/miss)",
+            unit="1",
+        )
+        
+        # Guardrail verdict cache metrics
+        self.guardrail_cache_lookups_counter = meter.create_counter(
+            name="guardrail_cache_lookups_total",
+            description="Guardrail verdict cache lookups by check and result (hit/miss)",
+            unit="1",
+        )
+        
+        # Node memoization metrics
+        self.node_cache_lookups_counter = meter.create_counter(
+            name="node_cache_lookups_total",
+            description="Graph node cache lookups by node and result (hit/miss)",
+            unit="1",
+        )
+        
         # Vector search metrics
         self.vector_search_counter = meter.create_counter(
             name="vector_searches_total",
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+
+from fastembed import SparseTextEmbedding, TextEmbedding
+from qdrant_client.models import models
+
+from src.utils.config import settings
+
+
+class AsyncVectorStore(ABC):
+    """Search interface the agents depend on; backends share the query embedding models."""
+
+    def __init__(self) -> None:
+        self.embedding_size = settings.LEN_EMBEDDINGS
+
+        self.dense_model = TextEmbedding(model_name=settings.DENSE_MODEL_NAME)
+        self.sparse_model = SparseTextEmbedding(model_name=settings.SPARSE_MODEL_NAME)
+
+    async def dense_vectors(self, texts: list[str]) -> list[list[float]]:
+        # Embedding is sync, no need to await
+        return [vec.tolist() for vec in self.dense_model.embed(texts)]
+
+    async def sparse_vectors(self, texts: list[str]) -> list[models.SparseVector]:
+        return [
+            models.SparseVector(
+                indices=se.indices.tolist(),
+                values=se.values.tolist(),
+            )
+            for se in self.sparse_model.embed(texts)
+        ]
+
+    async def search_similar_issues(self, query_text: str, limit: int = 5) -> list[models.ScoredPoint]:
+        return await self.search_similar_issues_multi([query_text], limit=limit)
+
+    @abstractmethod
+    async def search_similar_issues_multi(
+        self, query_texts: list[str], limit: int = 5, dense_vectors: list[list[float]] | None = None
+    ) -> list[models.ScoredPoint]:
+        """
+        Hybrid search with a dense and a sparse candidate list per query text, all fused with RRF.
+
+        `dense_vectors` lets callers that already embedded `query_texts` skip the dense model.
+        """
+
+    @abstractmethod
+    async def index_version(self) -> str:
+        """Identifies the data searched, so results cached for one version are not served from another."""
@@ -0,0 +1,13 @@
+import asyncio
+
+from src.vectorstore.numpy_store import export_from_qdrant
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+
+async def main() -> None:
+    vectorstore = AsyncQdrantVectorStore()
+    await export_from_qdrant(vectorstore)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+from src.utils.config import settings
+from src.vectorstore.base import AsyncVectorStore
+
+
+def build_vector_store() -> AsyncVectorStore:
+    """Instantiate the search backend selected by VECTOR_STORE_BACKEND ("qdrant" or "numpy")."""
+    backend = settings.VECTOR_STORE_BACKEND.lower()
+
+    if backend == "qdrant":
+        from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+        return AsyncQdrantVectorStore()
+
+    if backend == "numpy":
+        from src.vectorstore.numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore()
+
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND '{settings.VECTOR_STORE_BACKEND}'")
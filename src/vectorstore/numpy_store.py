@@ -0,0 +1,171 @@
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from qdrant_client.models import models
+
+from src.utils.config import settings
+from src.vectorstore.base import AsyncVectorStore
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+# Mirror the Qdrant query in AsyncQdrantVectorStore.search_similar_issues
+PREFETCH_LIMIT = 10
+DENSE_SCORE_THRESHOLD = 0.9
+RRF_K = 2  # qdrant-client's DEFAULT_RANKING_CONSTANT_K
+BLOCK_ROWS = 65536  # rows of the float16 memmap upcast per matmul
+
+
+class NumpyVectorStore(AsyncVectorStore):
+    """
+    Exact in-process search for small corpora.
+
+    Dense vectors live in a memory-mapped float16 matrix and sparse vectors in CSR arrays
+    (indptr/indices/data), both exported from Qdrant by `export_numpy_index.py`.
+    """
+
+    def __init__(self, index_path: str | None = None) -> None:
+        super().__init__()
+        self.index_path = Path(index_path or settings.NUMPY_INDEX_PATH)
+
+        start = time.time()
+        self.dense = np.load(self.index_path / "dense.npy", mmap_mode="r")
+        self.indptr = np.load(self.index_path / "sparse_indptr.npy")
+        self.indices = np.load(self.index_path / "sparse_indices.npy")
+        self.data = np.load(self.index_path / "sparse_data.npy")
+        with open(self.index_path / "points.json") as f:
+            points = json.load(f)
+        self.ids: list[Any] = points["ids"]
+        self.payloads: list[dict] = points["payloads"]
+
+        # Row number of every non-zero, so sparse scores reduce with one bincount
+        self.nnz_rows = np.repeat(np.arange(len(self.ids)), np.diff(self.indptr))
+
+        # Qdrant's IDF modifier: ln(1 + (N - df + 0.5) / (df + 0.5))
+        terms, df = np.unique(self.indices, return_counts=True)
+        self.idf_terms = terms
+        self.idf = np.log1p((len(self.ids) - df + 0.5) / (df + 0.5))
+
+        logger.info(f"Loaded NumPy index with {len(self.ids)} points in {time.time() - start:.2f}s.")
+
+    def dense_scores(self, query: np.ndarray) -> np.ndarray:
+        query = query.astype(np.float32)
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), BLOCK_ROWS):
+            block = np.asarray(self.dense[start : start + BLOCK_ROWS], dtype=np.float32)
+            scores[start : start + len(block)] = block @ query
+        return scores
+
+    def sparse_scores(self, query: models.SparseVector) -> tuple[np.ndarray, np.ndarray]:
+        q_indices = np.asarray(query.indices)
+        order = np.argsort(q_indices)
+        q_indices = q_indices[order]
+        q_values = np.asarray(query.values, dtype=np.float32)[order]
+
+        idf_pos = np.clip(np.searchsorted(self.idf_terms, q_indices), 0, max(len(self.idf_terms) - 1, 0))
+        known = self.idf_terms[idf_pos] == q_indices if len(self.idf_terms) else np.zeros(len(q_indices), dtype=bool)
+        q_values = np.where(known, q_values * self.idf[idf_pos], 0.0)
+
+        pos = np.clip(np.searchsorted(q_indices, self.indices), 0, max(len(q_indices) - 1, 0))
+        hit = q_indices[pos] == self.indices if len(q_indices) else np.zeros(len(self.indices), dtype=bool)
+
+        scores = np.bincount(self.nnz_rows[hit], weights=self.data[hit] * q_values[pos[hit]], minlength=len(self.ids))
+        matched = np.bincount(self.nnz_rows[hit], minlength=len(self.ids)) > 0
+        return scores, matched
+
+    @staticmethod
+    def top_k(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+        rows = np.flatnonzero(candidates)
+        if len(rows) > k:
+            rows = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        return rows[np.argsort(-scores[rows], kind="stable")]
+
+    @staticmethod
+    def rrf(rankings: list[np.ndarray], n: int) -> np.ndarray:
+        fused = np.zeros(n, dtype=np.float64)
+        for ranking in rankings:
+            fused[ranking] += 1.0 / (np.arange(len(ranking)) + RRF_K)
+        return fused
+
+    async def index_version(self) -> str:
+        # Re-exporting the index rewrites the matrices
+        return f"{self.index_path}@{(self.index_path / 'dense.npy').stat().st_mtime_ns}"
+
+    async def search_similar_issues_multi(
+        self, query_texts: list[str], limit: int = 5, dense_vectors: list[list[float]] | None = None
+    ) -> list[models.ScoredPoint]:
+        if not self.ids:
+            return []
+
+        dense_vectors = dense_vectors or await self.dense_vectors(query_texts)
+        sparse_vectors = await self.sparse_vectors(query_texts)
+
+        rankings = []
+        for dense_vector, sparse_vector in zip(dense_vectors, sparse_vectors, strict=True):
+            dense = self.dense_scores(np.asarray(dense_vector))
+            sparse, matched = self.sparse_scores(sparse_vector)
+            rankings.append(self.top_k(sparse, matched, PREFETCH_LIMIT))
+            rankings.append(self.top_k(dense, dense >= DENSE_SCORE_THRESHOLD, PREFETCH_LIMIT))
+
+        fused = self.rrf(rankings, len(self.ids))
+        rows = self.top_k(fused, fused > 0, limit)
+
+        return [
+            models.ScoredPoint(id=self.ids[row], version=0, score=float(fused[row]), payload=self.payloads[row])
+            for row in rows
+        ]
+
+
+async def export_from_qdrant(source: AsyncQdrantVectorStore, index_path: str | None = None, batch_size: int = 256) -> int:
+    """Dump a Qdrant collection into the NumPy index layout."""
+    path = Path(index_path or settings.NUMPY_INDEX_PATH)
+    path.mkdir(parents=True, exist_ok=True)
+
+    total = await source.count_points()
+    dense = np.lib.format.open_memmap(path / "dense.npy", mode="w+", dtype=np.float16, shape=(total, source.embedding_size))
+    indptr = [0]
+    indices: list[np.ndarray] = []
+    data: list[np.ndarray] = []
+    ids: list[Any] = []
+    payloads: list[dict] = []
+
+    offset = None
+    while len(ids) < total:
+        points, offset = await source.client.scroll(
+            collection_name=source.collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        for point in points[: total - len(ids)]:
+            assert isinstance(point.vector, dict)
+            vector = np.asarray(point.vector["dense"], dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            dense[len(ids)] = vector / norm if norm else vector
+
+            sparse = point.vector["miniCOIL"]
+            assert isinstance(sparse, models.SparseVector)
+            indices.append(np.asarray(sparse.indices, dtype=np.int64))
+            data.append(np.asarray(sparse.values, dtype=np.float32))
+            indptr.append(indptr[-1] + len(sparse.indices))
+
+            ids.append(point.id)
+            payloads.append(point.payload or {})
+        if offset is None:
+            break
+
+    if len(ids) != total:
+        raise RuntimeError(f"'{source.collection_name}' changed during export: counted {total}, scrolled {len(ids)}.")
+
+    dense.flush()
+    np.save(path / "sparse_indptr.npy", np.asarray(indptr, dtype=np.int64))
+    np.save(path / "sparse_indices.npy", np.concatenate(indices) if indices else np.empty(0, dtype=np.int64))
+    np.save(path / "sparse_data.npy", np.concatenate(data) if data else np.empty(0, dtype=np.float32))
+    with open(path / "points.json", "w") as f:
+        json.dump({"ids": ids, "payloads": payloads}, f)
+
+    logger.info(f"Exported {len(ids)} points from '{source.collection_name}' to {path}.")
+    return len(ids)
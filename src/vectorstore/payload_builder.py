@@ -1,3 +1,5 @@
+import textwrap
+
 from src.models.db_models import Comment, Issue
 from src.utils.config import settings
 
@@ -19,9 +21,43 @@ def build_comment_payload(comment: Comment, issue: Issue) -> dict:
         "issue_state": issue.state or "",
         "issue_created_at": issue.created_at.isoformat() if issue.created_at else None,
         "issue_updated_at": issue.updated_at.isoformat() if issue.updated_at else None,
+        "digest": issue.digest or "",
+    }
+
+
+def build_issue_payload(issue: Issue) -> dict:
+    return {
+        "issue_number": issue.number,
+        "repo": issue.repo,
+        "owner": issue.owner,
+        "url": issue.url or "",
+        "title": issue.title,
+        "is_bug": issue.is_bug,
+        "is_feature": issue.is_feature,
+        "issue_state": issue.state or "",
+        "digest": issue.digest or "",
     }
 
 
 CHUNK_SIZE = settings.CHUNK_SIZE
 BATCH_SIZE = settings.BATCH_SIZE
 CONCURRENT_COMMENTS = settings.CONCURRENT_COMMENTS
+
+
+def split_text_into_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> list[str]:
+    return textwrap.wrap(text, width=chunk_size, break_long_words=False)
+
+
+def build_query_texts(title: str, body: str, max_chunks: int | None = None) -> list[str]:
+    """Title on its own plus the body chunked like ingestion, so long bodies are not truncated by the embedder."""
+    max_chunks = max_chunks if max_chunks is not None else settings.MAX_QUERY_CHUNKS
+    texts = [title] if title else []
+    texts.extend(split_text_into_chunks(body)[:max_chunks])
+    return texts or [""]
+
+
+def issue_query_texts(title: str, body: str) -> list[str]:
+    """The texts an issue is embedded from as a search query; their mean dense vector is its query embedding."""
+    if settings.MULTI_VECTOR_QUERY:
+        return build_query_texts(title, body)
+    return [f"{title} {body}"]
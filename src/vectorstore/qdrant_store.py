@@ -1,22 +1,49 @@
+import asyncio
 import time
+from typing import cast
 
-from fastembed import SparseTextEmbedding, TextEmbedding
+import numpy as np
 from loguru import logger
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import Distance, PayloadSchemaType, models
 
 from src.utils.config import settings
+from src.vectorstore.base import AsyncVectorStore
 
+# Local mode keeps its data inside the client (":memory:") or behind a file lock (path),
+# so every store in the process has to share one client per location.
+_local_clients: dict[str, AsyncQdrantClient] = {}
 
-class AsyncQdrantVectorStore:
-    def __init__(self) -> None:
-        self.client = AsyncQdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
 
-        self.collection_name = f"{settings.APP_ENV}_{settings.COLLECTION_NAME}"
-        self.embedding_size = settings.LEN_EMBEDDINGS
+def build_async_client() -> AsyncQdrantClient:
+    """Return a server client, or qdrant-client's embedded local mode when QDRANT_LOCAL_PATH is set."""
+    location = settings.QDRANT_LOCAL_PATH
+    if not location:
+        return AsyncQdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
 
-        self.dense_model = TextEmbedding(model_name=settings.DENSE_MODEL_NAME)
-        self.sparse_model = SparseTextEmbedding(model_name=settings.SPARSE_MODEL_NAME)
+    if location not in _local_clients:
+        if location == ":memory:":
+            _local_clients[location] = AsyncQdrantClient(location=":memory:")
+        else:
+            _local_clients[location] = AsyncQdrantClient(path=location)
+        logger.info(f"Using embedded local Qdrant at '{location}'.")
+    return _local_clients[location]
+
+
+def issue_collection_name(collection_name: str) -> str:
+    """Side collection holding one centroid point per issue for the coarse search stage."""
+    return f"{collection_name}_issues"
+
+
+class AsyncQdrantVectorStore(AsyncVectorStore):
+    def __init__(self, collection_name: str | None = None) -> None:
+        super().__init__()
+        self.client = build_async_client()
+
+        # Readers go through the alias so a reindex can swap the collection underneath it
+        self.alias_name = f"{settings.APP_ENV}_{settings.COLLECTION_NAME}"
+        self.collection_name = collection_name or self.alias_name
+        self.issue_collection_name = issue_collection_name(self.collection_name)
 
         self.quantization_config = models.ScalarQuantization(
             scalar=models.ScalarQuantizationConfig(
@@ -28,40 +55,129 @@ class AsyncQdrantVectorStore:
 
         self.sparse_vectors_config = {"miniCOIL": models.SparseVectorParams(modifier=models.Modifier.IDF)}
 
-    async def dense_vectors(self, texts: list[str]) -> list[list[float]]:
-        # Embedding is sync, no need to await
-        return [vec.tolist() for vec in self.dense_model.embed(texts)]
-
-    async def sparse_vectors(self, texts: list[str]) -> list[models.SparseVector]:
-        return [
-            models.SparseVector(
-                indices=se.indices.tolist(),
-                values=se.values.tolist(),
-            )
-            for se in self.sparse_model.embed(texts)
-        ]
-
-    async def create_collection(self) -> None:
+    async def create_collection(self, deferred_indexing: bool = False) -> None:
         try:
             if await self.client.collection_exists(self.collection_name):
                 logger.info(f"Collection '{self.collection_name}' already exists.")
-                return
+            else:
+                # indexing_threshold=0 skips HNSW construction during bulk loads, see enable_indexing()
+                optimizers_config = models.OptimizersConfigDiff(indexing_threshold=0) if deferred_indexing else None
 
-            start = time.time()
-            await self.client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config={"dense": models.VectorParams(size=self.embedding_size, distance=Distance.COSINE)},
-                quantization_config=self.quantization_config,
-                sparse_vectors_config=self.sparse_vectors_config,
-            )
-            logger.info(f"Collection '{self.collection_name}' created in {time.time() - start:.2f}s.")
+                start = time.time()
+                await self.client.create_collection(
+                    collection_name=self.collection_name,
+                    vectors_config={"dense": models.VectorParams(size=self.embedding_size, distance=Distance.COSINE)},
+                    quantization_config=self.quantization_config,
+                    sparse_vectors_config=self.sparse_vectors_config,
+                    optimizers_config=optimizers_config,
+                )
+                logger.info(f"Collection '{self.collection_name}' created in {time.time() - start:.2f}s.")
+
+            if not await self.client.collection_exists(self.issue_collection_name):
+                await self.client.create_collection(
+                    collection_name=self.issue_collection_name,
+                    vectors_config={"dense": models.VectorParams(size=self.embedding_size, distance=Distance.COSINE)},
+                    quantization_config=self.quantization_config,
+                )
+                logger.info(f"Collection '{self.issue_collection_name}' created.")
         except Exception as e:
             logger.error(f"Failed to create collection '{self.collection_name}': {e}")
 
     async def delete_collection(self) -> None:
-        if await self.client.collection_exists(self.collection_name):
-            await self.client.delete_collection(self.collection_name)
-            logger.info(f"Collection '{self.collection_name}' deleted.")
+        for name in (self.collection_name, self.issue_collection_name):
+            if await self.client.collection_exists(name):
+                await self.client.delete_collection(name)
+                logger.info(f"Collection '{name}' deleted.")
+
+    async def enable_indexing(self) -> None:
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=settings.QDRANT_INDEXING_THRESHOLD),
+        )
+        logger.info(f"Indexing enabled for '{self.collection_name}'.")
+
+    async def wait_until_green(self, timeout: float | None = None) -> None:
+        timeout = timeout if timeout is not None else settings.REINDEX_GREEN_TIMEOUT_SECONDS
+        start = time.time()
+        while True:
+            info = await self.client.get_collection(self.collection_name)
+            if info.status == models.CollectionStatus.GREEN:
+                logger.info(f"Collection '{self.collection_name}' is green after {time.time() - start:.2f}s.")
+                return
+            if time.time() - start > timeout:
+                raise TimeoutError(f"Collection '{self.collection_name}' not green after {timeout}s (status={info.status}).")
+            await asyncio.sleep(2)
+
+    async def count_points(self, collection_name: str | None = None) -> int:
+        result = await self.client.count(collection_name=collection_name or self.collection_name, exact=True)
+        return result.count
+
+    async def get_alias_target(self) -> str | None:
+        response = await self.client.get_aliases()
+        for alias in response.aliases:
+            if alias.alias_name == self.alias_name:
+                return alias.collection_name
+        return None
+
+    async def index_version(self) -> str:
+        # A reindex loads a new versioned collection and swaps the alias onto it
+        return await self.get_alias_target() or self.collection_name
+
+    async def legacy_collections(self) -> list[str]:
+        """Concrete collections still named like the chunk or issue alias, as pre-alias deployments created them."""
+        response = await self.client.get_aliases()
+        aliases = {alias.alias_name for alias in response.aliases}
+        return [
+            name
+            for name in (self.alias_name, issue_collection_name(self.alias_name))
+            if name not in aliases and await self.client.collection_exists(name)
+        ]
+
+    async def switch_alias(self, collection_name: str, replace_legacy: bool = False) -> str | None:
+        """
+        Atomically point the chunk and issue aliases at `collection_name`, returning the previous target.
+
+        A legacy collection under an alias name blocks the alias. It is only dropped with `replace_legacy`,
+        once its data has been copied into a versioned collection (see `reindex.py migrate`).
+        """
+        response = await self.client.get_aliases()
+        current = {alias.alias_name: alias.collection_name for alias in response.aliases}
+        previous = current.get(self.alias_name)
+
+        legacy = await self.legacy_collections()
+        if legacy and not replace_legacy:
+            raise RuntimeError(
+                f"Legacy collections {legacy} block the '{self.alias_name}' alias; run `reindex.py migrate` first."
+            )
+
+        operations: list[models.AliasOperations] = []
+        for alias_name, target in (
+            (self.alias_name, collection_name),
+            (issue_collection_name(self.alias_name), issue_collection_name(collection_name)),
+        ):
+            if alias_name in current:
+                operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias_name)))
+            operations.append(
+                models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=target, alias_name=alias_name))
+            )
+
+        for name in legacy:
+            # Qdrant cannot alias over an existing collection; its data already lives in `collection_name`
+            logger.warning(f"Dropping legacy collection '{name}' to replace it with an alias.")
+            await self.client.delete_collection(name)
+        try:
+            await self.client.update_collection_aliases(change_aliases_operations=operations)
+        except Exception:
+            if legacy:
+                logger.error(f"Alias update failed; the legacy data is kept in '{collection_name}', rerun the swap.")
+            raise
+        logger.info(f"Alias '{self.alias_name}' now points to '{collection_name}' (was '{previous}').")
+        return previous
+
+    async def list_versions(self) -> list[str]:
+        response = await self.client.get_collections()
+        prefix = f"{self.alias_name}_v"
+        return sorted(c.name for c in response.collections if c.name.startswith(prefix) and not c.name.endswith("_issues"))
 
     async def create_indexes(self) -> None:
         try:
@@ -82,26 +198,100 @@ class AsyncQdrantVectorStore:
         except Exception as e:
             logger.info(f"Index for 'comment_id' may already exist or failed: {e}")
 
-    async def search_similar_issues(self, query_text: str, limit: int = 5) -> list[models.ScoredPoint]:
-        dense_vector = (await self.dense_vectors([query_text]))[0]
-        sparse_vector = (await self.sparse_vectors([query_text]))[0]
+    async def upsert_issue_centroid(self, issue_number: int, payload: dict) -> bool:
+        """Store the normalized mean of an issue's chunk vectors in the issue-level collection."""
+        issue_filter = models.Filter(
+            must=[models.FieldCondition(key="issue_number", match=models.MatchValue(value=issue_number))]
+        )
+        vectors: list[list[float]] = []
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=issue_filter,
+                with_vectors=["dense"],
+                with_payload=False,
+                limit=256,
+                offset=offset,
+            )
+            for point in points:
+                dense = point.vector.get("dense") if isinstance(point.vector, dict) else None
+                if isinstance(dense, list):
+                    vectors.append(cast(list[float], dense))
+            if offset is None:
+                break
+
+        if not vectors:
+            return False
 
+        centroid = np.mean(np.asarray(vectors, dtype=np.float32), axis=0)
+        norm = np.linalg.norm(centroid)
+        await self.client.upsert(
+            collection_name=self.issue_collection_name,
+            points=[
+                models.PointStruct(
+                    id=issue_number,
+                    vector={"dense": (centroid / norm if norm else centroid).tolist()},
+                    payload=payload,
+                )
+            ],
+        )
+        return True
+
+    async def coarse_issue_numbers(self, dense_vectors: list[list[float]]) -> list[int]:
+        """First stage: nearest issues by centroid, fused across query vectors."""
         results = await self.client.query_points(
-            collection_name=self.collection_name,
+            collection_name=self.issue_collection_name,
             prefetch=[
-                models.Prefetch(
-                    query=sparse_vector,
-                    using="miniCOIL",
-                    limit=10,
-                ),
-                models.Prefetch(
-                    query=dense_vector,
-                    using="dense",
-                    score_threshold=0.9,
-                    limit=10,
-                ),
+                models.Prefetch(query=vector, using="dense", limit=settings.COARSE_TOP_ISSUES) for vector in dense_vectors
             ],
             query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=settings.COARSE_TOP_ISSUES,
+        )
+        return [int(point.id) for point in results.points]
+
+    async def search_similar_issues_multi(
+        self, query_texts: list[str], limit: int = 5, dense_vectors: list[list[float]] | None = None
+    ) -> list[models.ScoredPoint]:
+        # One embedding batch per model for all query texts, unless the caller already embedded them
+        dense_vectors = dense_vectors or await self.dense_vectors(query_texts)
+        sparse_vectors = await self.sparse_vectors(query_texts)
+
+        issue_filter = None
+        if settings.TWO_STAGE_SEARCH:
+            try:
+                issue_numbers = await self.coarse_issue_numbers(dense_vectors)
+                if issue_numbers:
+                    issue_filter = models.Filter(
+                        must=[models.FieldCondition(key="issue_number", match=models.MatchAny(any=issue_numbers))]
+                    )
+            except Exception as e:
+                logger.warning(f"Coarse issue search failed, searching all chunks: {e}")
+
+        prefetch = []
+        for dense_vector, sparse_vector in zip(dense_vectors, sparse_vectors, strict=True):
+            prefetch.extend(
+                [
+                    models.Prefetch(
+                        query=sparse_vector,
+                        using="miniCOIL",
+                        filter=issue_filter,
+                        limit=10,
+                    ),
+                    models.Prefetch(
+                        query=dense_vector,
+                        using="dense",
+                        filter=issue_filter,
+                        score_threshold=0.9,
+                        limit=10,
+                    ),
+                ]
+            )
+
+        results = await self.client.query_points(
+            collection_name=self.collection_name,
+            prefetch=prefetch,
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
             search_params=models.SearchParams(
                 quantization=models.QuantizationSearchParams(
                     ignore=False,
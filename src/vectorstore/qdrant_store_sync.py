@@ -7,10 +7,27 @@ from qdrant_client.models import Distance, PayloadSchemaType, models
 
 from src.utils.config import settings
 
+_local_clients: dict[str, QdrantClient] = {}
+
+
+def build_client() -> QdrantClient:
+    """Sync counterpart of `qdrant_store.build_async_client`."""
+    location = settings.QDRANT_LOCAL_PATH
+    if not location:
+        return QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
+
+    if location not in _local_clients:
+        if location == ":memory:":
+            _local_clients[location] = QdrantClient(location=":memory:")
+        else:
+            _local_clients[location] = QdrantClient(path=location)
+        logger.info(f"Using embedded local Qdrant at '{location}'.")
+    return _local_clients[location]
+
 
 class QdrantVectorStore:
     def __init__(self) -> None:
-        self.client = QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
+        self.client = build_client()
 
         self.collection_name = f"{settings.APP_ENV}_{settings.COLLECTION_NAME}"
         self.embedding_size = settings.LEN_EMBEDDINGS
@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import time
+from typing import cast
+
+from loguru import logger
+from qdrant_client.models import PointStruct, VectorStruct
+
+from src.data_pipeline.ingest_embeddings import ingest_issues_to_qdrant_async
+from src.utils.config import settings
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore, issue_collection_name
+
+
+def versioned_collection_name(alias_name: str) -> str:
+    return f"{alias_name}_v{time.strftime('%Y%m%d%H%M%S')}"
+
+
+async def build_version(live: AsyncQdrantVectorStore) -> AsyncQdrantVectorStore:
+    """Bulk-load a fresh versioned collection with HNSW indexing deferred until the load is done."""
+    target = AsyncQdrantVectorStore(collection_name=versioned_collection_name(live.alias_name))
+    await target.create_collection(deferred_indexing=True)
+    await target.create_indexes()
+
+    start = time.time()
+    expected = await ingest_issues_to_qdrant_async(target)
+    logger.info(f"Loaded {expected} points into '{target.collection_name}' in {time.time() - start:.2f}s.")
+
+    await target.enable_indexing()
+    await target.wait_until_green()
+
+    actual = await target.count_points()
+    if actual != expected:
+        raise RuntimeError(f"Point count mismatch for '{target.collection_name}': expected {expected}, found {actual}.")
+    if actual == 0:
+        raise RuntimeError(f"Refusing to promote empty collection '{target.collection_name}'.")
+
+    return target
+
+
+async def verify_against_live(live: AsyncQdrantVectorStore, new_count: int) -> None:
+    current = await live.get_alias_target()
+    if current is None:
+        return
+    live_count = await live.count_points(current)
+    if new_count < live_count * settings.REINDEX_MIN_POINT_RATIO:
+        raise RuntimeError(
+            f"New version has {new_count} points vs {live_count} live "
+            f"(below REINDEX_MIN_POINT_RATIO={settings.REINDEX_MIN_POINT_RATIO}); use --force to promote anyway."
+        )
+
+
+async def prune_versions(live: AsyncQdrantVectorStore, keep: int | None = None) -> None:
+    keep = keep if keep is not None else settings.REINDEX_KEEP_VERSIONS
+    current = await live.get_alias_target()
+    versions = await live.list_versions()
+    for name in versions[: max(len(versions) - keep, 0)]:
+        if name == current:
+            continue
+        await live.client.delete_collection(name)
+        await live.client.delete_collection(issue_collection_name(name))
+        logger.info(f"Pruned old version '{name}'.")
+
+
+async def copy_points(live: AsyncQdrantVectorStore, source: str, target: str, batch_size: int = 256) -> int:
+    copied = 0
+    offset = None
+    while True:
+        points, offset = await live.client.scroll(
+            collection_name=source, with_vectors=True, with_payload=True, limit=batch_size, offset=offset
+        )
+        if points:
+            await live.client.upsert(
+                collection_name=target,
+                points=[
+                    PointStruct(id=point.id, vector=cast(VectorStruct, point.vector or {}), payload=point.payload)
+                    for point in points
+                ],
+            )
+            copied += len(points)
+        if offset is None:
+            return copied
+
+
+async def migrate(live: AsyncQdrantVectorStore | None = None) -> str | None:
+    """
+    Move a pre-alias deployment onto the alias: copy its concrete collections into a new version, verify the
+    copy, then replace them with the aliases. Returns the new version, or None when there was nothing to move.
+    """
+    live = live or AsyncQdrantVectorStore()
+    legacy = await live.legacy_collections()
+    if not legacy:
+        logger.info(f"'{live.alias_name}' is already an alias, nothing to migrate.")
+        return None
+
+    target = AsyncQdrantVectorStore(collection_name=versioned_collection_name(live.alias_name))
+    await target.create_collection(deferred_indexing=True)
+    await target.create_indexes()
+    for source in legacy:
+        copy = target.collection_name if source == live.alias_name else target.issue_collection_name
+        copied = await copy_points(live, source, copy)
+        expected = await live.count_points(source)
+        if copied != expected or await live.count_points(copy) != expected:
+            raise RuntimeError(f"Copy of '{source}' into '{copy}' is incomplete; legacy collection left in place.")
+        logger.info(f"Copied {copied} points from '{source}' into '{copy}'.")
+
+    await target.enable_indexing()
+    await target.wait_until_green()
+    await live.switch_alias(target.collection_name, replace_legacy=True)
+    logger.info(f"Migration complete: '{target.collection_name}' holds the legacy data behind the alias.")
+    return target.collection_name
+
+
+async def reindex(force: bool = False) -> str:
+    live = AsyncQdrantVectorStore()
+    if legacy := await live.legacy_collections():
+        raise RuntimeError(f"Legacy collections {legacy} block the alias; run `reindex.py migrate` first.")
+    target = await build_version(live)
+
+    if not force:
+        try:
+            await verify_against_live(live, await target.count_points())
+        except RuntimeError:
+            logger.error(f"Keeping '{target.collection_name}' unpromoted for inspection.")
+            raise
+
+    previous = await live.switch_alias(target.collection_name)
+    logger.info(f"Reindex complete: '{target.collection_name}' is live, rollback target is '{previous}'.")
+
+    await prune_versions(live)
+    return target.collection_name
+
+
+async def rollback() -> str:
+    live = AsyncQdrantVectorStore()
+    current = await live.get_alias_target()
+    older = [name for name in await live.list_versions() if current is None or name < current]
+    if not older:
+        raise RuntimeError(f"No previous version of '{live.alias_name}' to roll back to.")
+
+    await live.switch_alias(older[-1])
+    return older[-1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the Qdrant index into a new version and swap the alias")
+    parser.add_argument("command", choices=["reindex", "rollback", "migrate"], nargs="?", default="reindex")
+    parser.add_argument("--force", action="store_true", help="Promote even if the new version shrank")
+    args = parser.parse_args()
+
+    if args.command == "rollback":
+        asyncio.run(rollback())
+    elif args.command == "migrate":
+        asyncio.run(migrate())
+    else:
+        asyncio.run(reindex(force=args.force))
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+from loguru import logger
+
+from src.models.agent_models import ClassificationState, Recommendation
+from src.utils.config import settings
+
+
+class SemanticCache:
+    """
+    In-process cache of LLM results keyed by query embedding.
+
+    A lookup is a hit when the cosine similarity to a stored query reaches `threshold`. Entries expire
+    after `ttl_seconds`, and the least recently used entry is evicted once `max_entries` are stored.
+    """
+
+    def __init__(
+        self,
+        dim: int | None = None,
+        threshold: float | None = None,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.dim = dim or settings.LEN_EMBEDDINGS
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.SEMANTIC_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+
+        # Fixed-size slots so a lookup is one matmul over the whole index
+        self.vectors = np.zeros((self.max_entries, self.dim), dtype=np.float32)
+        self.created = np.zeros(self.max_entries, dtype=np.float64)
+        self.active = np.zeros(self.max_entries, dtype=bool)
+        self.entries: OrderedDict[int, tuple[ClassificationState, Recommendation]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def normalize(vector: list[float] | np.ndarray) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def remove(self, slot: int) -> None:
+        self.active[slot] = False
+        self.entries.pop(slot, None)
+
+    def expire(self, now: float) -> None:
+        for slot in np.flatnonzero(self.active & (self.created < now - self.ttl_seconds)):
+            self.remove(int(slot))
+
+    def lookup(self, vector: list[float] | np.ndarray) -> tuple[ClassificationState, Recommendation] | None:
+        self.expire(time.time())
+
+        result = None
+        if self.entries:
+            scores = self.vectors @ self.normalize(vector)
+            scores[~self.active] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                self.entries.move_to_end(best)
+                classification, recommendation = self.entries[best]
+                result = (classification.model_copy(deep=True), recommendation.model_copy(deep=True))
+                logger.info(f"Semantic cache hit (similarity {scores[best]:.3f}).")
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.record_lookup(hit=result is not None)
+        return result
+
+    def store(
+        self, vector: list[float] | np.ndarray, classification: ClassificationState, recommendation: Recommendation
+    ) -> None:
+        free = np.flatnonzero(~self.active)
+        if len(free):
+            slot = int(free[0])
+        else:
+            slot = next(iter(self.entries))  # least recently used
+            self.remove(slot)
+
+        self.vectors[slot] = self.normalize(vector)
+        self.created[slot] = time.time()
+        self.active[slot] = True
+        self.entries[slot] = (classification.model_copy(deep=True), recommendation.model_copy(deep=True))
+
+    def clear(self) -> None:
+        self.active[:] = False
+        self.entries.clear()
+
+    def record_lookup(self, hit: bool) -> None:
+        try:
+            from src.utils.telemetry import get_app_metrics
+
+            get_app_metrics().semantic_cache_lookups_counter.add(1, {"result": "hit" if hit else "miss"})
+        except RuntimeError:
+            pass  # Telemetry not initialized
@@ -0,0 +1,47 @@
+"""
+Graph latency and throughput with the LLM served from a recorded cassette, so runs are reproducible
+offline. Record once against the real provider, then replay at a fixed simulated latency:
+
+    make record-llm-cassette
+    make bench-graph-replay
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.agents.graph import build_issue_workflow
+from src.utils.config import settings
+from tests.benchmarks.bench_triage_modes import ISSUES
+
+
+async def main(runs: int, concurrency: int) -> None:
+    graph = build_issue_workflow().compile()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def run_issue(issue: dict[str, str]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await graph.ainvoke(issue)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_issue(issue) for _ in range(runs) for issue in ISSUES))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"mode={settings.LLM_CASSETTE_MODE} concurrency={concurrency} requests={len(latencies)} "
+        f"p50={statistics.median(latencies):.3f}s p95={latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]:.3f}s "
+        f"throughput={len(latencies) / elapsed:.1f} req/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the issue graph against recorded LLM responses")
+    parser.add_argument("--runs", type=int, default=10, help="Passes over the sample issues")
+    parser.add_argument("--concurrency", type=int, default=8, help="Issues in flight at once")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.concurrency))
@@ -0,0 +1,55 @@
+"""
+Per-call guardrail overhead: a guard (and its validator) built for every check, as before, against the
+pre-built pooled guards of GuardrailValidator.
+
+    make bench-guardrails
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from guardrails import AsyncGuard
+
+from src.models.guardrails_models import GuardrailResult
+from src.utils.guardrails import build_hub_validator, guard_config, guardrail_validator, to_guardrail_result
+
+TEXT = "Fitting HuberRegressor on a scipy.sparse CSR matrix raises ConvergenceWarning after max_iter."
+
+
+async def per_call_guard(text: str) -> GuardrailResult:
+    cfg = guard_config.toxicity
+    validator = build_hub_validator(
+        "ToxicLanguage",
+        threshold=cfg.get("threshold"),
+        validation_method=cfg.get("validation_method"),
+        on_fail=cfg.get("on_fail"),
+    )
+    guard = AsyncGuard().use(validator) if validator is not None else AsyncGuard()
+    return to_guardrail_result("ToxicLanguage", await guard.validate(text))
+
+
+async def measure(check: Callable[[str], Awaitable[GuardrailResult]], calls: int) -> list[float]:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await check(TEXT)
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+async def main(calls: int) -> None:
+    await guardrail_validator.warmup()
+    for label, check in (("per-call guard", per_call_guard), ("pooled guard", guardrail_validator.check_toxicity)):
+        latencies = await measure(check, calls)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{label:<15} mean={statistics.mean(latencies) * 1000:.2f}ms p95={p95 * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-call versus pooled guardrail guards")
+    parser.add_argument("--calls", type=int, default=50, help="Toxicity checks per variant")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
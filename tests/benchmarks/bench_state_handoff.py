@@ -0,0 +1,92 @@
+"""
+Allocations and time spent handing the state from node to node, with similar issues as plain dicts and
+whole-state copies (the previous behaviour) versus SimilarIssue records passed through as they are.
+
+LangGraph rebuilds the IssueState model from the state channels before each node; the legacy path also
+dumps the whole state to build the recommendation prompt and re-validates the result for the response.
+
+    make bench-state-handoff
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from src.models.agent_models import ClassificationState, IssueState, Recommendation, SimilarIssue
+from src.utils.prompts import PromptTemplates
+
+NODES_AFTER_SEARCH = 3  # Classification, Recommendation, Output Guardrail
+
+
+class LegacyIssueState(IssueState):
+    similar_issues: list[dict[str, Any]] | None = None  # type: ignore[assignment]
+
+
+def payload(rank: int) -> dict[str, Any]:
+    return {
+        "issue_number": 1000 + rank,
+        "repo": "scikit-learn",
+        "owner": "scikit-learn",
+        "title": f"HuberRegressor fails to converge on sparse input ({rank})",
+        "url": f"https://github.com/scikit-learn/scikit-learn/issues/{1000 + rank}",
+        "comment_id": 50_000 + rank,
+        "chunk_text": "ConvergenceWarning after max_iter when fitting on a CSR matrix. " * 8,
+        "is_bug": True,
+        "is_feature": False,
+        "digest": "[bug, closed] HuberRegressor fails to converge. Resolution: scale the input.",
+    }
+
+
+HITS = [(payload(rank), 0.9 - rank / 100) for rank in range(20)]
+CLASSIFICATION = ClassificationState(category="bug", priority="high", labels=["bug", "regression"], assignee="@ml-team")
+UPDATES = {"classification": CLASSIFICATION, "recommendation": Recommendation(summary="Scale X.", references=[])}
+ISSUE = {"title": "HuberRegressor diverges", "body": "Traceback ...", "query_embedding": [0.01] * 1024}
+
+
+def legacy_run() -> Any:
+    values: dict[str, Any] = {**ISSUE, "similar_issues": [{**p, "score": score} for p, score in HITS]}
+    for _ in range(NODES_AFTER_SEARCH):
+        state = LegacyIssueState(**values)
+    state.model_dump()  # recommendation_agent dumped the whole state to read the classification
+    PromptTemplates.summary_prompt(CLASSIFICATION, [])
+    values.update(UPDATES)
+    return LegacyIssueState(**values)
+
+
+def typed_run() -> Any:
+    values: dict[str, Any] = {**ISSUE, "similar_issues": [SimilarIssue.from_payload(p, score) for p, score in HITS]}
+    for _ in range(NODES_AFTER_SEARCH):
+        IssueState(**values)
+    PromptTemplates.summary_prompt(CLASSIFICATION, [])
+    values.update(UPDATES)
+    return IssueState.model_construct(**values)
+
+
+def measure(run: Callable[[], Any], requests: int) -> tuple[float, float]:
+    """Microseconds per request and KiB allocated per request (tracemalloc peak over one request)."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        run()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / requests * 1e6, peak / 1024
+
+
+def main(requests: int) -> None:
+    for name, run in (("dicts + state copies", legacy_run), ("SimilarIssue, no copies", typed_run)):
+        run()  # Warm up pydantic's validators
+        micros, kib = measure(run, requests)
+        print(f"{name:<24} {micros:8.1f} us/request  peak {kib:7.1f} KiB/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark state hand-off between graph nodes")
+    parser.add_argument("--requests", type=int, default=2000, help="Simulated requests per variant")
+    args = parser.parse_args()
+    main(args.requests)
@@ -0,0 +1,65 @@
+"""
+End-to-end latency and token usage of the two-call graph (Classification -> Recommendation)
+against the single-call Triage graph. Hits the real LLM and vector store configured for APP_ENV.
+
+    make bench-triage-modes
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+
+from src.agents.graph import build_issue_workflow
+
+ISSUES = [
+    {
+        "title": "HuberRegressor fails to converge on sparse input",
+        "body": "Fitting HuberRegressor on a scipy.sparse CSR matrix raises ConvergenceWarning after max_iter.",
+    },
+    {
+        "title": "Add sample_weight support to CalibratedClassifierCV",
+        "body": "It would be useful to pass sample_weight through to the calibrator when using cv='prefit'.",
+    },
+    {
+        "title": "Typo in the plotting tutorial",
+        "body": "The plotting tutorial says 'ploting' twice in the second section.",
+    },
+]
+
+
+async def run_mode(single_call: bool, runs: int) -> dict[str, float]:
+    graph = build_issue_workflow(single_call=single_call).compile()
+    latencies: list[float] = []
+    tokens: list[int] = []
+
+    for _ in range(runs):
+        for issue in ISSUES:
+            usage = UsageMetadataCallbackHandler()
+            start = time.perf_counter()
+            await graph.ainvoke(issue, config={"callbacks": [usage]})
+            latencies.append(time.perf_counter() - start)
+            tokens.append(sum(u["total_tokens"] for u in usage.usage_metadata.values()))
+
+    latencies.sort()
+    return {
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "mean_tokens": statistics.mean(tokens),
+    }
+
+
+async def main(runs: int) -> None:
+    for single_call in (False, True):
+        stats = await run_mode(single_call, runs)
+        label = "single-call" if single_call else "two-call"
+        print(f"{label:<12} p50={stats['p50_s']:.2f}s p95={stats['p95_s']:.2f}s mean_tokens={stats['mean_tokens']:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the two-call and single-call triage graphs")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the sample issues per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
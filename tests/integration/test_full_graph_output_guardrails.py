@@ -158,3 +158,35 @@ async def test_full_graph_allows_clean_output() -> None:
         result = await run_graph(get_graph(), {"title": "T", "body": "B"})
         assert not result.get("blocked", False)
         assert "HuberRegressor" in result["recommendation"].summary
+
+
+@pytest.mark.asyncio
+async def test_single_call_graph_blocks_on_output_guardrail_secret() -> None:
+    async def secret_triage(state: Any) -> Any:
+        state.classification = ClassificationState(
+            category="bug", priority="high", labels=["regression", "model"], assignee="johndoe"
+        )
+        state.recommendation = Recommendation(summary="Here is the API_KEY: sk-123456789abcdef", references=[])
+        return state
+
+    def mock_input_guardrail(s: Any) -> Any:
+        s.blocked = False
+        return s
+
+    def mock_issue_search(s: Any) -> Any:
+        s.similar_issues = []
+        return s
+
+    with (
+        patch.multiple(
+            "src.agents.agents",
+            input_guardrail_agent=mock_input_guardrail,
+            issue_search_agent=mock_issue_search,
+            triage_agent=secret_triage,
+        ),
+        patch("src.utils.config.settings.SINGLE_CALL_TRIAGE", True),
+    ):
+        result = await run_graph(get_graph(), {"title": "T", "body": "B"})
+        assert result["blocked"]
+        assert result["classification"].category == "bug"
+        assert result["validation_summary"]["type"] == "SecretsPresent_Output"
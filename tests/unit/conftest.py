@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import json
+from collections import deque
+from collections.abc import AsyncGenerator, Generator, Iterable
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+EMBEDDING_SIZE = 16
+
+
+class FakeDenseModel:
+    """Deterministic bag-of-words embedding so similar texts land close together without downloading models."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def embed(self, texts: Iterable[str]) -> Generator[np.ndarray, None, None]:
+        for text in texts:
+            vec = np.zeros(EMBEDDING_SIZE, dtype=np.float32)
+            for word in text.lower().split():
+                vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % EMBEDDING_SIZE] += 1.0
+            norm = np.linalg.norm(vec)
+            yield vec / norm if norm else vec
+
+
+class FakeSparseModel:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def embed(self, texts: Iterable[str]) -> Generator[SimpleNamespace, None, None]:
+        for text in texts:
+            counts: dict[int, float] = {}
+            for word in text.lower().split():
+                idx = int(hashlib.md5(word.encode()).hexdigest(), 16) % 1000
+                counts[idx] = counts.get(idx, 0.0) + 1.0
+            indices = np.array(sorted(counts), dtype=np.int64)
+            yield SimpleNamespace(indices=indices, values=np.array([counts[i] for i in indices], dtype=np.float32))
+
+
+@pytest.fixture
+def fake_embeddings() -> Generator[None, None, None]:
+    with (
+        patch("src.vectorstore.base.TextEmbedding", FakeDenseModel),
+        patch("src.vectorstore.base.SparseTextEmbedding", FakeSparseModel),
+    ):
+        yield
+
+
+@pytest.fixture
+def local_qdrant(fake_embeddings: None) -> Generator[None, None, None]:
+    """Run the Qdrant stores against qdrant-client's in-memory local mode."""
+    from src.utils.config import settings
+    from src.vectorstore import qdrant_store
+
+    with (
+        patch.object(settings, "QDRANT_LOCAL_PATH", ":memory:"),
+        patch.object(settings, "LEN_EMBEDDINGS", EMBEDDING_SIZE),
+        patch.dict(qdrant_store._local_clients, clear=True),
+    ):
+        yield
+
+
+class FakeOpenAIServer:
+    """OpenAI-compatible /v1/chat/completions on a local socket; each request follows the next scripted (delay, status)."""
+
+    def __init__(self, content: str = "ok", tool_arguments: dict[str, Any] | None = None) -> None:
+        self.content = content
+        self.tool_arguments = tool_arguments
+        self.script: deque[tuple[float, int]] = deque()
+        self.requests = 0
+        self.connections = 0
+        self.port = 0
+        self.server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def enqueue(self, delay: float = 0.0, status: int = 200) -> None:
+        self.script.append((delay, status))
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+
+    def completion(self) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": "assistant", "content": self.content}
+        if self.tool_arguments is not None:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{self.requests}",
+                    "type": "function",
+                    "function": {"name": "ResponseFormatter", "arguments": json.dumps(self.tool_arguments)},
+                }
+            ]
+        return {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while await reader.readline():  # request line; empty once the client closes
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.requests += 1
+                delay, status = self.script.popleft() if self.script else (0.0, 200)
+                await asyncio.sleep(delay)
+
+                payload = (
+                    self.completion() if status == 200 else {"error": {"message": "fake failure", "type": "server_error"}}
+                )
+                data = json.dumps(payload).encode()
+                head = f"HTTP/1.1 {status} Fake\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+                writer.write(head.encode() + data)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def fake_openai() -> AsyncGenerator[FakeOpenAIServer, None]:
+    server = FakeOpenAIServer()
+    await server.start()
+    yield server
+    server.close()
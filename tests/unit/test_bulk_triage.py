@@ -0,0 +1,79 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from src.agents.http_client import close_llm_http_client
+from src.data_pipeline.batch_executor import LocalBatchExecutor, build_tool_request, read_jsonl, write_jsonl
+from src.data_pipeline.bulk_triage import (
+    collect_results,
+    custom_id_for,
+    execute_chunk,
+    output_path_for,
+    pending_chunks,
+)
+from src.models.agent_models import ResponseFormatter
+from src.utils.config import settings
+from tests.unit.conftest import FakeOpenAIServer
+
+ARGUMENTS = {"category": "bug", "priority": "high", "labels": ["bug"], "assignee": "alice", "errors": []}
+
+
+@pytest_asyncio.fixture
+async def batch_llm(fake_openai: FakeOpenAIServer) -> AsyncGenerator[FakeOpenAIServer, None]:
+    fake_openai.tool_arguments = ARGUMENTS
+    with patch.object(settings, "OPENAI_BASE_URL", fake_openai.base_url), patch.object(settings, "LLM_HTTP2", False):
+        yield fake_openai
+        await close_llm_http_client()
+
+
+def write_chunk(work_dir: Path, issue_ids: list[int]) -> Path:
+    input_path = work_dir / "chunk-1.input.jsonl"
+    write_jsonl(
+        input_path, [build_tool_request(custom_id_for(i), f"Classify issue {i}", ResponseFormatter) for i in issue_ids]
+    )
+    return input_path
+
+
+def test_batch_request_format() -> None:
+    request = build_tool_request("issue-7", "Classify", ResponseFormatter)
+
+    assert request["method"] == "POST"
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["messages"] == [{"role": "user", "content": "Classify"}]
+    assert request["body"]["tool_choice"]["function"]["name"] == "ResponseFormatter"
+
+
+@pytest.mark.asyncio
+async def test_local_executor_only_sends_missing_requests(batch_llm: FakeOpenAIServer, tmp_path: Path) -> None:
+    input_path = write_chunk(tmp_path, [1, 2, 3])
+    await LocalBatchExecutor().run(input_path, output_path_for(input_path))
+    assert batch_llm.requests == 3
+
+    # Simulate a crash after the first response was written
+    output_path = output_path_for(input_path)
+    write_jsonl(output_path, read_jsonl(output_path)[:1])
+    await LocalBatchExecutor().run(input_path, output_path)
+
+    assert batch_llm.requests == 5
+    result = collect_results(input_path)
+    assert sorted(result.classified) == [1, 2, 3]
+    assert result.classified[2].category == "bug"
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_stay_unclassified(batch_llm: FakeOpenAIServer, tmp_path: Path) -> None:
+    input_path = write_chunk(tmp_path, [1, 2])
+    batch_llm.enqueue(status=200)
+    batch_llm.enqueue(status=400)
+
+    with patch("src.data_pipeline.bulk_triage.db", MagicMock()) as db:
+        result = await execute_chunk(input_path, LocalBatchExecutor(concurrency=1))
+
+    assert list(result.classified) == [1]
+    assert result.failed == [2]
+    saved = db.session_scope.return_value.__enter__.return_value.add_all.call_args.args[0]
+    assert [row.issue_id for row in saved] == [1]
+    assert pending_chunks(tmp_path) == []
@@ -0,0 +1,111 @@
+from typing import Any
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from src.agents.checkpointer import open_checkpointer, run_graph
+from src.models.agent_models import ClassificationState, IssueState, Recommendation
+
+
+class FakeWorkflow:
+    """Guardrail -> search -> classification -> recommendation, recording which nodes ran."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.recommendation_fails = True
+        self.cached_titles: set[str] = set()
+
+    async def guardrail(self, state: IssueState) -> dict:
+        self.calls.append("guardrail")
+        return {"blocked": False}
+
+    async def search(self, state: IssueState) -> dict:
+        self.calls.append("search")
+        if state.title in self.cached_titles:
+            return {"cache_hit": True, "recommendation": Recommendation(summary="cached answer", references=[])}
+        return {"similar_issues": [{"issue_number": 1}]}
+
+    async def classification(self, state: IssueState) -> dict:
+        self.calls.append("classification")
+        return {"classification": ClassificationState(category="bug", priority="high", labels=[], assignee="")}
+
+    async def recommendation(self, state: IssueState) -> dict:
+        self.calls.append("recommendation")
+        if state.cache_hit:
+            return {}
+        if self.recommendation_fails:
+            return {"skipped_steps": ["recommendation"]}
+        return {"recommendation": Recommendation(summary=f"{state.title}, deadline {state.deadline}", references=[])}
+
+    def build(self) -> StateGraph:
+        builder = StateGraph(IssueState)
+        nodes: list[tuple[str, Any]] = [
+            ("Guardrail", self.guardrail),
+            ("Search", self.search),
+            ("Classification", self.classification),
+            ("Recommendation", self.recommendation),
+        ]
+        for name, node in nodes:
+            builder.add_node(name, node)
+        builder.set_entry_point("Guardrail")
+        for (name, _), (next_name, _) in zip(nodes, nodes[1:], strict=False):
+            builder.add_edge(name, next_name)
+        builder.add_edge("Recommendation", END)
+        return builder
+
+
+ISSUE = {"title": "Crash on fit", "body": "Traceback ..."}
+
+
+@pytest.mark.asyncio
+async def test_degraded_run_resumes_at_the_failed_node() -> None:
+    workflow = FakeWorkflow()
+    async with open_checkpointer("memory") as checkpointer:
+        graph = workflow.build().compile(checkpointer=checkpointer)
+
+        first = await run_graph(graph, {**ISSUE, "deadline": 1.0}, "issue-1")
+        assert first["skipped_steps"] == ["recommendation"]
+
+        workflow.calls.clear()
+        workflow.recommendation_fails = False
+        retry = await run_graph(graph, {**ISSUE, "deadline": 2.0}, "issue-1")
+
+    assert workflow.calls == ["recommendation"]
+    assert retry["recommendation"].summary == "Crash on fit, deadline 2.0"  # Resumed with the retry's deadline
+    assert not retry.get("skipped_steps")
+    assert retry["classification"].category == "bug"
+
+
+@pytest.mark.asyncio
+async def test_completed_thread_is_reused_and_new_issues_start_over() -> None:
+    workflow = FakeWorkflow()
+    workflow.recommendation_fails = False
+    workflow.cached_titles.add(ISSUE["title"])
+    async with open_checkpointer("memory") as checkpointer:
+        graph = workflow.build().compile(checkpointer=checkpointer)
+        first = await run_graph(graph, ISSUE, "issue-1")
+        assert first["cache_hit"]
+
+        workflow.calls.clear()
+        again = await run_graph(graph, ISSUE, "issue-1")
+        assert workflow.calls == []
+        assert again["recommendation"] == first["recommendation"]
+
+        other = await run_graph(graph, {**ISSUE, "title": "Another issue"}, "issue-1")
+        assert workflow.calls == ["guardrail", "search", "classification", "recommendation"]
+
+    # Nothing of the first issue's run is left in the second one's result
+    assert not other["cache_hit"]
+    assert other["recommendation"].summary == "Another issue, deadline None"
+
+
+@pytest.mark.asyncio
+async def test_without_thread_id_every_run_starts_over() -> None:
+    workflow = FakeWorkflow()
+    async with open_checkpointer("off") as checkpointer:
+        assert checkpointer is None
+        graph = workflow.build().compile(checkpointer=checkpointer)
+        await run_graph(graph, ISSUE, "issue-1")
+        await run_graph(graph, ISSUE, "issue-1")
+
+    assert workflow.calls.count("guardrail") == 2
@@ -2,7 +2,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.data_pipeline.ingest_embeddings import ingest_issues_to_qdrant_async
+from src.data_pipeline.ingest_embeddings import ingest_issues_to_qdrant_async, process_issue_comments
 
 
 @pytest.mark.asyncio
@@ -28,9 +28,29 @@ async def test_ingest_issues(mock_vectorstore_cls: MagicMock, mock_get_session:
     mock_vectorstore.dense_vectors = AsyncMock(return_value=[[0.1] * 10])
     mock_vectorstore.sparse_vectors = AsyncMock(return_value=[MagicMock(as_object=lambda: {"indices": [], "values": []})])
     mock_vectorstore.client.scroll = AsyncMock(return_value=([], None))
+    mock_vectorstore.upsert_issue_centroid = AsyncMock(return_value=True)
 
     # Run ingestion
     await ingest_issues_to_qdrant_async()
 
     # Assert that upsert was called at least once
     assert mock_vectorstore.client.upsert.await_count > 0
+
+
+@pytest.mark.asyncio
+@patch("src.data_pipeline.ingest_embeddings.db")
+async def test_centroid_failure_does_not_abort_the_issue(mock_db: MagicMock) -> None:
+    comment = MagicMock(body="HuberRegressor fails to converge", comment_id=7)
+    session = mock_db.session_scope.return_value.__enter__.return_value
+    session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [comment]
+
+    issue = MagicMock(id=1, number=123, repo="repo", owner="owner", digest="[bug, open] Crash.")
+    qdrant = MagicMock(collection_name="test_collection")
+    qdrant.client.scroll = AsyncMock(return_value=([], None))
+    qdrant.client.upsert = AsyncMock()
+    qdrant.dense_vectors = AsyncMock(return_value=[[0.1] * 10])
+    qdrant.sparse_vectors = AsyncMock(return_value=[{"indices": [1], "values": [1.0]}])
+    qdrant.upsert_issue_centroid = AsyncMock(side_effect=RuntimeError("issues collection unavailable"))
+
+    assert await process_issue_comments(qdrant, issue) == 1
+    qdrant.upsert_issue_centroid.assert_awaited_once()
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import pytest
+
+from src.models.agent_models import IssueState
+from src.utils.deadline import deadline_after, has_budget, skip_step, within_deadline
+
+
+def test_no_deadline_means_unlimited_budget() -> None:
+    state = IssueState(title="T", body="B", deadline=deadline_after(0))
+
+    assert state.deadline is None
+    assert has_budget(state, 1e9)
+
+
+def test_skip_step_appends_to_skipped_steps() -> None:
+    state = IssueState(title="T", body="B", deadline=time.time(), skipped_steps=["issue_search"])
+
+    update = skip_step(state, "recommendation", similar_issues=[])
+
+    assert update == {"similar_issues": [], "skipped_steps": ["issue_search", "recommendation"]}
+
+
+def test_deadline_is_not_serialized() -> None:
+    state = IssueState(title="T", body="B", deadline=deadline_after(5), skipped_steps=["recommendation"])
+
+    dumped = state.model_dump()
+    assert "deadline" not in dumped
+    assert dumped["skipped_steps"] == ["recommendation"]
+
+
+@pytest.mark.asyncio
+async def test_within_deadline_cancels_slow_calls() -> None:
+    state = IssueState(title="T", body="B", deadline=deadline_after(0.05))
+    assert not has_budget(state, 1.0)
+
+    with pytest.raises(TimeoutError):
+        await within_deadline(state, asyncio.sleep(1))
+    assert await within_deadline(IssueState(), asyncio.sleep(0, result="done")) == "done"
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import numpy as np
+
+from src.agents.fast_classifier import FastClassifier, category_from_flags, evaluate, query_embeddings
+from src.utils.prompts import PromptTemplates
+
+
+def make_dataset(n: int = 300, dim: int = 8, seed: int = 0) -> tuple[np.ndarray, list[str]]:
+    rng = np.random.default_rng(seed)
+    centers = {"bug": np.eye(dim)[0], "feature": np.eye(dim)[1], "no type": np.eye(dim)[2]}
+    labels = [list(centers)[i % 3] for i in range(n)]
+    x = np.stack([centers[label] for label in labels]) + rng.normal(scale=0.1, size=(n, dim))
+    return x.astype(np.float32), labels
+
+
+def test_category_from_flags() -> None:
+    assert category_from_flags(True, True) == "bug"
+    assert category_from_flags(False, True) == "feature"
+    assert category_from_flags(False, False) == "no type"
+
+
+def test_fit_separates_categories_and_roundtrips(tmp_path: Path) -> None:
+    x, y = make_dataset()
+    model = FastClassifier.fit(x, y)
+
+    report = evaluate(model, x, y, threshold=0.5)
+    assert report["accuracy"] > 0.95
+
+    model.save(str(tmp_path / "model.npz"))
+    loaded = FastClassifier.load(str(tmp_path / "model.npz"))
+    assert loaded.classes == model.classes
+    assert loaded.predict(x[0]) == model.predict(x[0])
+    assert loaded.version == model.version
+    assert FastClassifier.fit(x, y, epochs=10).version != model.version  # Retrained, so a new version
+
+
+def test_classify_falls_back_below_threshold() -> None:
+    x, y = make_dataset()
+    model = FastClassifier.fit(x, y)
+
+    confident = model.classify(x[0], threshold=0.5)
+    ambiguous = model.classify(np.ones(x.shape[1]), threshold=0.99)
+
+    assert confident is not None and confident.category == "bug"
+    assert confident.labels == ["bug"]
+    assert ambiguous is None
+
+
+def test_unpredicted_fields_stay_out_of_the_summary_prompt() -> None:
+    x, y = make_dataset()
+    classification = FastClassifier.fit(x, y).classify(x[0], threshold=0.5)
+
+    assert classification is not None
+    assert classification.priority is None and classification.assignee is None
+    prompt = PromptTemplates.summary_prompt(classification, [])
+    assert "- Category: bug" in prompt
+    assert "Priority" not in prompt and "Assignee" not in prompt
+
+
+def test_training_vectors_are_averaged_per_issue_like_query_embeddings() -> None:
+    vectors = np.array([[1.0, 0.0], [0.0, 1.0], [2.0, 2.0], [4.0, 0.0], [0.0, 4.0]], dtype=np.float32)
+
+    embedded = query_embeddings(vectors, [2, 1, 2])
+
+    np.testing.assert_allclose(embedded, [[0.5, 0.5], [2.0, 2.0], [2.0, 2.0]])
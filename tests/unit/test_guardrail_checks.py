@@ -0,0 +1,222 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.guardrails_models import GuardrailResult, ValidationSummary, load_guardrails_from_yaml
+from src.utils.config import settings
+from src.utils.guardrails import (
+    GuardPool,
+    GuardrailValidator,
+    StreamingOutputGuard,
+    VerdictCache,
+    first_failed_check,
+    text_windows,
+    to_guardrail_result,
+)
+
+
+async def check(delay: float, passed: bool, log: list[str] | None = None, name: str = "") -> GuardrailResult:
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        if log is not None:
+            log.append(name)
+        raise
+    summaries = [] if passed else [ValidationSummary(type=name, failure_reason=f"{name} failed")]
+    return GuardrailResult(validation_passed=passed, validation_summaries=summaries)
+
+
+@pytest.mark.asyncio
+async def test_checks_run_concurrently() -> None:
+    start = time.perf_counter()
+    failed = await first_failed_check({"a": check(0.1, True), "b": check(0.1, True), "c": check(0.1, True)})
+
+    assert failed is None
+    assert time.perf_counter() - start < 0.25
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_lower_priority_checks() -> None:
+    cancelled: list[str] = []
+    start = time.perf_counter()
+    failed = await first_failed_check(
+        {"jailbreak": check(0.0, False, name="jailbreak"), "toxicity": check(5, True, cancelled, "toxicity")}
+    )
+
+    assert failed is not None and failed[0] == "jailbreak"
+    assert time.perf_counter() - start < 1
+    await asyncio.sleep(0)
+    assert cancelled == ["toxicity"]
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_failure_wins_even_if_slower() -> None:
+    cancelled: list[str] = []
+    failed = await first_failed_check(
+        {
+            "jailbreak": check(0.05, False, name="jailbreak"),
+            "toxicity": check(0.0, False, name="toxicity"),
+            "secrets": check(5, True, cancelled, "secrets"),
+        }
+    )
+
+    assert failed is not None and failed[0] == "jailbreak"
+    assert cancelled == ["secrets"]
+
+
+@pytest.mark.asyncio
+async def test_guard_pool_reuses_prebuilt_guards() -> None:
+    pool = GuardPool("ToxicLanguage", validator=None, size=2)
+    prebuilt = list(pool.free)
+
+    async with pool.acquire() as first, pool.acquire() as second, pool.acquire() as extra:
+        assert {id(first), id(second)} == {id(guard) for guard in prebuilt}
+        assert extra not in prebuilt
+    assert len(pool.free) == 3
+
+    result = await pool.validate("clean text")
+    assert result.validation_passed and result.validated_output == "clean text"
+    assert len(pool.free) == 3
+
+
+def test_outcome_is_converted_to_guardrail_result() -> None:
+    span = SimpleNamespace(start=0, end=5, reason="toxic")
+    summary = SimpleNamespace(failure_reason="Toxic language", validator_name="ToxicLanguage", error_spans=[span])
+    outcome = SimpleNamespace(validation_passed=False, validated_output=None, validation_summaries=[summary])
+
+    result = to_guardrail_result("ToxicLanguage", outcome)
+
+    assert not result.validation_passed
+    assert result.validation_summaries[0].failure_reason == "Toxic language"
+    assert result.validation_summaries[0].error_spans[0].reason == "toxic"
+
+
+def test_verdict_cache_hits_and_lru_eviction() -> None:
+    cache = VerdictCache(max_entries=2, ttl_seconds=60)
+    keys = [VerdictCache.key("secrets", "cfg", text) for text in ("a", "b", "c")]
+    for key in keys[:2]:
+        cache.put(key, GuardrailResult(validation_passed=True, validation_summaries=[]))
+
+    assert cache.get(keys[0]) is not None  # "a" becomes the most recently used
+    cache.put(keys[2], GuardrailResult(validation_passed=True, validation_summaries=[]))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.hit_rate == 0.75
+
+
+def test_verdict_cache_expires_entries() -> None:
+    cache = VerdictCache(max_entries=10, ttl_seconds=0)
+    key = VerdictCache.key("secrets", "cfg", "text")
+    cache.put(key, GuardrailResult(validation_passed=True, validation_summaries=[]))
+    time.sleep(0.01)
+
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+GUARDRAILS_YAML = """
+jailbreak: {{threshold: 0.8, on_fail: filter}}
+toxicity: {{threshold: 0.5, validation_method: full, on_fail: filter}}
+secrets: {{engine: scanner, entropy_threshold: {entropy}, on_fail: filter}}
+"""
+
+
+@pytest.mark.asyncio
+async def test_validator_caches_verdicts_until_config_changes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "GUARDRAIL_CONFIG_CHECK_SECONDS", 0)
+    config_path = tmp_path / "guardrails.yaml"
+    config_path.write_text(GUARDRAILS_YAML.format(entropy=4.5))
+    validator = GuardrailValidator(
+        load_guardrails_from_yaml(str(config_path)), pool_size=1, config_path=str(config_path), cache=VerdictCache()
+    )
+    text = 'token = "Q8vZ2mK7pX4rT9wB3nL6yH1cF5jD0sGa"'
+
+    first = await validator.check_secrets(text)
+    second = await validator.check_secrets(text)
+    assert not first.validation_passed and second == first
+    assert (validator.cache.hits, validator.cache.misses) == (1, 1)
+
+    jailbreak = validator.jailbreak
+    config_path.write_text(GUARDRAILS_YAML.format(entropy=9.0))
+    os.utime(config_path, (time.time() + 10, time.time() + 10))
+
+    await validator.check_secrets('value = "Q8vZ2mK7pX4rT9wB3nL6yH1cF5jD0sGa"')
+    assert validator.secret_scanner is not None and validator.secret_scanner.entropy_threshold == 9.0
+    assert validator.jailbreak is jailbreak  # Unchanged sections keep their guards
+    await validator.check_secrets(text)
+    assert validator.cache.misses == 3
+
+
+def test_text_windows_overlap_and_cover_the_text() -> None:
+    text = " ".join(f"word{i}" for i in range(2000))
+    windows = list(text_windows(text, size=1000, overlap=100))
+
+    assert all(len(window) <= 1000 for _, window in windows)
+    assert all(text[offset : offset + len(window)] == window for offset, window in windows)
+    for (offset, window), (next_offset, _) in zip(windows, windows[1:], strict=False):
+        assert offset < next_offset <= offset + len(window) - 50
+        assert window.endswith(" ")  # Cut at whitespace, not mid-word
+    assert windows[-1][0] + len(windows[-1][1]) == len(text)
+
+
+@pytest.mark.asyncio
+async def test_windowed_check_maps_spans_and_stops_at_first_failure(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "GUARDRAIL_WINDOW_CHARS", 1000)
+    monkeypatch.setattr(settings, "GUARDRAIL_WINDOW_OVERLAP_CHARS", 300)
+    monkeypatch.setattr(settings, "GUARDRAIL_WINDOW_CONCURRENCY", 2)
+    validator = GuardrailValidator(load_guardrails_from_yaml(settings.GUARDRAILS_CONFIG), pool_size=1, cache=VerdictCache())
+    secret = "ghp_" + "a1B2c3D4e5" * 4
+    text = "log line\n" * 500 + f"token {secret} end\n" + "log line\n" * 100_000
+
+    checked: list[str] = []
+    scan = validator.scan_secrets
+
+    async def counting_scan(window: str) -> GuardrailResult:
+        checked.append(window)
+        return await scan(window)
+
+    monkeypatch.setattr(validator, "scan_secrets", counting_scan)
+    result = await validator.check_secrets(text)
+
+    assert not result.validation_passed
+    spans = result.validation_summaries[0].error_spans or []
+    assert [text[span.start : span.end] for span in spans] == [secret]
+    assert len(checked) <= 8  # Windows past the failing batch are never scanned
+
+
+@pytest.mark.asyncio
+async def test_streaming_guard_fails_while_text_streams() -> None:
+    validator = GuardrailValidator(load_guardrails_from_yaml(settings.GUARDRAILS_CONFIG), pool_size=1, cache=VerdictCache())
+    output_guard = StreamingOutputGuard(validator, min_chars=40)
+    secret = "ghp_" + "a1B2c3D4e5" * 4
+    text = "Upgrade the package to fix the crash. " * 3 + f"Use the token {secret} to test. " + "More advice. " * 20
+
+    fed = 0
+    for i in range(0, len(text), 7):
+        output_guard.feed(text[i : i + 7])
+        fed = i + 7
+        await asyncio.sleep(0)  # Let the window checks run, as they would between streamed chunks
+        if output_guard.failed:
+            break
+
+    assert fed < len(text)
+    failed = await output_guard.finish()
+    assert failed is not None and failed[0] == "secrets"
+    spans = failed[1].validation_summaries[0].error_spans or []
+    assert [text[span.start : span.end] for span in spans] == [secret]
+
+
+@pytest.mark.asyncio
+async def test_streaming_guard_checks_the_tail_on_finish() -> None:
+    validator = GuardrailValidator(load_guardrails_from_yaml(settings.GUARDRAILS_CONFIG), pool_size=1, cache=VerdictCache())
+    output_guard = StreamingOutputGuard(validator, min_chars=1000)
+    output_guard.feed("Short answer without any sentence boundary")
+
+    assert not output_guard.tasks
+    assert await output_guard.finish() is None
+    assert output_guard.checked_until == len(output_guard.text)
@@ -0,0 +1,57 @@
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from qdrant_client.models import Batch
+
+from src.data_pipeline.issue_digest import build_issue_digest, set_digest_payload
+from src.models.db_models import Comment, Issue
+from src.utils.prompt_builder import _ApproximateEncoding, count_tokens
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+
+@pytest.fixture(autouse=True)
+def approximate_tokenizer() -> Iterator[None]:
+    with patch("src.utils.prompt_builder.get_encoding", return_value=_ApproximateEncoding()):
+        yield
+
+
+def test_digest_is_compact_and_skips_template_noise() -> None:
+    issue = Issue(
+        number=7,
+        title="HuberRegressor diverges on sparse input",
+        body="### Describe the bug\n<!-- Please fill in -->\nFitting fails to converge.\n```\n"
+        + "trace line\n" * 400
+        + "```",
+        state="closed",
+        is_bug=True,
+        is_feature=False,
+    )
+    comments = [Comment(body="Can reproduce."), Comment(body="Fixed in #12 by scaling the input. " * 50), Comment(body="")]
+
+    digest = build_issue_digest(issue, comments)
+
+    assert digest.startswith("[bug, closed] HuberRegressor diverges on sparse input. Problem: Fitting fails to converge.")
+    assert "trace line" not in digest and "Describe the bug" not in digest
+    assert "Resolution: Fixed in #12" in digest
+    assert count_tokens(digest) < 120
+
+
+@pytest.mark.asyncio
+async def test_digest_reaches_chunks_and_issue_centroid(local_qdrant: None) -> None:
+    store = AsyncQdrantVectorStore()
+    await store.create_collection()
+    dense = await store.dense_vectors(["HuberRegressor fails to converge"])
+    sparse = await store.sparse_vectors(["HuberRegressor fails to converge"])
+    await store.client.upsert(
+        collection_name=store.collection_name,
+        points=Batch(ids=[1], payloads=[{"issue_number": 7}], vectors={"dense": dense, "miniCOIL": sparse}),
+    )
+    assert await store.upsert_issue_centroid(7, {"issue_number": 7, "digest": ""})
+
+    await set_digest_payload(store, 7, "[bug, closed] HuberRegressor diverges.")
+
+    chunk = (await store.search_similar_issues("HuberRegressor fails to converge"))[0]
+    centroid = (await store.client.query_points(store.issue_collection_name, query=dense[0], using="dense")).points[0]
+    assert chunk.payload is not None and chunk.payload["digest"] == "[bug, closed] HuberRegressor diverges."
+    assert centroid.payload is not None and centroid.payload["digest"] == "[bug, closed] HuberRegressor diverges."
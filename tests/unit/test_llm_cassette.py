@@ -0,0 +1,70 @@
+import time
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.agents.llm_cassette import CassetteLLM, CassetteMissError, LLMCassette
+
+
+class FakeLLM:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def ainvoke(self, prompt: Any, **kwargs: Any) -> AIMessage:
+        self.calls += 1
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": "ResponseFormatter", "args": {"category": "bug", "priority": "high"}, "id": "call_1"}],
+        )
+
+
+@pytest.mark.asyncio
+async def test_recorded_responses_replay_with_tool_calls(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    llm = FakeLLM()
+    recorder = CassetteLLM(llm, "classification", LLMCassette(path), "record")
+    recorded = await recorder.ainvoke("Classify this issue")
+
+    # A fresh cassette instance reads the file back, as a new process would
+    replayer = CassetteLLM(None, "classification", LLMCassette(path), "replay", replay_latency=0.05)
+    start = time.perf_counter()
+    replayed = await replayer.ainvoke("Classify this issue")
+
+    assert time.perf_counter() - start >= 0.05
+    assert llm.calls == 1
+    assert isinstance(replayed, AIMessage)
+    assert replayed.tool_calls[0]["args"] == recorded.tool_calls[0]["args"]
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_never_reaches_the_llm(tmp_path: Path) -> None:
+    llm = FakeLLM()
+    cassette = LLMCassette(tmp_path / "cassette.jsonl")
+    await CassetteLLM(llm, "classification", cassette, "record").ainvoke("Classify this issue")
+
+    replayer = CassetteLLM(llm, "recommendation", cassette, "replay", replay_latency=0)
+    with pytest.raises(CassetteMissError):
+        await replayer.ainvoke("Classify this issue")  # same prompt, different call
+    assert llm.calls == 1
+
+
+class FakeStreamingLLM:
+    async def astream(self, prompt: Any, **kwargs: Any) -> AsyncGenerator[AIMessageChunk]:
+        for part in ("Upgrade ", "the ", "package."):
+            yield AIMessageChunk(content=part)
+
+
+@pytest.mark.asyncio
+async def test_recorded_stream_replays_as_one_message(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    recorder = CassetteLLM(FakeStreamingLLM(), "recommendation", LLMCassette(path), "record")
+    streamed = [chunk.content async for chunk in recorder.astream("Recommend a fix")]
+
+    replayer = CassetteLLM(None, "recommendation", LLMCassette(path), "replay", replay_latency=0)
+    replayed = [chunk.content async for chunk in replayer.astream("Recommend a fix")]
+
+    assert streamed == ["Upgrade ", "the ", "package."]
+    assert replayed == ["Upgrade the package."]
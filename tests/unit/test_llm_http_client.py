@@ -0,0 +1,61 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from langchain_openai import ChatOpenAI
+
+from src.agents.http_client import (
+    close_llm_http_client,
+    get_llm_http_client,
+    llm_max_connections,
+    prewarm_llm_connections,
+)
+from src.utils.config import settings
+from tests.unit.conftest import FakeOpenAIServer
+
+
+@pytest_asyncio.fixture
+async def llm_settings(fake_openai: FakeOpenAIServer) -> AsyncGenerator[FakeOpenAIServer, None]:
+    with (
+        patch.object(settings, "OPENAI_BASE_URL", fake_openai.base_url),
+        patch.object(settings, "LLM_HTTP2", False),
+    ):
+        yield fake_openai
+        await close_llm_http_client()
+
+
+def test_pool_is_sized_from_admission_limit() -> None:
+    with patch.object(settings, "MAX_CONCURRENT_ISSUES", 8), patch.object(settings, "LLM_MAX_CONNECTIONS", 0):
+        with patch.object(settings, "LLM_HEDGING_ENABLED", False):
+            assert llm_max_connections() == 8
+        with patch.object(settings, "LLM_HEDGING_ENABLED", True):
+            assert llm_max_connections() == 16
+
+
+@pytest.mark.asyncio
+async def test_prewarmed_connections_are_reused_by_chat_calls(llm_settings: FakeOpenAIServer) -> None:
+    assert await prewarm_llm_connections(3) == 3
+    assert llm_settings.connections == 3
+
+    chat_model = ChatOpenAI(
+        model="gpt-4o-mini",
+        api_key="test",
+        base_url=settings.OPENAI_BASE_URL,
+        max_retries=0,
+        http_async_client=get_llm_http_client(),
+    )
+    responses = await asyncio.gather(*(chat_model.ainvoke("hello") for _ in range(3)))
+
+    assert [r.content for r in responses] == ["ok"] * 3
+    assert llm_settings.connections == 3  # no new handshakes on the hot path
+
+
+@pytest.mark.asyncio
+async def test_shared_client_is_rebuilt_after_close(llm_settings: FakeOpenAIServer) -> None:
+    first = get_llm_http_client()
+    assert get_llm_http_client() is first
+
+    await close_llm_http_client()
+    assert get_llm_http_client() is not first
@@ -0,0 +1,138 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.models.agent_models import ClassificationState, IssueState
+from src.utils import node_cache
+from src.utils.config import settings
+from src.utils.node_cache import (
+    DiskNodeCache,
+    MemoryNodeCache,
+    NodeCache,
+    memoize_node,
+    refreshed_every,
+    settings_version,
+)
+
+UPDATE = {"classification": ClassificationState(category="bug", priority="high", labels=["crash"], assignee="")}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "disk"])
+async def test_cache_round_trip_and_eviction(backend: str, tmp_path: Path) -> None:
+    cache: NodeCache = MemoryNodeCache(max_entries=2) if backend == "memory" else DiskNodeCache(tmp_path / "c.sqlite", 2)
+    await cache.put("a", UPDATE)
+    time.sleep(0.01)
+    await cache.put("b", {"similar_issues": []})
+    time.sleep(0.01)
+    await cache.put("c", {"similar_issues": []})
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") == {"similar_issues": []}
+
+    await cache.put("a", UPDATE)
+    cached = await cache.get("a")
+    assert cached == UPDATE and cached is not UPDATE
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_is_shared_and_expires(tmp_path: Path) -> None:
+    await DiskNodeCache(tmp_path / "c.sqlite").put("a", UPDATE)
+
+    assert await DiskNodeCache(tmp_path / "c.sqlite").get("a") == UPDATE
+    assert await DiskNodeCache(tmp_path / "c.sqlite", ttl_seconds=0).get("a") is None
+
+
+class CountingNode:
+    def __init__(self, update: dict) -> None:
+        self.update = update
+        self.calls = 0
+
+    async def __call__(self, state: IssueState) -> dict:
+        self.calls += 1
+        return self.update
+
+
+@pytest.fixture
+def memory_cache(monkeypatch: pytest.MonkeyPatch) -> MemoryNodeCache:
+    cache = MemoryNodeCache()
+    monkeypatch.setattr(node_cache, "node_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_memoized_node_runs_once_per_input_and_version(memory_cache: MemoryNodeCache) -> None:
+    version = "v1"
+
+    async def current_version() -> str:
+        return version
+
+    node = CountingNode(UPDATE)
+    memoized = memoize_node("classification", fields=("title", "body"), version=current_version)(node)
+
+    first = await memoized(IssueState(title="Crash", body="Traceback", deadline=1.0))
+    second = await memoized(IssueState(title="Crash", body="Traceback", deadline=2.0))  # Unkeyed fields differ
+    assert node.calls == 1 and first == second == UPDATE
+
+    await memoized(IssueState(title="Crash", body="Another traceback"))
+    version = "v2"
+    await memoized(IssueState(title="Crash", body="Traceback"))
+    assert node.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_settings_in_the_version_separate_configs(
+    memory_cache: MemoryNodeCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def version() -> str:
+        return settings_version("MULTI_VECTOR_QUERY", "TWO_STAGE_SEARCH")
+
+    node = CountingNode(UPDATE)
+    memoized = memoize_node("issue_search", fields=("title", "body"), version=version)(node)
+
+    monkeypatch.setattr(settings, "MULTI_VECTOR_QUERY", False)
+    await memoized(IssueState(title="Crash", body="Traceback"))
+    monkeypatch.setattr(settings, "MULTI_VECTOR_QUERY", True)
+    await memoized(IssueState(title="Crash", body="Traceback"))
+    await memoized(IssueState(title="Crash", body="Traceback"))
+
+    assert node.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_degraded_updates_are_not_cached(memory_cache: MemoryNodeCache) -> None:
+    node = CountingNode({"classification": None, "skipped_steps": ["classification"]})
+    memoized = memoize_node("classification", fields=("title",))(node)
+
+    await memoized(IssueState(title="Crash"))
+    await memoized(IssueState(title="Crash"))
+
+    assert node.calls == 2
+    assert len(memory_cache.entries) == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_node_is_not_memoized(memory_cache: MemoryNodeCache) -> None:
+    node = CountingNode(UPDATE)
+    memoized = memoize_node("classification", fields=("title",), enabled=lambda: False)(node)
+
+    await memoized(IssueState(title="Crash"))
+    await memoized(IssueState(title="Crash"))
+
+    assert node.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_version_is_refreshed_periodically() -> None:
+    lookups: list[int] = []
+
+    async def version() -> str:
+        lookups.append(1)
+        return f"v{len(lookups)}"
+
+    current = refreshed_every(60, version)
+    assert [await current(), await current()] == ["v1", "v1"]
+
+    current = refreshed_every(0, version)
+    assert [await current(), await current()] == ["v2", "v3"]
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from qdrant_client.models import Batch
+
+from src.vectorstore.numpy_store import NumpyVectorStore, export_from_qdrant
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+CHUNKS = [
+    "CalibratedClassifierCV warns about unique classes",
+    "HuberRegressor fails to converge on sparse input",
+    "HuberRegressor epsilon parameter documentation",
+    "Documentation typo in the plotting tutorial",
+    "Sparse input crashes the plotting tutorial",
+]
+
+
+@pytest_asyncio.fixture
+async def exported_index(local_qdrant: None, tmp_path: Path) -> tuple[AsyncQdrantVectorStore, NumpyVectorStore]:
+    qdrant = AsyncQdrantVectorStore()
+    await qdrant.create_collection()
+    await qdrant.client.upsert(
+        collection_name=qdrant.collection_name,
+        points=Batch(
+            ids=list(range(1, len(CHUNKS) + 1)),
+            payloads=[{"issue_number": i, "chunk_text": text} for i, text in enumerate(CHUNKS, start=1)],
+            vectors={"dense": await qdrant.dense_vectors(CHUNKS), "miniCOIL": await qdrant.sparse_vectors(CHUNKS)},
+        ),
+    )
+
+    assert await export_from_qdrant(qdrant, str(tmp_path)) == len(CHUNKS)
+    return qdrant, NumpyVectorStore(str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_export_writes_float16_memmap(exported_index: tuple[AsyncQdrantVectorStore, NumpyVectorStore]) -> None:
+    _, store = exported_index
+
+    assert isinstance(store.dense, np.memmap)
+    assert store.dense.dtype == np.float16
+    assert store.dense.shape == (len(CHUNKS), store.embedding_size)
+    assert store.indptr[-1] == len(store.indices) == len(store.data)
+
+
+@pytest.mark.asyncio
+async def test_numpy_backend_matches_qdrant_ranking(
+    exported_index: tuple[AsyncQdrantVectorStore, NumpyVectorStore],
+) -> None:
+    qdrant, store = exported_index
+
+    # The last query duplicates a chunk so the dense prefetch clears its 0.9 threshold too
+    for query in ["HuberRegressor sparse input", "unique classes warning", CHUNKS[3]]:
+        expected = await qdrant.search_similar_issues(query)
+        actual = await store.search_similar_issues(query)
+
+        # Ties may come back in a different order, so compare the scores and the id set
+        assert [p.score for p in actual] == pytest.approx([p.score for p in expected])
+        assert {p.id for p in actual} == {p.id for p in expected}
+
+
+@pytest.mark.asyncio
+async def test_numpy_backend_matches_qdrant_multi_vector_fusion(
+    exported_index: tuple[AsyncQdrantVectorStore, NumpyVectorStore],
+) -> None:
+    qdrant, store = exported_index
+    query_texts = [
+        "HuberRegressor epsilon parameter",
+        "Sparse input crashes the plotting tutorial",
+        "CalibratedClassifierCV",
+    ]
+
+    expected = await qdrant.search_similar_issues_multi(query_texts)
+    actual = await store.search_similar_issues_multi(query_texts)
+
+    assert [p.score for p in actual] == pytest.approx([p.score for p in expected])
+    assert {p.id for p in actual} == {p.id for p in expected}
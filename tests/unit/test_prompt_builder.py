@@ -0,0 +1,78 @@
+from collections.abc import Iterator
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+
+from src.models.agent_models import SimilarIssue
+from src.utils.prompt_builder import (
+    _ApproximateEncoding,
+    build_classification_prompt,
+    count_tokens,
+    describe_references,
+    summarize_similar_issues,
+)
+from src.utils.prompts import PromptTemplates
+
+SIMILAR = [
+    SimilarIssue(
+        issue_number=7,
+        title="HuberRegressor diverges",
+        url="https://github.com/o/r/issues/7",
+        chunk_text="word " * 500,
+        comment_id=None,
+        is_bug=True,
+    ),
+    SimilarIssue(issue_number=7, title="HuberRegressor diverges", chunk_text="another chunk of issue 7"),
+    SimilarIssue(issue_number=9, title="Plotting typo", chunk_text="typo", is_feature=False),
+]
+
+
+@pytest.fixture(autouse=True)
+def approximate_tokenizer() -> Iterator[None]:
+    # The tiktoken BPE files are downloaded on first use; keep the tests offline
+    with patch("src.utils.prompt_builder.get_encoding", return_value=_ApproximateEncoding()):
+        yield
+
+
+def test_similar_issues_are_deduplicated_and_compact() -> None:
+    lines = summarize_similar_issues(SIMILAR, snippet_tokens=10)
+
+    assert len(lines) == 2
+    assert lines[0].startswith("- #7 [bug] HuberRegressor diverges: ")
+    assert lines[0].endswith("[...]")
+    assert "None" not in lines[0] and "https://" not in lines[0]
+    assert lines[1] == "- #9 Plotting typo: typo"
+
+
+def test_digests_replace_raw_chunks() -> None:
+    digest = "[bug, closed] HuberRegressor diverges. Resolution: fixed by scaling the input."
+    similar = [replace(SIMILAR[0], digest=digest), SIMILAR[2]]
+
+    assert summarize_similar_issues(similar) == [f"- #7: {digest}", "- #9 Plotting typo: typo"]
+    assert describe_references(similar, ["https://github.com/o/r/issues/7", "https://github.com/o/r/issues/8"]) == [
+        f"https://github.com/o/r/issues/7: {digest}",
+        "https://github.com/o/r/issues/8",
+    ]
+
+
+def test_prompt_puts_static_instructions_first() -> None:
+    prompt = build_classification_prompt("Title", "Body", SIMILAR)
+
+    assert prompt.text.startswith(PromptTemplates.classification_instructions())
+
+
+def test_prompt_respects_token_budget() -> None:
+    prompt = build_classification_prompt("Title", "x" * 40000, SIMILAR, max_tokens=1200)
+
+    assert prompt.body_truncated
+    assert prompt.tokens <= 1200
+    assert prompt.tokens == count_tokens(prompt.text)
+
+
+def test_similar_issues_yield_to_the_body_under_a_tight_budget() -> None:
+    static = count_tokens(build_classification_prompt("Title", "", None).text)
+    prompt = build_classification_prompt("Title", "x" * 40000, SIMILAR, max_tokens=static + 520)
+
+    assert prompt.similar_issues_used == 0
+    assert prompt.tokens <= static + 520
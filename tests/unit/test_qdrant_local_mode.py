@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+import pytest
+from qdrant_client.models import Batch
+
+from src.utils.config import settings
+from src.vectorstore.payload_builder import build_query_texts
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+ISSUES = [
+    (1, "CalibratedClassifierCV warns about unique classes"),
+    (2, "HuberRegressor fails to converge on sparse input"),
+    (3, "Documentation typo in the plotting tutorial"),
+]
+
+
+async def populate(store: AsyncQdrantVectorStore) -> None:
+    texts = [text for _, text in ISSUES]
+    dense = await store.dense_vectors(texts)
+    sparse = await store.sparse_vectors(texts)
+    await store.client.upsert(
+        collection_name=store.collection_name,
+        points=Batch(
+            ids=[number for number, _ in ISSUES],
+            payloads=[{"issue_number": number, "chunk_text": text} for number, text in ISSUES],
+            vectors={"dense": dense, "miniCOIL": sparse},
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_mode_runs_the_hybrid_query(local_qdrant: None) -> None:
+    store = AsyncQdrantVectorStore()
+    await store.create_collection()
+    await store.create_indexes()
+    await populate(store)
+
+    results = await store.search_similar_issues("HuberRegressor fails to converge on sparse input")
+
+    assert results
+    assert results[0].payload is not None
+    assert results[0].payload["issue_number"] == 2
+
+
+@pytest.mark.asyncio
+async def test_local_clients_are_shared_across_stores(local_qdrant: None) -> None:
+    first = AsyncQdrantVectorStore()
+    await first.create_collection()
+
+    second = AsyncQdrantVectorStore()
+    assert second.client is first.client
+    assert await second.client.collection_exists(first.collection_name)
+
+
+@pytest.mark.asyncio
+async def test_multi_vector_query_fuses_title_and_body_chunks(local_qdrant: None) -> None:
+    store = AsyncQdrantVectorStore()
+    await store.create_collection()
+    await populate(store)
+
+    # The body chunk alone would only match issue 3; the title pulls issue 2 into the fused results
+    query_texts = build_query_texts("HuberRegressor fails to converge", "typo in the plotting tutorial " * 3, max_chunks=2)
+    results = await store.search_similar_issues_multi(query_texts)
+
+    assert len(query_texts) >= 2
+    numbers = {point.payload["issue_number"] for point in results if point.payload}
+    assert {2, 3} <= numbers
+
+
+def test_build_query_texts_caps_body_chunks() -> None:
+    texts = build_query_texts("Title", "word " * 5000, max_chunks=3)
+
+    assert texts[0] == "Title"
+    assert len(texts) == 4
+
+
+def test_build_query_texts_reads_the_chunk_cap_at_call_time() -> None:
+    with patch.object(settings, "MAX_QUERY_CHUNKS", 2):
+        assert len(build_query_texts("Title", "word " * 5000)) == 3
+
+
+@pytest.mark.asyncio
+async def test_two_stage_search_restricts_chunks_to_coarse_issues(local_qdrant: None) -> None:
+    store = AsyncQdrantVectorStore()
+    await store.create_collection()
+    await populate(store)
+    for number, text in ISSUES:
+        assert await store.upsert_issue_centroid(number, {"issue_number": number, "title": text})
+
+    with (
+        patch.object(settings, "TWO_STAGE_SEARCH", True),
+        patch.object(settings, "COARSE_TOP_ISSUES", 1),
+    ):
+        results = await store.search_similar_issues("HuberRegressor fails to converge on sparse input")
+
+    assert [point.payload["issue_number"] for point in results if point.payload] == [2]
@@ -0,0 +1,175 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from qdrant_client.models import CreateAliasOperation, DeleteAliasOperation
+
+from src.vectorstore.reindex import migrate, reindex, rollback
+
+
+def make_store(alias_target: str | None, versions: list[str], count: int) -> MagicMock:
+    store = MagicMock()
+    store.alias_name = "dev_github_issues_embeddings"
+    store.collection_name = "dev_github_issues_embeddings_v20250101000000"
+    store.create_collection = AsyncMock()
+    store.create_indexes = AsyncMock()
+    store.enable_indexing = AsyncMock()
+    store.wait_until_green = AsyncMock()
+    store.count_points = AsyncMock(return_value=count)
+    store.get_alias_target = AsyncMock(return_value=alias_target)
+    store.list_versions = AsyncMock(return_value=versions)
+    store.switch_alias = AsyncMock(return_value=alias_target)
+    store.legacy_collections = AsyncMock(return_value=[])
+    store.client.delete_collection = AsyncMock()
+    return store
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.reindex.ingest_issues_to_qdrant_async", new_callable=AsyncMock)
+@patch("src.vectorstore.reindex.AsyncQdrantVectorStore")
+async def test_reindex_swaps_alias_after_verifying_counts(mock_store_cls: MagicMock, mock_ingest: AsyncMock) -> None:
+    store = make_store("old_v1", ["old_v0", "old_v1", "new_v2"], count=100)
+    mock_store_cls.return_value = store
+    mock_ingest.return_value = 100
+
+    await reindex()
+
+    store.create_collection.assert_awaited_once_with(deferred_indexing=True)
+    store.enable_indexing.assert_awaited_once()
+    store.switch_alias.assert_awaited_once_with(store.collection_name)
+    # Only the oldest version (and its issue-level collection) is pruned; the rollback target is kept
+    deleted = [call.args[0] for call in store.client.delete_collection.await_args_list]
+    assert deleted == ["old_v0", "old_v0_issues"]
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.reindex.ingest_issues_to_qdrant_async", new_callable=AsyncMock)
+@patch("src.vectorstore.reindex.AsyncQdrantVectorStore")
+async def test_reindex_refuses_on_count_mismatch(mock_store_cls: MagicMock, mock_ingest: AsyncMock) -> None:
+    store = make_store("old_v1", [], count=90)
+    mock_store_cls.return_value = store
+    mock_ingest.return_value = 100
+
+    with pytest.raises(RuntimeError):
+        await reindex()
+
+    store.switch_alias.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.reindex.AsyncQdrantVectorStore")
+async def test_rollback_points_alias_to_previous_version(mock_store_cls: MagicMock) -> None:
+    store = make_store("v3", ["v1", "v2", "v3"], count=0)
+    mock_store_cls.return_value = store
+
+    assert await rollback() == "v2"
+    store.switch_alias.assert_awaited_once_with("v2")
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.base.SparseTextEmbedding")
+@patch("src.vectorstore.base.TextEmbedding")
+@patch("src.vectorstore.qdrant_store.AsyncQdrantClient")
+async def test_switch_alias_is_a_single_atomic_update(
+    mock_client_cls: MagicMock, mock_dense: MagicMock, mock_sparse: MagicMock
+) -> None:
+    from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+    client = mock_client_cls.return_value
+    aliases = [
+        MagicMock(alias_name="dev_github_issues_embeddings", collection_name="old"),
+        MagicMock(alias_name="dev_github_issues_embeddings_issues", collection_name="old_issues"),
+    ]
+    client.get_aliases = AsyncMock(return_value=MagicMock(aliases=aliases))
+    client.update_collection_aliases = AsyncMock()
+
+    store = AsyncQdrantVectorStore()
+    store.alias_name = "dev_github_issues_embeddings"
+    previous = await store.switch_alias("new")
+
+    assert previous == "old"
+    client.update_collection_aliases.assert_awaited_once()
+    operations = client.update_collection_aliases.await_args.kwargs["change_aliases_operations"]
+    assert [type(op) for op in operations] == [
+        DeleteAliasOperation,
+        CreateAliasOperation,
+        DeleteAliasOperation,
+        CreateAliasOperation,
+    ]
+    assert operations[1].create_alias.collection_name == "new"
+    assert operations[3].create_alias.collection_name == "new_issues"
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.reindex.ingest_issues_to_qdrant_async", new_callable=AsyncMock)
+@patch("src.vectorstore.reindex.AsyncQdrantVectorStore")
+async def test_reindex_refuses_to_replace_a_legacy_collection(mock_store_cls: MagicMock, mock_ingest: AsyncMock) -> None:
+    store = make_store(None, [], count=100)
+    store.legacy_collections = AsyncMock(return_value=[store.alias_name])
+    mock_store_cls.return_value = store
+
+    with pytest.raises(RuntimeError, match="migrate"):
+        await reindex()
+
+    mock_ingest.assert_not_awaited()
+    store.switch_alias.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.reindex.copy_points", new_callable=AsyncMock)
+@patch("src.vectorstore.reindex.AsyncQdrantVectorStore")
+async def test_migrate_copies_legacy_data_before_swapping(mock_store_cls: MagicMock, mock_copy: AsyncMock) -> None:
+    live = make_store(None, [], count=100)
+    live.legacy_collections = AsyncMock(return_value=[live.alias_name, f"{live.alias_name}_issues"])
+    target = make_store(None, [], count=100)
+    target.issue_collection_name = f"{target.collection_name}_issues"
+    mock_store_cls.return_value = target
+    mock_copy.return_value = 100
+
+    assert await migrate(live) == target.collection_name
+
+    copies = [call.args[1:] for call in mock_copy.await_args_list]
+    assert copies == [
+        (live.alias_name, target.collection_name),
+        (f"{live.alias_name}_issues", target.issue_collection_name),
+    ]
+    live.switch_alias.assert_awaited_once_with(target.collection_name, replace_legacy=True)
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.reindex.copy_points", new_callable=AsyncMock)
+@patch("src.vectorstore.reindex.AsyncQdrantVectorStore")
+async def test_incomplete_migration_keeps_the_legacy_collection(mock_store_cls: MagicMock, mock_copy: AsyncMock) -> None:
+    live = make_store(None, [], count=100)
+    live.legacy_collections = AsyncMock(return_value=[live.alias_name])
+    mock_store_cls.return_value = make_store(None, [], count=100)
+    mock_copy.return_value = 90
+
+    with pytest.raises(RuntimeError):
+        await migrate(live)
+
+    live.switch_alias.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("src.vectorstore.base.SparseTextEmbedding")
+@patch("src.vectorstore.base.TextEmbedding")
+@patch("src.vectorstore.qdrant_store.AsyncQdrantClient")
+async def test_switch_alias_never_drops_legacy_data_on_its_own(
+    mock_client_cls: MagicMock, mock_dense: MagicMock, mock_sparse: MagicMock
+) -> None:
+    from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+    client = mock_client_cls.return_value
+    client.get_aliases = AsyncMock(return_value=MagicMock(aliases=[]))
+    client.collection_exists = AsyncMock(return_value=True)
+    client.delete_collection = AsyncMock()
+    client.update_collection_aliases = AsyncMock()
+
+    store = AsyncQdrantVectorStore()
+    with pytest.raises(RuntimeError, match="migrate"):
+        await store.switch_alias("new")
+    client.delete_collection.assert_not_awaited()
+
+    await store.switch_alias("new", replace_legacy=True)
+    assert client.delete_collection.await_count == 2
+    client.update_collection_aliases.assert_awaited_once()
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from src.agents import agents
+from src.models.agent_models import ClassificationState, IssueState
+
+
+@pytest.fixture
+def skip_reasons(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    reasons: list[str] = []
+    skip_step = agents.skip_step
+
+    def recording_skip_step(state: IssueState, step: str, reason: str = "deadline", **update: object) -> dict:
+        reasons.append(reason)
+        return skip_step(state, step, reason, **update)
+
+    monkeypatch.setattr(agents, "skip_step", recording_skip_step)
+    return reasons
+
+
+@pytest.mark.asyncio
+async def test_missing_classification_is_not_reported_as_deadline(skip_reasons: list[str]) -> None:
+    update = await agents.recommendation_agent(IssueState(title="Crash", body="Traceback", errors=["Classification error"]))
+
+    assert update["skipped_steps"] == ["recommendation"]
+    assert skip_reasons == ["no_classification"]
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_is_reported_as_deadline(skip_reasons: list[str]) -> None:
+    classification = ClassificationState(category="bug", priority="high", labels=[], assignee="")
+    state = IssueState(title="Crash", body="Traceback", classification=classification, deadline=time.time())
+
+    update = await agents.recommendation_agent(state)
+
+    assert update["skipped_steps"] == ["recommendation"]
+    assert skip_reasons == ["deadline"]
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Generator
+from unittest.mock import patch
+
+import openai
+import pytest
+from langchain_openai import ChatOpenAI
+
+from src.agents.resilient_llm import CircuitBreaker, CircuitOpenError, ResilientLLM
+from src.utils.config import settings
+from tests.unit.conftest import FakeOpenAIServer
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff() -> Generator[None, None, None]:
+    with (
+        patch.object(settings, "LLM_RETRY_BACKOFF_SECONDS", 0.01),
+        patch.object(settings, "LLM_HEDGE_MIN_SAMPLES", 3),
+        patch.object(settings, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.05),
+    ):
+        yield
+
+
+def make_llm(
+    server: FakeOpenAIServer, breaker: CircuitBreaker | None = None, timeout: float = 2.0, **kwargs: object
+) -> ResilientLLM:
+    chat_model = ChatOpenAI(model="gpt-4o-mini", api_key="test", base_url=server.base_url, max_retries=0)
+    return ResilientLLM(chat_model, "test", breaker or CircuitBreaker(5, 30), timeout=timeout, **kwargs)  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors_then_succeeds(fake_openai: FakeOpenAIServer) -> None:
+    fake_openai.enqueue(status=500)
+    fake_openai.enqueue(status=500)
+    llm = make_llm(fake_openai, max_retries=2)
+
+    response = await llm.ainvoke("hello")
+
+    assert response.content == "ok"
+    assert fake_openai.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_attempt_times_out_and_is_retried(fake_openai: FakeOpenAIServer) -> None:
+    fake_openai.enqueue(delay=1.0)
+    llm = make_llm(fake_openai, timeout=0.2, max_retries=1)
+
+    start = time.monotonic()
+    response = await llm.ainvoke("hello")
+
+    assert response.content == "ok"
+    assert time.monotonic() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_request_beats_a_slow_primary(fake_openai: FakeOpenAIServer) -> None:
+    llm = make_llm(fake_openai, hedging=True, max_retries=0)
+    for _ in range(3):  # enough samples for a p95
+        await llm.ainvoke("warm up")
+
+    fake_openai.enqueue(delay=1.0)
+    start = time.monotonic()
+    response = await llm.ainvoke("hello")
+
+    assert response.content == "ok"
+    assert time.monotonic() - start < 0.5
+    assert fake_openai.requests == 5
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_recovers(fake_openai: FakeOpenAIServer) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.1)
+    llm = make_llm(fake_openai, breaker=breaker, max_retries=0)
+    fake_openai.enqueue(status=500)
+    fake_openai.enqueue(status=500)
+
+    for _ in range(2):
+        with pytest.raises(openai.InternalServerError):
+            await llm.ainvoke("hello")
+    with pytest.raises(CircuitOpenError):
+        await llm.ainvoke("hello")
+    assert fake_openai.requests == 2
+
+    await asyncio.sleep(0.15)
+    assert (await llm.ainvoke("hello")).content == "ok"
+    assert breaker.state == "closed"
+
+
+class FlakyStream:
+    """Runnable whose stream fails with `error` after `fail_after` chunks on its first `failures` calls."""
+
+    def __init__(self, chunks: list[str], failures: int, fail_after: int, error: BaseException) -> None:
+        self.chunks = chunks
+        self.failures = failures
+        self.fail_after = fail_after
+        self.error = error
+        self.calls = 0
+
+    async def astream(self, prompt: str) -> AsyncGenerator[str]:
+        self.calls += 1
+        for i, chunk in enumerate(self.chunks):
+            if self.calls <= self.failures and i == self.fail_after:
+                raise self.error
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_is_retried_until_the_first_chunk() -> None:
+    runnable = FlakyStream(["a", "b"], failures=1, fail_after=0, error=TimeoutError())
+    llm = ResilientLLM(runnable, "test", CircuitBreaker(5, 30), max_retries=1)  # type: ignore[arg-type]
+
+    assert [chunk async for chunk in llm.astream("hello")] == ["a", "b"]
+    assert runnable.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_failure_after_a_chunk_is_raised() -> None:
+    runnable = FlakyStream(["a", "b"], failures=1, fail_after=1, error=TimeoutError())
+    breaker = CircuitBreaker(5, 30)
+    llm = ResilientLLM(runnable, "test", breaker, max_retries=1)  # type: ignore[arg-type]
+
+    received: list[str] = []
+    with pytest.raises(TimeoutError):
+        async for chunk in llm.astream("hello"):
+            received.append(chunk)
+
+    assert received == ["a"]
+    assert runnable.calls == 1 and breaker.failures == 1
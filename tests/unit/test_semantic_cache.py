@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from src.models.agent_models import ClassificationState, Recommendation
+from src.vectorstore.semantic_cache import SemanticCache
+
+CLASSIFICATION = ClassificationState(category="bug", priority="high", labels=["regression"], assignee="@ml-team")
+RECOMMENDATION = Recommendation(summary="Check the solver tolerance.", references=["https://github.com/o/r/issues/1"])
+
+
+def test_near_duplicate_query_hits_and_distinct_query_misses() -> None:
+    cache = SemanticCache(dim=3, threshold=0.95, ttl_seconds=60, max_entries=4)
+    cache.store([1.0, 0.0, 0.0], CLASSIFICATION, RECOMMENDATION)
+
+    hit = cache.lookup([0.99, 0.05, 0.0])
+    miss = cache.lookup([0.0, 1.0, 0.0])
+
+    assert hit == (CLASSIFICATION, RECOMMENDATION)
+    assert hit is not None and hit[0] is not CLASSIFICATION  # callers get copies
+    assert miss is None
+    assert cache.hit_rate == 0.5
+
+
+def test_entries_expire_after_ttl() -> None:
+    cache = SemanticCache(dim=3, threshold=0.95, ttl_seconds=60, max_entries=4)
+    with patch("src.vectorstore.semantic_cache.time.time", return_value=1000.0):
+        cache.store([1.0, 0.0, 0.0], CLASSIFICATION, RECOMMENDATION)
+
+    with patch("src.vectorstore.semantic_cache.time.time", return_value=1061.0):
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = SemanticCache(dim=3, threshold=0.95, ttl_seconds=60, max_entries=2)
+    cache.store([1.0, 0.0, 0.0], CLASSIFICATION, RECOMMENDATION)
+    cache.store([0.0, 1.0, 0.0], CLASSIFICATION, RECOMMENDATION)
+
+    assert cache.lookup([1.0, 0.0, 0.0]) is not None  # refresh the first entry
+    cache.store([0.0, 0.0, 1.0], CLASSIFICATION, RECOMMENDATION)
+
+    assert len(cache) == 2
+    assert cache.lookup([1.0, 0.0, 0.0]) is not None
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.agents import agents
+from src.models.agent_models import ClassificationState, IssueState, Recommendation
+
+ANSWERED = IssueState(
+    title="Crash on fit",
+    body="Traceback ...",
+    query_embedding=[1.0, 0.0, 0.0],
+    classification=ClassificationState(category="bug", priority="high", labels=[], assignee=""),
+    recommendation=Recommendation(summary="Check the solver tolerance.", references=[]),
+)
+
+
+@pytest.fixture
+def semantic_cache(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    cache = MagicMock()
+    monkeypatch.setattr(agents.services, "semantic_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_clean_run_is_cached(semantic_cache: MagicMock) -> None:
+    await agents.semantic_cache_agent(ANSWERED)
+
+    semantic_cache.store.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("degraded", [{"skipped_steps": ["classification"]}, {"errors": ["Recommendation error"]}])
+async def test_degraded_run_is_not_cached(semantic_cache: MagicMock, degraded: dict) -> None:
+    await agents.semantic_cache_agent(ANSWERED.model_copy(update=degraded))
+
+    semantic_cache.store.assert_not_called()